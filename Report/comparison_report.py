@@ -0,0 +1,39 @@
+# comparison_report.py
+import os
+from datetime import datetime
+
+from Report.report_generator import render_template_to_file
+from Report.results_report import RESULTS_REPORTS_FOLDER_NAME
+
+COMPARISON_REPORT_TEMPLATE_NAME = 'comparison_report_template.html'
+
+# Order of the transactions in the report: what needs attention first.
+_STATUS_ORDER = ['REGRESSION', 'ADDED', 'REMOVED', 'INSUFFICIENT DATA', 'IMPROVEMENT', 'NO CHANGE']
+
+
+def generate_comparison_report(comparison, output_path):
+    """Writes the HTML diff report of `comparison` (see run_comparison.compare_runs) to `output_path`."""
+    transactions = sorted(comparison['transactions'],
+                          key=lambda t: (_STATUS_ORDER.index(t['status']), -abs(t.get('delta_percent', 0))))
+    render_template_to_file(
+        COMPARISON_REPORT_TEMPLATE_NAME,
+        output_path,
+        report_title=", ".join(os.path.basename(f) for f in comparison['current_files']) + " vs " +
+        ", ".join(os.path.basename(f) for f in comparison['baseline_files']),
+        baseline_files=comparison['baseline_files'],
+        current_files=comparison['current_files'],
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        settings=comparison['settings'],
+        regressions=comparison['regressions'],
+        improvements=comparison['improvements'],
+        transactions=transactions
+    )
+
+
+def get_comparison_output_path(current_file, baseline_file, output_dir=None, extension='.html'):
+    """Where the comparison of `current_file` with `baseline_file` is written (next to the current run by default)."""
+    output_dir = output_dir or os.path.join(os.path.dirname(os.path.abspath(current_file)),
+                                            RESULTS_REPORTS_FOLDER_NAME)
+    current_name = os.path.splitext(os.path.basename(current_file))[0]
+    baseline_name = os.path.splitext(os.path.basename(baseline_file))[0]
+    return os.path.join(output_dir, f"{current_name}_vs_{baseline_name}_comparison{extension}")
@@ -0,0 +1,171 @@
+# excel_exporter.py
+import os
+import re
+from collections import OrderedDict
+
+from Report.issue_writers import IssueWriter
+
+# openpyxl is only imported when an Excel export is requested.
+
+ISSUE_SHEET_HEADERS = ['File', 'Thread Group / Test Fragment', 'Severity', 'Type', 'Location', 'Description']
+ISSUE_SHEET_COLUMN_WIDTHS = [30, 30, 12, 30, 45, 100]
+SUMMARY_SHEET_TITLE = 'Summary'
+MAX_SHEET_TITLE_LENGTH = 31
+MAX_CELL_TEXT_LENGTH = 32767
+_INVALID_SHEET_TITLE_CHARACTERS = re.compile(r'[\\/*?:\[\]]')
+
+HEADER_FILL_COLOR = '007BFF'
+FILE_ROW_FILL_COLOR = 'E9F5FF'
+SEVERITY_FONT_COLORS = {'ERROR': 'D32F2F', 'WARNING': 'B8860B'}
+
+
+class ExcelIssueWriter(IssueWriter):
+    """
+    Exports issues to an .xlsx workbook using openpyxl's write-only (streaming) mode, so memory stays bounded
+    whatever the number of rows: rows are written straight to temporary files and never kept in the workbook.
+
+    The workbook has a 'Summary' sheet (issue counts per file and validator) and one sheet per validator with
+    frozen headers and an autofilter. Inside a validator sheet the issues of each JMX file are grouped under a
+    collapsible file row. Only the issues of the file being validated are buffered, to know each group's size.
+    """
+    file_extension = '.xlsx'
+
+    def __init__(self, output_path):
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font, PatternFill
+        from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+        self.output_path = output_path
+        self._closed = False
+        self._cell_class = WriteOnlyCell
+        self._illegal_characters = ILLEGAL_CHARACTERS_RE
+        self._header_font = Font(bold=True, color='FFFFFF')
+        self._header_fill = PatternFill('solid', fgColor=HEADER_FILL_COLOR)
+        self._file_row_font = Font(bold=True)
+        self._file_row_fill = PatternFill('solid', fgColor=FILE_ROW_FILL_COLOR)
+        self._severity_fonts = {severity: Font(bold=True, color=color)
+                                for severity, color in SEVERITY_FONT_COLORS.items()}
+
+        self._workbook = Workbook(write_only=True)
+        self._summary_sheet = self._workbook.create_sheet(SUMMARY_SHEET_TITLE)
+        self._summary_columns = None
+        self._summary_rows = 0
+        self._sheets = OrderedDict()  # validation name -> [worksheet, rows written]
+        self._current_issues = OrderedDict()
+
+    def _text_cell(self, worksheet, value, font=None, fill=None):
+        text = self._illegal_characters.sub('', str(value if value is not None else ''))[:MAX_CELL_TEXT_LENGTH]
+        if font is None and fill is None and not text.startswith('='):
+            # Plain strings are much cheaper to write than styled cells.
+            return text
+        cell = self._cell_class(worksheet, value=text)
+        # Force text, so values such as '=abc' are not written as formulas.
+        cell.data_type = 's'
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        return cell
+
+    def _header_row(self, worksheet, headers):
+        return [self._text_cell(worksheet, header, self._header_font, self._header_fill) for header in headers]
+
+    def _unique_sheet_title(self, validation_name):
+        title = _INVALID_SHEET_TITLE_CHARACTERS.sub('-', validation_name).strip("' ") or 'Issues'
+        title = title[:MAX_SHEET_TITLE_LENGTH]
+        existing = {t.lower() for t in self._workbook.sheetnames}
+        candidate, counter = title, 2
+        while candidate.lower() in existing:
+            suffix = f" ({counter})"
+            candidate = title[:MAX_SHEET_TITLE_LENGTH - len(suffix)] + suffix
+            counter += 1
+        return candidate
+
+    def _get_issue_sheet(self, validation_name):
+        entry = self._sheets.get(validation_name)
+        if entry is None:
+            worksheet = self._workbook.create_sheet(self._unique_sheet_title(validation_name))
+            # Sheet views, column widths and outline settings must be set before the first row is written.
+            worksheet.freeze_panes = 'A2'
+            worksheet.sheet_properties.outlinePr.summaryBelow = False
+            for index, width in enumerate(ISSUE_SHEET_COLUMN_WIDTHS):
+                worksheet.column_dimensions[chr(ord('A') + index)].width = width
+            worksheet.append(self._header_row(worksheet, ISSUE_SHEET_HEADERS))
+            entry = [worksheet, 1]
+            self._sheets[validation_name] = entry
+        return entry
+
+    def write_issues(self, file_path, issues):
+        for issue in issues:
+            validation_name = issue.get('validation_option_name', 'Uncategorized Issues')
+            self._current_issues.setdefault(validation_name, []).append(issue)
+
+    def end_file(self, file_path, selected_validations):
+        file_name = os.path.basename(file_path)
+        for validation_name, issues in self._current_issues.items():
+            entry = self._get_issue_sheet(validation_name)
+            worksheet = entry[0]
+
+            # Collapsible group: one bold file row followed by the file's issues at outline level 1.
+            worksheet.append([
+                self._text_cell(worksheet, file_name, self._file_row_font, self._file_row_fill),
+                self._text_cell(worksheet, '', fill=self._file_row_fill),
+                self._text_cell(worksheet, '', fill=self._file_row_fill),
+                self._text_cell(worksheet, f"{len(issues)} issue(s)", self._file_row_font, self._file_row_fill),
+                self._text_cell(worksheet, '', fill=self._file_row_fill),
+                self._text_cell(worksheet, file_path, fill=self._file_row_fill),
+            ])
+            entry[1] += 1
+
+            for issue in issues:
+                row_index = entry[1] + 1
+                worksheet.row_dimensions[row_index].outline_level = 1
+                severity = issue.get('severity', '')
+                worksheet.append([
+                    self._text_cell(worksheet, file_name),
+                    self._text_cell(worksheet, issue.get('thread_group', 'N/A')),
+                    self._text_cell(worksheet, severity, self._severity_fonts.get(severity)),
+                    self._text_cell(worksheet, issue.get('type', 'N/A')),
+                    self._text_cell(worksheet, issue.get('location', '')),
+                    self._text_cell(worksheet, issue.get('description', '')),
+                ])
+                # The row attributes have been written out; drop them so memory does not grow with the row count.
+                del worksheet.row_dimensions[row_index]
+                entry[1] = row_index
+
+        self._write_summary_row(file_path, selected_validations)
+        self._current_issues = OrderedDict()
+
+    def _write_summary_row(self, file_path, selected_validations):
+        if self._summary_columns is None:
+            self._summary_columns = list(selected_validations)
+            self._summary_sheet.freeze_panes = 'B2'
+            self._summary_sheet.column_dimensions['A'].width = 40
+            self._summary_sheet.append(self._header_row(self._summary_sheet,
+                                                        ['File', 'Total Issues'] + self._summary_columns))
+            self._summary_rows = 1
+
+        counts = {name: len(issues) for name, issues in self._current_issues.items()}
+        self._summary_sheet.append([self._text_cell(self._summary_sheet, os.path.basename(file_path)),
+                                    sum(counts.values())] + [counts.get(name, 0) for name in self._summary_columns])
+        self._summary_rows += 1
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        from openpyxl.utils import get_column_letter
+
+        if self._summary_columns is not None:
+            last_column = get_column_letter(len(self._summary_columns) + 2)
+            self._summary_sheet.auto_filter.ref = f"A1:{last_column}{self._summary_rows}"
+        else:
+            self._summary_sheet.append(['No files were exported.'])
+
+        # The autofilter is written after the rows, so its range can be set once the row count is known.
+        last_column = get_column_letter(len(ISSUE_SHEET_HEADERS))
+        for worksheet, rows_written in self._sheets.values():
+            worksheet.auto_filter.ref = f"A1:{last_column}{rows_written}"
+
+        self._workbook.save(self.output_path)
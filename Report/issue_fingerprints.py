@@ -0,0 +1,157 @@
+# issue_fingerprints.py
+import os
+import re
+import json
+import hashlib
+from datetime import datetime
+from collections import Counter
+
+# Every issue gets a stable fingerprint: a hash of the script key (the JMX file path relative to the suite root, a
+# fixed folder such as the one of the baseline, so that it depends neither on where the suite is checked out nor on
+# which files a run selects), the validator, the issue type, the normalized element location and the key fields
+# (thread group, element name). The free-text description is deliberately left out, so rewording a message or a
+# changing value inside it does not make an issue look new.
+# The baseline keeps the fingerprints per script key and validation. Comparing a run with it is a set difference
+# over the scripts and validations the run checked; the others are left out of the comparison.
+
+BASELINE_FILE_NAME = 'validation_baseline.json'
+BASELINE_FORMAT_VERSION = 2  # 2: fingerprints stored per script key
+FINGERPRINT_LENGTH = 16  # Hex characters kept from the SHA-1 digest (64 bits)
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _normalize(value):
+    """Case and whitespace insensitive form of a fingerprint field."""
+    return _WHITESPACE.sub(' ', str(value if value is not None else '')).strip().lower()
+
+
+def get_suite_root(jmx_files):
+    """The deepest folder shared by all of `jmx_files` (the folder of the file itself for a single script)."""
+    directories = [os.path.dirname(os.path.abspath(f)) for f in jmx_files]
+    try:
+        return os.path.commonpath(directories)
+    except ValueError:
+        # Files on different drives have no common folder; use the folder of the first file.
+        return directories[0]
+
+
+def get_script_key(file_path, suite_root=None):
+    """The path of `file_path` relative to `suite_root` (its own folder by default), with '/' separators."""
+    file_path = os.path.abspath(file_path)
+    try:
+        relative_path = os.path.relpath(file_path, suite_root or os.path.dirname(file_path))
+    except ValueError:
+        relative_path = os.path.basename(file_path)  # On another drive than the suite root
+    return relative_path.replace(os.sep, '/')
+
+
+def compute_issue_fingerprint(file_path, issue, occurrence=1, suite_root=None):
+    """
+    Returns the fingerprint of `issue` found in `file_path`, a script of the suite rooted at `suite_root`.
+    `occurrence` tells apart otherwise identical issues of the same file (the 2nd, 3rd... identical issue).
+    """
+    parts = [
+        get_script_key(file_path, suite_root),
+        issue.get('validation_option_name', 'Uncategorized Issues'),
+        issue.get('type', 'N/A'),
+        issue.get('location', ''),
+        issue.get('thread_group', 'N/A'),
+        issue.get('element_name', ''),
+    ]
+    key = '\x1f'.join(_normalize(part) for part in parts)
+    if occurrence > 1:
+        key += f'\x1f#{occurrence}'
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:FINGERPRINT_LENGTH]
+
+
+class IssueFingerprinter:
+    """
+    Assigns fingerprints to the issues of one JMX file of the suite rooted at `suite_root` (see get_suite_root),
+    in the order they are produced. Create one per file and call `assign` on every batch of issues.
+    """
+
+    def __init__(self, file_path, suite_root=None):
+        self.file_path = file_path
+        self.suite_root = suite_root
+        self._occurrences = Counter()
+
+    def assign(self, issues):
+        for issue in issues:
+            fingerprint = compute_issue_fingerprint(self.file_path, issue, suite_root=self.suite_root)
+            self._occurrences[fingerprint] += 1
+            occurrence = self._occurrences[fingerprint]
+            if occurrence > 1:
+                fingerprint = compute_issue_fingerprint(self.file_path, issue, occurrence, self.suite_root)
+            issue['fingerprint'] = fingerprint
+        return issues
+
+
+def save_baseline(baseline_path, fingerprints_by_script, checked_by_script):
+    """
+    Stores the fingerprints of a run in the baseline index at `baseline_path`.
+    `fingerprints_by_script` maps a script key (see get_script_key) to {validation name: set of fingerprints};
+    `checked_by_script` maps it to the validations that ran on that script. Only those (script, validation) entries
+    are replaced: the baseline of the scripts and validations left out of the run is kept.
+    """
+    _, scripts = load_baseline(baseline_path)
+    scripts = scripts or {}
+    for script_key, validation_names in checked_by_script.items():
+        fingerprints = fingerprints_by_script.get(script_key, {})
+        stored = scripts.setdefault(script_key, {})
+        for name in set(validation_names) | set(fingerprints):
+            stored[name] = set(fingerprints.get(name, ()))
+    baseline = {
+        'format': BASELINE_FORMAT_VERSION,
+        'created': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'scripts': {script_key: {name: sorted(fingerprints) for name, fingerprints in by_validation.items()}
+                    for script_key, by_validation in scripts.items()}
+    }
+    with open(baseline_path, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, separators=(',', ':'))
+
+
+def load_baseline(baseline_path):
+    """
+    Loads a baseline index. Returns (created, {script key: {validation name: set of fingerprints}}),
+    or (None, None) when there is no readable baseline at `baseline_path`.
+    """
+    try:
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    except (OSError, ValueError):
+        return None, None
+    if not isinstance(baseline, dict) or baseline.get('format') != BASELINE_FORMAT_VERSION:
+        return None, None
+    scripts = {script_key: {name: set(fingerprints) for name, fingerprints in by_validation.items()}
+               for script_key, by_validation in baseline.get('scripts', {}).items()}
+    return baseline.get('created'), scripts
+
+
+def diff_against_baseline(current_by_script, baseline_by_script, checked_by_script):
+    """
+    Compares the fingerprints of the current run with the baseline, over the scripts and validations of the run
+    only (`checked_by_script`: script key -> validation names): an issue that was not checked again is neither
+    fixed nor unchanged.
+    Returns {'new': n, 'fixed': n, 'unchanged': n, 'by_validation': {name: {'new', 'fixed', 'unchanged'}}}.
+    """
+    by_validation = {}
+    totals = Counter()
+    for script_key, validation_names in checked_by_script.items():
+        current_by_validation = current_by_script.get(script_key, {})
+        baseline_by_validation = baseline_by_script.get(script_key, {})
+        for name in list(validation_names) + [n for n in current_by_validation if n not in validation_names]:
+            current = current_by_validation.get(name, set())
+            baseline = baseline_by_validation.get(name, set())
+            counts = Counter({
+                'new': len(current - baseline),
+                'fixed': len(baseline - current),
+                'unchanged': len(current & baseline),
+            })
+            if not any(counts.values()):
+                continue
+            by_validation.setdefault(name, Counter()).update(counts)
+            totals.update(counts)
+    return {'new': totals['new'], 'fixed': totals['fixed'], 'unchanged': totals['unchanged'],
+            'by_validation': {name: {key: counts[key] for key in ('new', 'fixed', 'unchanged')}
+                              for name, counts in by_validation.items()}}
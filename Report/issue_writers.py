@@ -0,0 +1,254 @@
+# issue_writers.py
+import os
+import re
+import json
+from collections import OrderedDict
+from html import escape as _html_escape
+
+# Machine-readable outputs for CI systems. Every writer streams issues to disk as they are produced
+# (only the issues of the file currently being validated are ever buffered), so memory stays flat on huge suites.
+
+OUTPUT_FORMAT_HTML = 'html'
+OUTPUT_FORMAT_JSON_LINES = 'jsonl'
+OUTPUT_FORMAT_SARIF = 'sarif'
+OUTPUT_FORMAT_JUNIT = 'junit'
+OUTPUT_FORMAT_EXCEL = 'xlsx'
+
+OUTPUT_FORMAT_LABELS = OrderedDict([
+    (OUTPUT_FORMAT_HTML, "HTML Report"),
+    (OUTPUT_FORMAT_JSON_LINES, "JSON Lines (.jsonl)"),
+    (OUTPUT_FORMAT_SARIF, "SARIF 2.1 (.sarif)"),
+    (OUTPUT_FORMAT_JUNIT, "JUnit XML (.xml)"),
+    (OUTPUT_FORMAT_EXCEL, "Excel Workbook (.xlsx)"),
+])
+
+TOOL_NAME = "JMeter Script Validator"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_FINGERPRINT_KEY = 'jmxIssueFingerprint/v1'
+SARIF_LEVELS = {'ERROR': 'error', 'WARNING': 'warning', 'INFO': 'note'}
+
+
+def _slug(text):
+    """Lowercase, dash separated identifier made of the letters and digits of `text`."""
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'unknown'
+
+
+def get_rule_id(validation_name, issue_type):
+    """
+    Returns the stable rule identifier for an issue type of a validation module, e.g.
+    'duplicate-extractors-variable-conflicts/duplicate-extractor'. The id only depends on the names,
+    so it does not change between runs or machines.
+    """
+    return f"{_slug(validation_name)}/{_slug(issue_type)}"
+
+
+def _file_uri(file_path):
+    return 'file:///' + os.path.abspath(file_path).replace(os.sep, '/').lstrip('/')
+
+
+def _xml_escape(text):
+    """XML text escaping (html.escape is used instead of xml.sax.saxutils, which pulls in urllib on import)."""
+    return _html_escape(text, quote=False)
+
+
+def _xml_quoteattr(text):
+    """Escapes `text` for an XML attribute and wraps it in double quotes."""
+    return '"' + _html_escape(text, quote=True) + '"'
+
+
+class IssueWriter:
+    """
+    Base class of the streaming writers. Call `write_issues` as issues are produced (any number of times per file),
+    `end_file` once a file is fully validated, and `close` at the end of the run (or use it as a context manager).
+    """
+    file_extension = ''
+
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self._file = open(output_path, "w", encoding="utf-8")
+        self._closed = False
+
+    def write_issues(self, file_path, issues):
+        raise NotImplementedError
+
+    def end_file(self, file_path, selected_validations):
+        pass
+
+    def _write_footer(self):
+        pass
+
+    def close(self):
+        if not self._closed:
+            self._closed = True
+            try:
+                self._write_footer()
+            finally:
+                self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class JsonLinesIssueWriter(IssueWriter):
+    """Writes one JSON object per issue and per line."""
+    file_extension = '.jsonl'
+
+    def write_issues(self, file_path, issues):
+        for issue in issues:
+            record = {'file': file_path}
+            record.update(issue)
+            record['rule_id'] = get_rule_id(issue.get('validation_option_name', 'Uncategorized Issues'),
+                                            issue.get('type', 'N/A'))
+            self._file.write(json.dumps(record, default=str))
+            self._file.write('\n')
+
+
+class SarifIssueWriter(IssueWriter):
+    """
+    Writes a SARIF 2.1.0 log with a single run. Results are streamed into the 'results' array;
+    the rule descriptors (one per validation module and issue type) are written after them when the log is closed.
+    """
+    file_extension = '.sarif'
+
+    def __init__(self, output_path):
+        super().__init__(output_path)
+        self._rules = OrderedDict()
+        self._rule_indexes = {}
+        self._artifacts = OrderedDict()
+        self._first_result = True
+        self._file.write('{"$schema":' + json.dumps(SARIF_SCHEMA) + ',"version":"2.1.0","runs":[{"results":[')
+
+    def _rule_index(self, validation_name, issue_type):
+        rule_id = get_rule_id(validation_name, issue_type)
+        if rule_id not in self._rule_indexes:
+            self._rule_indexes[rule_id] = len(self._rules)
+            self._rules[rule_id] = {
+                'id': rule_id,
+                'name': f"{validation_name}: {issue_type}",
+                'shortDescription': {'text': f"{issue_type} ({validation_name})"},
+                'properties': {'validation_option_name': validation_name, 'type': issue_type}
+            }
+        return rule_id, self._rule_indexes[rule_id]
+
+    def _artifact_index(self, file_path):
+        if file_path not in self._artifacts:
+            self._artifacts[file_path] = len(self._artifacts)
+        return self._artifacts[file_path]
+
+    def write_issues(self, file_path, issues):
+        artifact_index = self._artifact_index(file_path)
+        for issue in issues:
+            validation_name = issue.get('validation_option_name', 'Uncategorized Issues')
+            rule_id, rule_index = self._rule_index(validation_name, issue.get('type', 'N/A'))
+            location = str(issue.get('location', ''))
+            thread_group = str(issue.get('thread_group', 'N/A'))
+            result = {
+                'ruleId': rule_id,
+                'ruleIndex': rule_index,
+                'level': SARIF_LEVELS.get(issue.get('severity'), 'warning'),
+                'message': {'text': str(issue.get('description', ''))},
+                'locations': [{
+                    'physicalLocation': {
+                        'artifactLocation': {'uri': _file_uri(file_path), 'index': artifact_index}
+                    },
+                    'logicalLocations': [{'name': location, 'fullyQualifiedName': f"{thread_group}/{location}"}]
+                }],
+                'properties': {'thread_group': thread_group}
+            }
+            if issue.get('fingerprint'):
+                result['partialFingerprints'] = {SARIF_FINGERPRINT_KEY: issue['fingerprint']}
+            if not self._first_result:
+                self._file.write(',')
+            self._first_result = False
+            self._file.write(json.dumps(result, default=str))
+
+    def _write_footer(self):
+        tool = {'driver': {'name': TOOL_NAME, 'informationUri': 'https://jmeter.apache.org/',
+                           'rules': list(self._rules.values())}}
+        artifacts = [{'location': {'uri': _file_uri(path)}} for path in self._artifacts]
+        self._file.write('],"tool":' + json.dumps(tool) + ',"artifacts":' + json.dumps(artifacts) + '}]}')
+
+
+class JUnitXmlIssueWriter(IssueWriter):
+    """
+    Writes a JUnit XML report with one test suite per JMX file and one test case per validation module.
+    A test case fails when its validation module reported at least one ERROR or WARNING.
+    """
+    file_extension = '.xml'
+    FAILING_SEVERITIES = ('ERROR', 'WARNING')
+
+    def __init__(self, output_path):
+        super().__init__(output_path)
+        self._current_issues = OrderedDict()
+        self._file.write('<?xml version="1.0" encoding="UTF-8"?>\n'
+                         '<testsuites name=' + _xml_quoteattr(TOOL_NAME) + '>\n')
+
+    def write_issues(self, file_path, issues):
+        for issue in issues:
+            validation_name = issue.get('validation_option_name', 'Uncategorized Issues')
+            self._current_issues.setdefault(validation_name, []).append(issue)
+
+    def end_file(self, file_path, selected_validations):
+        validation_names = list(selected_validations)
+        validation_names += [name for name in self._current_issues if name not in validation_names]
+
+        test_cases = []
+        failures = 0
+        for validation_name in validation_names:
+            issues = self._current_issues.get(validation_name, [])
+            failing = [i for i in issues if i.get('severity') in self.FAILING_SEVERITIES]
+            test_case = '    <testcase classname=' + _xml_quoteattr(os.path.basename(file_path)) + \
+                        ' name=' + _xml_quoteattr(validation_name)
+            if failing:
+                failures += 1
+                details = "\n".join(f"[{i.get('severity')}] {i.get('type')} @ {i.get('location')} "
+                                    f"({i.get('thread_group', 'N/A')}): {i.get('description')}" for i in issues)
+                test_case += '>\n      <failure message=' + \
+                             _xml_quoteattr(f"{len(failing)} issue(s) found") + \
+                             ' type=' + _xml_quoteattr(validation_name) + '>' + _xml_escape(details) + \
+                             '</failure>\n    </testcase>\n'
+            elif issues:
+                details = "\n".join(f"[{i.get('severity')}] {i.get('type')} @ {i.get('location')}: "
+                                    f"{i.get('description')}" for i in issues)
+                test_case += '>\n      <system-out>' + _xml_escape(details) + '</system-out>\n    </testcase>\n'
+            else:
+                test_case += '/>\n'
+            test_cases.append(test_case)
+
+        self._file.write('  <testsuite name=' + _xml_quoteattr(file_path) + f' tests="{len(test_cases)}"'
+                         f' failures="{failures}" errors="0" skipped="0">\n')
+        self._file.writelines(test_cases)
+        self._file.write('  </testsuite>\n')
+        self._current_issues = OrderedDict()
+
+    def _write_footer(self):
+        self._file.write('</testsuites>\n')
+
+
+ISSUE_WRITER_CLASSES = OrderedDict([
+    (OUTPUT_FORMAT_JSON_LINES, JsonLinesIssueWriter),
+    (OUTPUT_FORMAT_SARIF, SarifIssueWriter),
+    (OUTPUT_FORMAT_JUNIT, JUnitXmlIssueWriter),
+])
+
+
+def open_issue_writers(output_formats, output_dir, base_name="validation_results"):
+    """
+    Opens one writer per machine-readable format in `output_formats` (unknown formats and 'html' are ignored).
+    Returns a list of writers; the caller is responsible for closing them.
+    """
+    writers = []
+    for output_format in output_formats:
+        writer_class = ISSUE_WRITER_CLASSES.get(output_format)
+        if output_format == OUTPUT_FORMAT_EXCEL:
+            # Imported here: the Excel exporter depends on this module and on openpyxl.
+            from Report.excel_exporter import ExcelIssueWriter
+            writer_class = ExcelIssueWriter
+        if writer_class is None:
+            continue
+        suffix = '_junit' if output_format == OUTPUT_FORMAT_JUNIT else ''
+        writers.append(writer_class(os.path.join(output_dir, f"{base_name}{suffix}{writer_class.file_extension}")))
+    return writers
@@ -1,10 +1,66 @@
 # report_generator.py
 import os
+import json
+import gzip
+import base64
 from datetime import datetime
 from collections import defaultdict
 
-# For HTML report generation
-from jinja2 import Environment, FileSystemLoader
+# Templates live next to this file. The environment and the compiled templates are created once per process
+# and reused for every report, so rendering hundreds of reports compiles each template only once.
+TEMPLATE_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+REPORT_TEMPLATE_NAME = 'report_template.html'
+VIRTUAL_REPORT_TEMPLATE_NAME = 'report_template_virtual.html'
+
+# Report modes: 'standard' renders every issue as HTML on the server side, 'virtual' embeds the issues as compact
+# JSON that the page renders lazily (virtual scrolling, client-side grouping and filtering), and 'auto' picks
+# 'virtual' once a file has more than VIRTUAL_REPORT_ISSUE_THRESHOLD issues.
+REPORT_MODE_STANDARD = 'standard'
+REPORT_MODE_VIRTUAL = 'virtual'
+REPORT_MODE_AUTO = 'auto'
+VIRTUAL_REPORT_ISSUE_THRESHOLD = 2000
+
+# Size of the write buffer used while streaming rendered chunks to disk.
+REPORT_WRITE_BUFFER_SIZE = 1024 * 1024
+
+_environment = None
+_compiled_templates = {}
+
+
+def _get_environment():
+    """Returns the shared Jinja environment, creating it on first use."""
+    global _environment
+    if _environment is None:
+        # jinja2 is imported on first use, so importing this module (e.g. at application startup) stays cheap.
+        from jinja2 import Environment, FileSystemLoader, FileSystemBytecodeCache
+        _environment = Environment(
+            loader=FileSystemLoader(TEMPLATE_DIRECTORY),
+            # Compiled template bytecode is cached on disk (in a per-user temp folder),
+            # so a new process can skip the template compilation step as well.
+            bytecode_cache=FileSystemBytecodeCache(),
+            auto_reload=False
+        )
+    return _environment
+
+
+def get_report_template(template_name=REPORT_TEMPLATE_NAME):
+    """Returns the compiled template `template_name`, compiling it only the first time it is requested."""
+    template = _compiled_templates.get(template_name)
+    if template is None:
+        template = _get_environment().get_template(template_name)
+        _compiled_templates[template_name] = template
+    return template
+
+
+def render_template_to_file(template_name, output_path, **context):
+    """
+    Renders `template_name` with `context` and streams the output into `output_path`.
+    The template is rendered chunk by chunk through a buffered file, so the full HTML is never held in memory.
+    """
+    template = get_report_template(template_name)
+    with open(output_path, "w", encoding="utf-8", buffering=REPORT_WRITE_BUFFER_SIZE) as f:
+        f.writelines(template.generate(**context))
+
 
 def _group_issues_by_thread_group(issues_list):
     """Helper to group issues by thread_group for organized reporting."""
@@ -25,30 +81,100 @@ def _group_issues_by_validation_option(issues_list):
         issues_by_validation[validation_name].append(issue)
     return issues_by_validation
 
-def generate_html_report(report_data, output_path, selected_validations):
+# Dictionary-encoded columns of the compact issue rows used by the virtual report, followed by the plain text columns.
+_COMPACT_DICTIONARY_FIELDS = [('severity', 'N/A'), ('validation_option_name', 'Uncategorized Issues'),
+                              ('type', 'N/A'), ('thread_group', 'N/A')]
+_COMPACT_TEXT_FIELDS = ['location', 'description']
+
+
+def _encode_issues_compact(issues_list):
+    """
+    Encodes issues as {'dictionaries': [...], 'issues': [[severity, validation, type, thread_group, location,
+    description], ...]} where the first four columns are indexes into the matching dictionary.
+    """
+    dictionaries = [[] for _ in _COMPACT_DICTIONARY_FIELDS]
+    lookups = [{} for _ in _COMPACT_DICTIONARY_FIELDS]
+    rows = []
+    for issue in issues_list:
+        row = []
+        for column, (field, default) in enumerate(_COMPACT_DICTIONARY_FIELDS):
+            field_value = str(issue.get(field, default))
+            code = lookups[column].get(field_value)
+            if code is None:
+                code = len(dictionaries[column])
+                lookups[column][field_value] = code
+                dictionaries[column].append(field_value)
+            row.append(code)
+        for field in _COMPACT_TEXT_FIELDS:
+            row.append(str(issue.get(field, '')))
+        rows.append(row)
+    return {'dictionaries': dictionaries, 'issues': rows}
+
+
+def _json_for_script_tag(data):
+    """Serializes `data` as compact JSON that is safe to embed inside a <script> element."""
+    text = json.dumps(data, separators=(',', ':'))
+    return text.replace('<', '\\u003c').replace('>', '\\u003e').replace('&', '\\u0026')
+
+
+def _resolve_report_mode(report_mode, total_issues):
+    if report_mode == REPORT_MODE_AUTO:
+        return REPORT_MODE_VIRTUAL if total_issues > VIRTUAL_REPORT_ISSUE_THRESHOLD else REPORT_MODE_STANDARD
+    if report_mode not in (REPORT_MODE_STANDARD, REPORT_MODE_VIRTUAL):
+        raise ValueError(f"Invalid report mode '{report_mode}'. Please choose 'standard', 'virtual' or 'auto'.")
+    return report_mode
+
+
+def generate_html_report(report_data, output_path, selected_validations, report_mode=REPORT_MODE_STANDARD,
+                         compress=False, runtime_results=None):
     """
     Generates an HTML report from the collected issues.
     `report_data` is a dict with 'file_path' and 'issues' (list of dicts).
     `output_path` is the full path where the HTML file should be saved.
     `selected_validations` is a list of strings of the validations that were run.
+    `report_mode` is 'standard', 'virtual' or 'auto' (see REPORT_MODE_*).
+    `compress` gzips the embedded issue data of a virtual report (decompressed by the browser when opened).
+    `runtime_results` (see jmx_linker.link_results) adds the observed results of every sampler to the report.
     """
-    # Assuming the template file 'report_template.html' is in the same directory as report_generator.py
-    env = Environment(loader=FileSystemLoader(os.path.dirname(__file__)))
-    template = env.get_template('report_template.html')
+    total_issues = len(report_data['issues'])
+    if _resolve_report_mode(report_mode, total_issues) == REPORT_MODE_VIRTUAL:
+        _generate_virtual_html_report(report_data, output_path, selected_validations, compress, runtime_results)
+        return
 
     file_name = os.path.basename(report_data['file_path'])
-    total_issues = len(report_data['issues'])
 
     issues_by_validation_option = _group_issues_by_validation_option(report_data['issues'])
 
-    html_content = template.render(
+    render_template_to_file(
+        REPORT_TEMPLATE_NAME,
+        output_path,
         file_name=file_name,
         timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         selected_validations=selected_validations,
         issues_by_validation_option=issues_by_validation_option,
         _group_issues_by_thread_group=_group_issues_by_thread_group, # Pass helper to template if needed
-        total_issues=total_issues
+        total_issues=total_issues,
+        runtime_results=runtime_results
     )
 
-    with open(output_path, "w", encoding="utf-8") as f:
-        f.write(html_content)
\ No newline at end of file
+
+def _generate_virtual_html_report(report_data, output_path, selected_validations, compress, runtime_results=None):
+    """Writes a report that embeds the issues as compact JSON and renders them lazily in the browser."""
+    payload = _json_for_script_tag(_encode_issues_compact(report_data['issues']))
+    payload_encoding = 'json'
+    if compress:
+        payload = base64.b64encode(gzip.compress(payload.encode('utf-8'))).decode('ascii')
+        payload_encoding = 'gzip-base64'
+
+    render_template_to_file(
+        VIRTUAL_REPORT_TEMPLATE_NAME,
+        output_path,
+        file_name=os.path.basename(report_data['file_path']),
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        selected_validations=selected_validations,
+        selected_validations_json=_json_for_script_tag(list(selected_validations or [])),
+        total_issues=len(report_data['issues']),
+        issues_payload=payload,
+        payload_encoding=payload_encoding,
+        runtime_results=runtime_results
+    )
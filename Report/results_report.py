@@ -0,0 +1,156 @@
+# results_report.py
+import os
+from datetime import datetime
+import numpy as np
+
+from Report.report_generator import render_template_to_file, _json_for_script_tag
+from Report.issue_writers import TOOL_NAME, _xml_escape, _xml_quoteattr
+from jmeter_results.downsampling import lttb_indices, DEFAULT_CHART_POINTS
+from jmeter_results.time_series import SERIES_KINDS
+
+RESULTS_REPORT_TEMPLATE_NAME = 'results_report_template.html'
+RESULTS_REPORTS_FOLDER_NAME = 'JMeter_Results_Reports'
+
+CHART_SERIES_PER_BATCH = 16
+APDEX_SPARKLINE_WIDTH = 800
+APDEX_SPARKLINE_HEIGHT = 80
+
+# Charted time series metrics: (series key, chart title, unit). The first percentile of the rollups is added.
+CHART_METRICS = [
+    ('throughput', 'Throughput', 'samples/s'),
+    ('mean', 'Mean Response Time', 'ms'),
+    ('error_rate', 'Error Rate', '%'),
+    ('threads', 'Active Threads', 'threads'),
+]
+
+
+def _format_timestamp(timestamp_ms):
+    return datetime.fromtimestamp(timestamp_ms / 1000.0).strftime("%Y-%m-%d %H:%M:%S") if timestamp_ms else "N/A"
+
+
+def _format_duration(duration_ms):
+    seconds = max(int(duration_ms // 1000), 0)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}h {minutes:02d}m {seconds:02d}s" if hours else f"{minutes}m {seconds:02d}s"
+
+
+def _report_error_clusters(error_clusters):
+    """The error clusters of the summary with their first and last occurrences formatted for the report."""
+    if not error_clusters:
+        return None
+    clusters = [dict(cluster, first_seen=_format_timestamp(cluster['first_timestamp']),
+                     last_seen=_format_timestamp(cluster['last_timestamp'])) for cluster in error_clusters['clusters']]
+    return dict(error_clusters, clusters=clusters)
+
+
+def _apdex_sparkline_points(timeline):
+    """SVG polyline points of the Apdex score over time (score 1 at the top)."""
+    if len(timeline) < 2:
+        return None
+    first, last = timeline[0]['start'], timeline[-1]['start']
+    return " ".join(f"{(row['start'] - first) / (last - first) * APDEX_SPARKLINE_WIDTH:.1f},"
+                    f"{(1 - row['score']) * APDEX_SPARKLINE_HEIGHT:.1f}" for row in timeline)
+
+
+def build_chart_data(time_series, chart_points=DEFAULT_CHART_POINTS):
+    """
+    The chart payload of the report: every series of `time_series` (TimeSeriesRollups) at its finest resolution,
+    each metric downsampled with LTTB to at most `chart_points` points, as [seconds since start, value] lists.
+    """
+    resolution = time_series.resolutions[0]
+    time_range = time_series.time_range()
+    metrics = list(CHART_METRICS)
+    if time_series.percentiles:
+        percentile = time_series.percentiles[0]
+        metrics.insert(1, (f"p{percentile:g}", f"{percentile:g}th Percentile Response Time", 'ms'))
+    chart_data = {
+        'start': time_range[0] if time_range else 0,
+        'resolution': resolution,
+        'metrics': [{'key': key, 'title': title, 'unit': unit} for key, title, unit in metrics],
+        'series': []
+    }
+    if time_range is None:
+        return chart_data
+    names = [(kind, name) for kind in SERIES_KINDS for name in time_series.series_names(kind)]
+    # All the series are on the same time grid, so a batch of them is downsampled in one LTTB walk.
+    for first in range(0, len(names), CHART_SERIES_PER_BATCH):
+        batch_names = names[first:first + CHART_SERIES_PER_BATCH]
+        batch = [time_series.series(kind, name, resolution) for kind, name in batch_names]
+        seconds = (batch[0]['times'] - time_range[0]) // 1000
+        values = np.array([series[key] for series in batch for key, _, _ in metrics], dtype=np.float64)
+        selected = lttb_indices(seconds, values, chart_points)
+        for position, (kind, name) in enumerate(batch_names):
+            points = {}
+            for column, (key, _, _) in enumerate(metrics):
+                row = position * len(metrics) + column
+                points[key] = [seconds[selected[row]].tolist(), np.round(values[row, selected[row]], 2).tolist()]
+            chart_data['series'].append({'kind': kind, 'name': name, 'points': points})
+    return chart_data
+
+
+def generate_results_report(summary, output_path, source_files, skipped_rows=0, significant_digits=None,
+                            time_series=None, chart_points=DEFAULT_CHART_POINTS):
+    """
+    Writes the HTML report of the run `summary` (see ResultsAggregator.summary) to `output_path`.
+    With `time_series` (TimeSeriesRollups), the report also charts the run over time; the error clusters of the
+    summary and its Apdex scores, if any, are shown too.
+    """
+    chart_data = build_chart_data(time_series, chart_points) if time_series is not None else None
+    render_template_to_file(
+        RESULTS_REPORT_TEMPLATE_NAME,
+        output_path,
+        report_title=", ".join(os.path.basename(f) for f in source_files),
+        source_files=source_files,
+        timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        start_time=_format_timestamp(summary['start_timestamp']),
+        end_time=_format_timestamp(summary['end_timestamp']),
+        duration=_format_duration(summary['end_timestamp'] - summary['start_timestamp']),
+        skipped_rows=skipped_rows,
+        significant_digits=significant_digits,
+        percentiles=summary['percentiles'],
+        labels=summary['labels'],
+        total=summary['total'],
+        nodes=summary.get('nodes'),
+        out_of_order_rows=summary.get('out_of_order_rows', 0),
+        sla=summary.get('sla'),
+        error_clusters=_report_error_clusters(summary.get('error_clusters')),
+        apdex=summary.get('apdex'),
+        apdex_sparkline=_apdex_sparkline_points(summary['apdex']['timeline']) if summary.get('apdex') else None,
+        apdex_sparkline_size=(APDEX_SPARKLINE_WIDTH, APDEX_SPARKLINE_HEIGHT),
+        chart_data_json=_json_for_script_tag(chart_data) if chart_data and chart_data['series'] else None
+    )
+
+
+def get_results_output_path(jtl_file, output_dir=None, extension='.html'):
+    """
+    Returns where the results report of `jtl_file` is written: `output_dir`, or the 'JMeter_Results_Reports'
+    folder next to the results file.
+    """
+    output_dir = output_dir or os.path.join(os.path.dirname(os.path.abspath(jtl_file)), RESULTS_REPORTS_FOLDER_NAME)
+    return os.path.join(output_dir, f"{os.path.splitext(os.path.basename(jtl_file))[0]}_results_report{extension}")
+
+
+def write_sla_junit(sla_result, output_path, run_name):
+    """Writes the SLA verdict as JUnit XML for CI servers: one test case per gated transaction."""
+    failures = sum(1 for t in sla_result['transactions'] if t['status'] != 'PASS')
+    with open(output_path, "w", encoding="utf-8") as f:
+        f.write('<?xml version="1.0" encoding="UTF-8"?>\n<testsuites name=' + _xml_quoteattr(TOOL_NAME) + '>\n')
+        f.write('  <testsuite name=' + _xml_quoteattr(f"SLA {run_name}") +
+                f' tests="{len(sla_result["transactions"])}" failures="{failures}" errors="0" skipped="0">\n')
+        for transaction in sla_result['transactions']:
+            f.write('    <testcase classname="SLA" name=' + _xml_quoteattr(transaction['label']))
+            failed_checks = [check for check in transaction['checks'] if not check['passed']]
+            if transaction['status'] == 'PASS':
+                f.write('/>\n')
+                continue
+            if failed_checks:
+                message = f"{len(failed_checks)} SLA target(s) missed"
+                details = "\n".join(f"{check['metric']}: {check['actual']:g} (target {check['comparison']} "
+                                    f"{check['target']:g})" for check in failed_checks)
+            else:
+                message = "Transaction was never executed"
+                details = message
+            f.write('>\n      <failure message=' + _xml_quoteattr(message) + ' type="SLA">' + _xml_escape(details) +
+                    '</failure>\n    </testcase>\n')
+        f.write('  </testsuite>\n</testsuites>\n')
@@ -0,0 +1,199 @@
+# suite_dashboard.py
+import os
+import json
+from datetime import datetime
+from collections import Counter, defaultdict
+
+from Report.report_generator import render_template_to_file
+from Report.issue_fingerprints import BASELINE_FILE_NAME, IssueFingerprinter, load_baseline, save_baseline, \
+    diff_against_baseline, get_suite_root, get_script_key
+
+DASHBOARD_TEMPLATE_NAME = 'dashboard_template.html'
+DASHBOARD_FILE_NAME = 'validation_dashboard.html'
+# Small JSON file kept next to the dashboard with the totals of previous runs, used for the trend section.
+DASHBOARD_HISTORY_FILE_NAME = 'validation_dashboard_history.json'
+MAX_HISTORY_RUNS = 20
+WORST_OFFENDERS_LIMIT = 10
+SEVERITY_ORDER = ['ERROR', 'WARNING', 'INFO']
+
+
+class SuiteDashboard:
+    """
+    Aggregates the issues of every validated JMX file into suite-level statistics.
+    Call `add_file` once per file as soon as its issues are known (a single pass over the issues, keeping only
+    counters), then `generate` to write the dashboard HTML linking to every per-file report.
+    """
+
+    def __init__(self, selected_validations, suite_root=None):
+        self.selected_validations = list(selected_validations)
+        self.suite_root = suite_root  # Fingerprints the issues that come without one
+        self.total_issues = 0
+        self.issues_by_validation = Counter()
+        self.issues_by_severity = Counter()
+        self.issues_by_type = Counter()  # Keyed by (validation_option_name, type)
+        self.file_summaries = []
+        self.fingerprints_by_script = defaultdict(lambda: defaultdict(set))  # Script key -> validation -> set
+        self.checked_by_script = {}  # Script key -> validations run on it, the scope of the baseline comparison
+        self.baseline_diff = None
+        self.baseline_created = None
+
+    def add_file(self, file_path, issues, report_path=None, checked_validations=None):
+        """
+        Adds the issues found in `file_path` to the suite totals. `checked_validations` are the validations that
+        ran on the file (the selected validations by default).
+        """
+        script_key = get_script_key(file_path, self.suite_root)
+        checked = list(self.selected_validations if checked_validations is None else checked_validations)
+        by_validation = Counter()
+        by_severity = Counter()
+        unfingerprinted = [issue for issue in issues if 'fingerprint' not in issue]
+        if unfingerprinted:
+            IssueFingerprinter(file_path, self.suite_root).assign(unfingerprinted)
+        for issue in issues:
+            validation_name = issue.get('validation_option_name', 'Uncategorized Issues')
+            severity = issue.get('severity', 'INFO')
+            by_validation[validation_name] += 1
+            by_severity[severity] += 1
+            self.issues_by_type[(validation_name, issue.get('type', 'N/A'))] += 1
+            self.fingerprints_by_script[script_key][validation_name].add(issue['fingerprint'])
+            if validation_name not in checked:
+                checked.append(validation_name)
+
+        self.checked_by_script[script_key] = checked
+        self.total_issues += len(issues)
+        self.issues_by_validation.update(by_validation)
+        self.issues_by_severity.update(by_severity)
+        self.file_summaries.append({
+            'file_path': file_path,
+            'file_name': os.path.basename(file_path),
+            'report_path': report_path,
+            'total_issues': len(issues),
+            'issues_by_validation': by_validation,
+            'issues_by_severity': by_severity
+        })
+
+    def worst_offenders(self, limit=WORST_OFFENDERS_LIMIT):
+        """Returns the files with the most errors (then the most issues overall)."""
+        ranked = sorted(self.file_summaries,
+                        key=lambda f: (f['issues_by_severity'].get('ERROR', 0), f['total_issues']),
+                        reverse=True)
+        return [f for f in ranked[:limit] if f['total_issues'] > 0]
+
+    def _current_run_summary(self, timestamp):
+        return {
+            'timestamp': timestamp,
+            'file_count': len(self.file_summaries),
+            'total_issues': self.total_issues,
+            'issues_by_severity': dict(self.issues_by_severity),
+            'issues_by_validation': dict(self.issues_by_validation)
+        }
+
+    def compare_with_baseline(self, baseline_path):
+        """
+        Compares the issue fingerprints of this run with the baseline stored at `baseline_path`.
+        Returns the new/fixed/unchanged counts, or None when there is no baseline yet.
+        """
+        self.baseline_created, baseline = load_baseline(baseline_path)
+        self.baseline_diff = diff_against_baseline(self.fingerprints_by_script, baseline, self.checked_by_script) \
+            if baseline is not None else None
+        return self.baseline_diff
+
+    def save_baseline(self, baseline_path):
+        """
+        Stores the issue fingerprints of this run as the baseline for the next runs, keeping the baseline of the
+        scripts and validations this run did not check.
+        """
+        save_baseline(baseline_path, self.fingerprints_by_script, self.checked_by_script)
+
+    def generate(self, output_path):
+        """
+        Writes the dashboard to `output_path` and records this run in the history file next to it.
+        Call `compare_with_baseline` first to include the changes since the baseline.
+        Returns the list of run summaries (oldest first, current run last) used for the trend section.
+        """
+        output_dir = os.path.dirname(os.path.abspath(output_path))
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+        history_path = os.path.join(output_dir, DASHBOARD_HISTORY_FILE_NAME)
+        history = _load_history(history_path)
+        history.append(self._current_run_summary(timestamp))
+        history = history[-MAX_HISTORY_RUNS:]
+
+        previous_run = history[-2] if len(history) > 1 else None
+        max_history_total = max(run['total_issues'] for run in history) or 1
+
+        files = []
+        for summary in self.file_summaries:
+            report_link = None
+            if summary['report_path']:
+                report_link = _relative_link(summary['report_path'], output_dir)
+            files.append(dict(summary, report_link=report_link))
+
+        render_template_to_file(
+            DASHBOARD_TEMPLATE_NAME,
+            output_path,
+            timestamp=timestamp,
+            selected_validations=self.selected_validations,
+            severities=_ordered_severities(self.issues_by_severity),
+            total_issues=self.total_issues,
+            file_count=len(self.file_summaries),
+            files_with_issues=sum(1 for f in self.file_summaries if f['total_issues'] > 0),
+            issues_by_validation=self.issues_by_validation,
+            issues_by_severity=self.issues_by_severity,
+            top_issue_types=self.issues_by_type.most_common(WORST_OFFENDERS_LIMIT),
+            worst_offenders=[dict(f, report_link=_relative_link(f['report_path'], output_dir) if f['report_path'] else None)
+                             for f in self.worst_offenders()],
+            files=files,
+            history=history,
+            previous_run=previous_run,
+            max_history_total=max_history_total,
+            baseline_diff=self.baseline_diff,
+            baseline_created=self.baseline_created
+        )
+
+        _save_history(history_path, history)
+        return history
+
+
+def _ordered_severities(issues_by_severity):
+    """Known severities first (in order of importance), followed by any other severity that was reported."""
+    extra = sorted(s for s in issues_by_severity if s not in SEVERITY_ORDER)
+    return SEVERITY_ORDER + extra
+
+
+def _relative_link(target_path, start_dir):
+    """Returns a link usable from a page in `start_dir`; falls back to a file URL across drives."""
+    try:
+        return os.path.relpath(target_path, start_dir).replace(os.sep, '/')
+    except ValueError:
+        return 'file:///' + os.path.abspath(target_path).replace(os.sep, '/').lstrip('/')
+
+
+def _load_history(history_path):
+    try:
+        with open(history_path, "r", encoding="utf-8") as f:
+            history = json.load(f)
+        return history if isinstance(history, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def _save_history(history_path, history):
+    try:
+        with open(history_path, "w", encoding="utf-8") as f:
+            json.dump(history, f, indent=2)
+    except OSError:
+        pass  # The trend section is best effort; a read-only folder should not fail the run.
+
+
+def get_baseline_path(dashboard_path):
+    """The baseline index is kept next to the suite dashboard."""
+    return os.path.join(os.path.dirname(dashboard_path), BASELINE_FILE_NAME)
+
+
+def get_dashboard_output_path(jmx_files):
+    """
+    Returns where the suite dashboard for `jmx_files` is written: the 'JMeter_Validation_Reports' folder of the
+    deepest folder shared by all the files (the folder of the file itself when validating a single script).
+    """
+    return os.path.join(get_suite_root(jmx_files), "JMeter_Validation_Reports", DASHBOARD_FILE_NAME)
@@ -0,0 +1,229 @@
+# analyze_jtl.py
+"""
+Command line entry point of the results analyzer: aggregates JMeter CSV results files (.jtl) and writes a report.
+Several files are aggregated together, as a single run; with --merge they are the files of the load generators of
+a distributed run, merged into one time-ordered stream.
+
+Example:
+    python analyze_jtl.py results/run.jtl --format html --format json --percentile 90 --percentile 99
+    python analyze_jtl.py results/run.jtl --sla sla.json --format junit    (exit code 1 when an SLA is missed)
+    python analyze_jtl.py results/soak.jtl --cache --time-series --format json
+"""
+import os
+import sys
+import time
+import argparse
+
+from jmeter_results.jtl_analyzer import analyze_jtl_files, write_results_json, DEFAULT_WORKERS
+from jmeter_results.jtl_reader import DEFAULT_CHUNK_BYTES, LabelDictionary
+from jmeter_results.jtl_merge import DEFAULT_REORDER_WINDOW_MS
+from jmeter_results.sla_engine import load_sla_targets, evaluate_sla
+from jmeter_results.results_aggregator import DEFAULT_PERCENTILES
+from jmeter_results.apdex import ApdexAggregator, ApdexThresholds, load_apdex_thresholds, \
+    DEFAULT_APDEX_THRESHOLD_MS, DEFAULT_APDEX_BUCKET_SECONDS
+from jmeter_results.error_clusters import ErrorClusterAggregator, DEFAULT_TOP_CLUSTERS, \
+    DEFAULT_ERROR_BUCKET_SECONDS
+from jmeter_results.time_series import TimeSeriesAggregator, DEFAULT_RESOLUTIONS, load_cached_time_series, \
+    save_cached_time_series
+from jmeter_results.downsampling import DEFAULT_CHART_POINTS, MIN_CHART_POINTS
+from jmeter_results.latency_histogram import DEFAULT_SIGNIFICANT_DIGITS, MIN_SIGNIFICANT_DIGITS, \
+    MAX_SIGNIFICANT_DIGITS
+from Report.results_report import generate_results_report, get_results_output_path, write_sla_junit
+
+EXIT_CODE_OK = 0
+EXIT_CODE_SLA_FAILED = 1
+EXIT_CODE_USAGE_ERROR = 2
+
+OUTPUT_FORMAT_HTML = 'html'
+OUTPUT_FORMAT_JSON = 'json'
+OUTPUT_FORMAT_JUNIT = 'junit'
+OUTPUT_FORMATS = (OUTPUT_FORMAT_HTML, OUTPUT_FORMAT_JSON, OUTPUT_FORMAT_JUNIT)
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(description="Aggregate JMeter CSV results (.jtl) and write a report.")
+    parser.add_argument('paths', nargs='+', help="JTL files of the run.")
+    parser.add_argument('--format', dest='formats', action='append', choices=OUTPUT_FORMATS,
+                        help="Output format (repeatable): html, json, junit (the SLA verdict, with --sla). "
+                             "Defaults to html.")
+    parser.add_argument('--output-dir', help="Folder for the reports. Defaults to the 'JMeter_Results_Reports' "
+                                             "folder next to the first results file.")
+    parser.add_argument('--percentile', dest='percentiles', action='append', type=float, metavar='P',
+                        help="Percentile to report (repeatable). Defaults to "
+                             + ", ".join(str(p) for p in DEFAULT_PERCENTILES) + ".")
+    parser.add_argument('--precision', type=int, default=DEFAULT_SIGNIFICANT_DIGITS,
+                        choices=range(MIN_SIGNIFICANT_DIGITS, MAX_SIGNIFICANT_DIGITS + 1),
+                        help="Significant digits of the latency histograms the percentiles come from.")
+    parser.add_argument('--include-histograms', action='store_true',
+                        help="Add the serialized latency histogram of every label to the JSON output, so runs can "
+                             "be merged or re-queried later.")
+    parser.add_argument('--sla', help="JSON file of per-transaction SLA targets (p90/p95/error_rate/throughput...) "
+                                      "keyed by TXN name or step number. Exits with code 1 when one is missed.")
+    parser.add_argument('--apdex', metavar='FILE',
+                        help="JSON file of Apdex thresholds (T, in ms) by label name or regex. Adds the Apdex score "
+                             "of every label, thread group and time bucket.")
+    parser.add_argument('--apdex-threshold', type=int, metavar='MS',
+                        help=f"Apdex threshold T of every label (default {DEFAULT_APDEX_THRESHOLD_MS} ms), or of the "
+                             "labels the --apdex file does not set. Adds the Apdex scores.")
+    parser.add_argument('--apdex-bucket-seconds', type=int, default=DEFAULT_APDEX_BUCKET_SECONDS,
+                        help="Time bucket of the Apdex timeline, in seconds.")
+    parser.add_argument('--time-series', action='store_true',
+                        help="Compute the throughput, error rate, p95 and active threads of every interval, for the "
+                             "run, every label and every thread group, and chart them in the HTML report. With "
+                             "--cache they are kept for later runs.")
+    parser.add_argument('--time-series-resolution', type=int, choices=DEFAULT_RESOLUTIONS, metavar='SECONDS',
+                        help="Interval of the time series in the output (" +
+                             ", ".join(str(r) for r in DEFAULT_RESOLUTIONS) + "). Defaults to the finest one that "
+                             "keeps the series short enough to chart.")
+    parser.add_argument('--error-clusters', type=int, nargs='?', const=DEFAULT_TOP_CLUSTERS, metavar='TOP',
+                        help="Group the failed samples into error clusters (messages with their IDs, numbers, "
+                             f"tokens... masked) and report the largest TOP ones (default {DEFAULT_TOP_CLUSTERS}). "
+                             "Needs the text columns: cached runs are read from the results files.")
+    parser.add_argument('--error-bucket-seconds', type=int, default=DEFAULT_ERROR_BUCKET_SECONDS,
+                        help="Time bucket of the error cluster timelines, in seconds.")
+    parser.add_argument('--chart-points', type=int, default=DEFAULT_CHART_POINTS,
+                        help="Points per chart line in the HTML report; longer series are downsampled (LTTB).")
+    parser.add_argument('--merge', action='store_true',
+                        help="The files come from the load generators of one distributed run: merge them by time "
+                             "and report the samples of every generator.")
+    parser.add_argument('--reorder-window-ms', type=int, default=DEFAULT_REORDER_WINDOW_MS,
+                        help="How far back in time a sample may arrive in a file and still be merged in order.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Keep a columnar copy of every results file next to it ('<file>.columns') and reuse it "
+                             "in later runs, until the results file changes.")
+    parser.add_argument('--cache-dir', help="Folder for the columnar copies instead of next to the results files.")
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS,
+                        help="Processes parsing the results in parallel, each on a shard of the files (0: one per "
+                             "CPU core). Cached (--cache) and merged (--merge) runs are read in one process.")
+    parser.add_argument('--chunk-mb', type=int, default=DEFAULT_CHUNK_BYTES // (1024 * 1024),
+                        help="Size of the chunks the files are read in, in MB.")
+    return parser
+
+
+def main(argv=None):
+    args = build_argument_parser().parse_args(argv)
+    output_formats = args.formats or [OUTPUT_FORMAT_HTML]
+    percentiles = tuple(int(p) if p.is_integer() else p for p in args.percentiles) if args.percentiles \
+        else DEFAULT_PERCENTILES
+
+    if args.chart_points < MIN_CHART_POINTS:
+        print(f"--chart-points must be at least {MIN_CHART_POINTS}.", file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+    missing = [path for path in args.paths if not os.path.isfile(path)]
+    if missing:
+        print("Results file(s) not found: " + ", ".join(missing), file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+    sla_targets = None
+    if args.sla:
+        try:
+            sla_targets = load_sla_targets(args.sla)
+        except (OSError, ValueError) as e:
+            print(f"Invalid SLA file: {e}", file=sys.stderr)
+            return EXIT_CODE_USAGE_ERROR
+    apdex_thresholds = None
+    if args.apdex:
+        try:
+            apdex_thresholds = load_apdex_thresholds(args.apdex)
+        except (OSError, ValueError) as e:
+            print(f"Invalid Apdex file: {e}", file=sys.stderr)
+            return EXIT_CODE_USAGE_ERROR
+    if args.apdex_threshold is not None:
+        if args.apdex_threshold <= 0:
+            print("--apdex-threshold must be positive.", file=sys.stderr)
+            return EXIT_CODE_USAGE_ERROR
+        if apdex_thresholds is None:
+            apdex_thresholds = ApdexThresholds(args.apdex_threshold)
+        else:
+            apdex_thresholds.default = args.apdex_threshold
+
+    start = time.perf_counter()
+
+    def show_progress(file_path, rows_read):
+        print(f"\r{os.path.basename(file_path)}: {rows_read} sample(s) read", end="", flush=True)
+
+    use_cache = args.cache or bool(args.cache_dir)
+    merge = args.merge and len(args.paths) > 1
+    label_dictionary = LabelDictionary()
+    consumers = []
+    time_series = None
+    apdex = None
+    if apdex_thresholds is not None:
+        apdex = ApdexAggregator(label_dictionary, apdex_thresholds, args.apdex_bucket_seconds)
+        consumers.append(apdex)
+    error_clusters = None
+    if args.error_clusters:
+        error_clusters = ErrorClusterAggregator(label_dictionary, args.error_bucket_seconds)
+        consumers.append(error_clusters)
+    if args.time_series:
+        time_series = load_cached_time_series(args.paths, args.cache_dir, merge) if use_cache else None
+        if time_series is None:
+            time_series_aggregator = TimeSeriesAggregator(label_dictionary)
+            consumers.append(time_series_aggregator)
+    try:
+        aggregator, skipped_rows = analyze_jtl_files(args.paths, percentiles, consumers,
+                                                     chunk_bytes=args.chunk_mb * 1024 * 1024,
+                                                     on_progress=show_progress, significant_digits=args.precision,
+                                                     use_cache=use_cache and not error_clusters,
+                                                     cache_dir=args.cache_dir, merge=merge,
+                                                     reorder_window_ms=args.reorder_window_ms,
+                                                     label_dictionary=label_dictionary,
+                                                     workers=args.workers or os.cpu_count() or 1)
+    except ValueError as e:
+        print(f"\n{e}", file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+    print()
+    summary = aggregator.summary(include_histograms=args.include_histograms)
+    total = summary['total']
+    print(f"{total['samples']} sample(s), {len(summary['labels'])} label(s), {total['error_rate']:.2f}% errors, "
+          f"{total['throughput']:.1f}/s, read in {time.perf_counter() - start:.1f}s")
+    if skipped_rows:
+        print(f"{skipped_rows} malformed row(s) skipped.", file=sys.stderr)
+    if summary.get('out_of_order_rows'):
+        print(f"{summary['out_of_order_rows']} sample(s) arrived later than the reorder window.", file=sys.stderr)
+    if args.time_series:
+        if time_series is None:
+            time_series = time_series_aggregator.rollups()
+            if use_cache:
+                save_cached_time_series(time_series, args.paths, args.cache_dir, merge)
+        else:
+            print("Time series read from the cache.")
+        summary['time_series'] = time_series.to_dict(args.time_series_resolution or time_series.resolution_for())
+    if apdex is not None:
+        summary['apdex'] = apdex.summary()
+        print(f"Apdex {summary['apdex']['total']['score']:.3f} ({summary['apdex']['total']['rating']}).")
+    if error_clusters is not None:
+        summary['error_clusters'] = error_clusters.summary(args.error_clusters)
+        print(f"{summary['error_clusters']['errors']} error(s) in {summary['error_clusters']['clusters_total']} "
+              f"cluster(s).")
+    if sla_targets is not None:
+        summary['sla'] = evaluate_sla(aggregator, sla_targets)
+        for transaction in summary['sla']['transactions']:
+            if transaction['status'] != 'PASS':
+                missed = ", ".join(f"{check['metric']} {check['actual']:g} (target {check['comparison']} "
+                                   f"{check['target']:g})" for check in transaction['checks'] if not check['passed'])
+                print(f"SLA {transaction['status']}: {transaction['label']}" + (f" - {missed}" if missed else ""))
+        print(f"SLA {'passed' if summary['sla']['passed'] else 'FAILED'}: "
+              f"{summary['sla']['checks_total'] - summary['sla']['checks_failed']} of "
+              f"{summary['sla']['checks_total']} target(s) met.")
+
+    html_path = get_results_output_path(args.paths[0], args.output_dir)
+    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+    if OUTPUT_FORMAT_HTML in output_formats:
+        generate_results_report(summary, html_path, args.paths, skipped_rows, args.precision, time_series,
+                                args.chart_points)
+        print(f"Wrote {html_path}")
+    if OUTPUT_FORMAT_JSON in output_formats:
+        json_path = get_results_output_path(args.paths[0], args.output_dir, '.json')
+        write_results_json(summary, json_path, args.paths)
+        print(f"Wrote {json_path}")
+    if OUTPUT_FORMAT_JUNIT in output_formats and sla_targets is not None:
+        junit_path = get_results_output_path(args.paths[0], args.output_dir, '_sla_junit.xml')
+        write_sla_junit(summary['sla'], junit_path, os.path.basename(args.paths[0]))
+        print(f"Wrote {junit_path}")
+    if sla_targets is not None and not summary['sla']['passed']:
+        return EXIT_CODE_SLA_FAILED
+    return EXIT_CODE_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+# compare_jtl.py
+"""
+Command line entry point of the run comparison: compares the results of a current run with a baseline run, label
+by label, and flags the statistically significant regressions.
+
+Example:
+    python compare_jtl.py --baseline results/release_1.jtl --current results/release_2.jtl --format html --format json
+Exits with code 1 when at least one label regressed, so it can gate a pipeline.
+"""
+import os
+import sys
+import json
+import argparse
+
+from jmeter_results.run_comparison import compare_runs, DEFAULT_COMPARISON_PERCENTILE, DEFAULT_ALPHA, \
+    DEFAULT_CONFIDENCE, DEFAULT_MIN_CHANGE_PERCENT, DEFAULT_BOOTSTRAP_RESAMPLES, STATUS_REGRESSION
+from Report.comparison_report import generate_comparison_report, get_comparison_output_path
+
+EXIT_CODE_OK = 0
+EXIT_CODE_REGRESSION = 1
+EXIT_CODE_USAGE_ERROR = 2
+
+OUTPUT_FORMAT_HTML = 'html'
+OUTPUT_FORMAT_JSON = 'json'
+OUTPUT_FORMATS = (OUTPUT_FORMAT_HTML, OUTPUT_FORMAT_JSON)
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(description="Compare two JMeter runs (.jtl) and flag regressions.")
+    parser.add_argument('--baseline', nargs='+', required=True, help="JTL file(s) of the baseline run.")
+    parser.add_argument('--current', nargs='+', required=True, help="JTL file(s) of the run to check.")
+    parser.add_argument('--format', dest='formats', action='append', choices=OUTPUT_FORMATS,
+                        help="Output format (repeatable): html, json. Defaults to html.")
+    parser.add_argument('--output-dir', help="Folder for the reports. Defaults to the 'JMeter_Results_Reports' "
+                                             "folder next to the current results file.")
+    parser.add_argument('--percentile', type=float, default=DEFAULT_COMPARISON_PERCENTILE,
+                        help="Percentile whose change is measured.")
+    parser.add_argument('--alpha', type=float, default=DEFAULT_ALPHA, help="Significance level of the tests.")
+    parser.add_argument('--confidence', type=float, default=DEFAULT_CONFIDENCE,
+                        help="Level of the bootstrap confidence interval of the percentile delta.")
+    parser.add_argument('--min-change-percent', type=float, default=DEFAULT_MIN_CHANGE_PERCENT,
+                        help="Smallest percentile change (in %%) reported as a regression or improvement.")
+    parser.add_argument('--resamples', type=int, default=DEFAULT_BOOTSTRAP_RESAMPLES,
+                        help="Number of bootstrap resamples.")
+    parser.add_argument('--cache', action='store_true',
+                        help="Read (and keep) the columnar copies of the results files, as analyze_jtl.py --cache.")
+    parser.add_argument('--cache-dir', help="Folder for the columnar copies instead of next to the results files.")
+    return parser
+
+
+def main(argv=None):
+    args = build_argument_parser().parse_args(argv)
+    output_formats = args.formats or [OUTPUT_FORMAT_HTML]
+    percentile = int(args.percentile) if float(args.percentile).is_integer() else args.percentile
+
+    missing = [path for path in args.baseline + args.current if not os.path.isfile(path)]
+    if missing:
+        print("Results file(s) not found: " + ", ".join(missing), file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+    if not 0 < args.percentile <= 100 or not 0 < args.alpha < 1 or not 0 < args.confidence < 1 or \
+            args.resamples < 1:
+        print("--percentile must be in (0, 100], --alpha and --confidence in (0, 1) and --resamples positive.",
+              file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+
+    try:
+        comparison = compare_runs(args.baseline, args.current, percentile, args.alpha, args.confidence,
+                                  args.min_change_percent, args.resamples,
+                                  use_cache=args.cache or bool(args.cache_dir), cache_dir=args.cache_dir)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+
+    for transaction in comparison['transactions']:
+        if transaction['status'] == STATUS_REGRESSION:
+            print(f"REGRESSION: {transaction['label']} - {'; '.join(transaction['reasons'])}")
+    print(f"{len(comparison['transactions'])} label(s) compared: {comparison['regressions']} regression(s), "
+          f"{comparison['improvements']} improvement(s).")
+
+    html_path = get_comparison_output_path(args.current[0], args.baseline[0], args.output_dir)
+    os.makedirs(os.path.dirname(html_path), exist_ok=True)
+    if OUTPUT_FORMAT_HTML in output_formats:
+        generate_comparison_report(comparison, html_path)
+        print(f"Wrote {html_path}")
+    if OUTPUT_FORMAT_JSON in output_formats:
+        json_path = get_comparison_output_path(args.current[0], args.baseline[0], args.output_dir, '.json')
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(comparison, f, indent=2)
+        print(f"Wrote {json_path}")
+    return EXIT_CODE_REGRESSION if comparison['regressions'] else EXIT_CODE_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
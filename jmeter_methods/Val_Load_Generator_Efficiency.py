@@ -0,0 +1,261 @@
+import xml.etree.ElementTree as ET
+import re
+
+THIS_VALIDATION_OPTION_NAME = "Load Generator Efficiency"
+
+# Elements that cost the load generator CPU on every sample they apply to, and the JMeter settings that make them
+# expensive. Costs are relative units: 1 is the bookkeeping of one plain sampler. A processor, assertion, timer or
+# listener runs for every sampler in its scope (the samplers of the tree it sits in), so its cost per iteration is
+# its weight times the number of those samplers; a sampler runs once. Loop Controllers are counted once, so the
+# score of a thread group is a per-iteration estimate for comparing thread groups and scripts, not a prediction.
+
+SAMPLER_COST = 1
+VIEW_RESULTS_TREE_COST = 10   # Keeps every request and response in memory
+LISTENER_COST = 4             # Any other enabled ResultCollector (Summary Report, Aggregate Report, graphs...)
+BEANSHELL_COST = 25           # Interpreted again on every execution
+JSR223_UNCACHED_COST = 20     # Groovy compiled again on every execution
+JSR223_NON_GROOVY_COST = 15   # javascript, beanshell, jexl...: no compilation cache
+XPATH_COST = 12               # Builds a DOM of the whole response
+XPATH2_COST = 8
+BODY_AS_DOCUMENT_COST = 15    # Parses the response with Apache Tika
+BODY_UNESCAPED_COST = 3       # Copies and HTML-unescapes the whole response
+GREEDY_REGEX_COST = 3         # '.*' / '.+' over the whole body backtracks
+
+# Thread groups whose overhead (the cost of everything but the samplers) exceeds this many times the cost of their
+# samplers are reported as warnings.
+MAX_OVERHEAD_RATIO = 1.0
+TOP_OFFENDERS = 5
+
+THREAD_GROUP_TAGS = ['ThreadGroup', 'SetupThreadGroup', 'PostThreadGroup', 'TestFragmentController']
+GREEDY_REGEX_PATTERN = re.compile(r"\.[*+](?!\?)")
+
+
+def _is_sampler(element):
+    return element.tag.endswith('Sampler') or element.tag.endswith('SamplerProxy')
+
+
+def _is_enabled(element):
+    return element.get('enabled', 'true') != 'false'
+
+
+def _prop(element, name):
+    prop = element.find(f"stringProp[@name='{name}']")
+    return (prop.text or '') if prop is not None else ''
+
+
+def _pairs(hash_tree):
+    """(element, its children hashTree or None) for every element of `hash_tree`."""
+    children = list(hash_tree)
+    for i, element in enumerate(children):
+        if element.tag == 'hashTree':
+            continue
+        child_tree = children[i + 1] if i + 1 < len(children) and children[i + 1].tag == 'hashTree' else None
+        yield element, child_tree
+
+
+def _count_samplers(hash_tree):
+    """Enabled samplers in `hash_tree` and below it (a disabled element disables its whole subtree)."""
+    count = 0
+    for element, child_tree in _pairs(hash_tree):
+        if not _is_enabled(element):
+            continue
+        if _is_sampler(element):
+            count += 1
+        if child_tree is not None:
+            count += _count_samplers(child_tree)
+    return count
+
+
+def get_element_cost(element):
+    """(weight, severity, issue type, reason) of an element that is expensive to run, or None."""
+    tag = element.tag
+    if tag.endswith('ResultCollector'):
+        if element.get('guiclass') == 'ViewResultsFullVisualizer':
+            return VIEW_RESULTS_TREE_COST, 'ERROR', 'Enabled Listener', \
+                "View Results Tree keeps every request and response in memory during the run"
+        return LISTENER_COST, 'WARNING', 'Enabled Listener', \
+            "listeners process every sample in their scope; write results with the -l option instead"
+    if tag.startswith('BeanShell'):
+        return BEANSHELL_COST, 'ERROR', 'BeanShell Element', \
+            "BeanShell is interpreted again on every execution; use a JSR223 element with Groovy and caching"
+    if tag.startswith('JSR223'):
+        language = (_prop(element, 'scriptLanguage') or 'groovy').lower()
+        if language != 'groovy':
+            return JSR223_NON_GROOVY_COST, 'WARNING', 'JSR223 Without Compilation Cache', \
+                f"'{language}' scripts are not compiled and cached; use Groovy"
+        if _prop(element, 'filename').strip():
+            return None  # Script files are compiled once and cached by file name
+        cache_key = _prop(element, 'cacheKey').strip()
+        if cache_key in ('', 'false'):
+            return JSR223_UNCACHED_COST, 'WARNING', 'JSR223 Without Compilation Cache', \
+                "'Cache compiled script if available' is off, so the script is compiled on every execution"
+        if '${' in _prop(element, 'script'):
+            return JSR223_UNCACHED_COST, 'WARNING', 'JSR223 Without Compilation Cache', \
+                "the script uses ${...} variables, so every value is a new script to compile; " \
+                "read them with vars.get() instead"
+        return None
+    if tag in ('XPathExtractor', 'XPathAssertion'):
+        return XPATH_COST, 'WARNING', 'XPath Over Full Response', \
+            "XPath builds a DOM of every response; prefer a JSON, CSS or boundary extractor"
+    if tag in ('XPath2Extractor', 'XPath2Assertion'):
+        return XPATH2_COST, 'INFO', 'XPath Over Full Response', \
+            "XPath2 parses every response; prefer a JSON, CSS or boundary extractor"
+    if tag == 'RegexExtractor':
+        field = _prop(element, 'RegexExtractor.useHeaders')
+        if field == 'as_document':
+            return BODY_AS_DOCUMENT_COST, 'WARNING', 'Regex Over Parsed Document', \
+                "'Body as a Document' parses every response with Apache Tika before matching"
+        if field == 'unescaped':
+            return BODY_UNESCAPED_COST, 'INFO', 'Regex Over Unescaped Body', \
+                "'Body (unescaped)' copies and unescapes the whole response before matching"
+        if field in ('', 'false') and GREEDY_REGEX_PATTERN.search(_prop(element, 'RegexExtractor.regex')):
+            return GREEDY_REGEX_COST, 'INFO', 'Greedy Regex Over Body', \
+                "a greedy '.*' or '.+' backtracks over the whole body; use a lazy '.+?' or a boundary extractor"
+        return None
+    if tag == 'ResponseAssertion':
+        if _prop(element, 'Assertion.test_field') == 'Assertion.response_data_as_document':
+            return BODY_AS_DOCUMENT_COST, 'WARNING', 'Assertion Over Parsed Document', \
+                "'Document (text)' parses every response with Apache Tika before asserting"
+    return None
+
+
+def _collect_offenders(hash_tree, scope_samplers, offenders):
+    """Adds the expensive elements of `hash_tree` (applying to `scope_samplers` samplers) and below to `offenders`."""
+    for element, child_tree in _pairs(hash_tree):
+        if not _is_enabled(element):
+            continue
+        sampler = _is_sampler(element)
+        cost = get_element_cost(element)
+        if cost is not None:
+            executions = 1 if sampler else scope_samplers
+            offenders.append({'element': element, 'cost': cost, 'executions': executions,
+                              'total': cost[0] * executions})
+        if child_tree is not None:
+            _collect_offenders(child_tree, 1 if sampler else _count_samplers(child_tree), offenders)
+
+
+def _element_issue(offender, thread_group_name):
+    element = offender['element']
+    weight, severity, issue_type, reason = offender['cost']
+    name = element.get('testname') or f"Unnamed {element.tag}"
+    if offender['executions']:
+        cost_text = f"Costs about {offender['total']} unit(s) per iteration ({weight} x {offender['executions']} " \
+                    f"sample(s) in scope)"
+    else:
+        cost_text = "No enabled sampler in scope yet"
+    return {
+        'severity': severity,
+        'validation_option_name': THIS_VALIDATION_OPTION_NAME,
+        'type': issue_type,
+        'location': f"{element.tag} '{name}'",
+        'description': f"{cost_text}: {reason}.",
+        'thread_group': thread_group_name,
+        'element_name': name
+    }
+
+
+def analyze_jmeter_script(root_element, selected_validations_list):
+    module_issues = []
+
+    if THIS_VALIDATION_OPTION_NAME not in selected_validations_list:
+        return []
+
+    # Standard boilerplate to find the main hashTree and TestPlan
+    jmeter_test_plan_direct_hashtree = root_element.find('hashTree')
+    if jmeter_test_plan_direct_hashtree is None:
+        module_issues.append({
+            'severity': 'ERROR',
+            'validation_option_name': THIS_VALIDATION_OPTION_NAME,
+            'type': 'Structure',
+            'location': 'JMeter Test Plan',
+            'description': "Root 'jmeterTestPlan' has no child 'hashTree'. Invalid JMX structure.",
+            'thread_group': 'N/A'
+        })
+        return module_issues
+
+    top_level_controllers_hashtree = None
+    for element, child_tree in _pairs(jmeter_test_plan_direct_hashtree):
+        if element.tag == 'TestPlan':
+            top_level_controllers_hashtree = child_tree
+            break
+
+    if top_level_controllers_hashtree is None:
+        module_issues.append({
+            'severity': 'ERROR',
+            'validation_option_name': THIS_VALIDATION_OPTION_NAME,
+            'type': 'Structure',
+            'location': 'JMeter Test Plan',
+            'description': "Could not locate the primary hashTree containing Thread Groups or Test Fragments. "
+                           "JMX structure might be unexpected.",
+            'thread_group': 'N/A'
+        })
+        return module_issues
+
+    # Elements at the Test Plan level apply to the samplers of every thread group.
+    thread_groups = []
+    plan_level_offenders = []
+    for element, child_tree in _pairs(top_level_controllers_hashtree):
+        if not _is_enabled(element):
+            continue
+        if element.tag in THREAD_GROUP_TAGS:
+            if child_tree is not None:
+                thread_groups.append((element, child_tree))
+            continue
+        cost = get_element_cost(element)
+        if cost is not None and not _is_sampler(element):
+            plan_level_offenders.append({'element': element, 'cost': cost})
+
+    all_samplers = sum(_count_samplers(child_tree) for element, child_tree in thread_groups
+                       if element.tag != 'TestFragmentController')
+    for offender in plan_level_offenders:
+        offender['executions'] = all_samplers
+        offender['total'] = offender['cost'][0] * all_samplers
+        module_issues.append(_element_issue(offender, 'Test Plan'))
+
+    for thread_group, tg_children_hashtree in thread_groups:
+        current_tg_name = thread_group.get('testname') or f"Unnamed {thread_group.tag}"
+        samplers = _count_samplers(tg_children_hashtree)
+        offenders = []
+        _collect_offenders(tg_children_hashtree, samplers, offenders)
+        for offender in offenders:
+            module_issues.append(_element_issue(offender, current_tg_name))
+        if thread_group.tag != 'TestFragmentController':
+            # Test Fragments only run through Module Controllers; the Test Plan elements do not count for them.
+            offenders.extend(dict(offender, executions=samplers, total=offender['cost'][0] * samplers)
+                             for offender in plan_level_offenders)
+        if not samplers:
+            continue
+
+        sampler_cost = samplers * SAMPLER_COST
+        overhead = sum(offender['total'] for offender in offenders)
+        ratio = overhead / sampler_cost
+        top = sorted(offenders, key=lambda offender: -offender['total'])[:TOP_OFFENDERS]
+        top_text = ", ".join(f"{offender['element'].get('testname') or offender['element'].tag} "
+                             f"({offender['total']})" for offender in top)
+        module_issues.append({
+            'severity': 'WARNING' if ratio > MAX_OVERHEAD_RATIO else 'INFO',
+            'validation_option_name': THIS_VALIDATION_OPTION_NAME,
+            'type': 'Efficiency Score',
+            'location': f"{thread_group.tag} '{current_tg_name}'",
+            'description': f"Estimated CPU cost per iteration: {sampler_cost + overhead} unit(s) for {samplers} "
+                           f"sampler(s), overhead x{ratio:.1f} the samplers' own cost."
+                           + (f" Top offenders: {top_text}." if top else " No expensive elements found."),
+            'thread_group': current_tg_name
+        })
+    return module_issues, []
+
+
+# --- Self-testing / Main block for local execution (Optional, for development) ---
+if __name__ == "__main__":
+    jmx_file_to_test = r"D:\Projects\Python\JmeterAutomation\Sample_Script.jmx"  # <--- UPDATE THIS PATH
+
+    print(f"--- Running {THIS_VALIDATION_OPTION_NAME} Validation for: {jmx_file_to_test} ---")
+    try:
+        issues, _ = analyze_jmeter_script(ET.parse(jmx_file_to_test).getroot(), [THIS_VALIDATION_OPTION_NAME])
+    except (ET.ParseError, FileNotFoundError) as e:
+        print(f"ERROR: Could not read the JMX file: {e}")
+    else:
+        for issue in issues:
+            print(f"{issue['severity']} [{issue['thread_group']}] {issue['type']} - {issue['location']}: "
+                  f"{issue['description']}")
+        print(f"{len(issues)} issue(s) found.")
@@ -0,0 +1,274 @@
+# jmx_inventory.py
+import os
+import bisect
+import xml.etree.ElementTree as ET
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# The inventory of a JMX file is what the list pages offer for selection: HTTP header names, domains and sampler
+# names, each with the number of elements using it. It is built in a single streaming pass over the file, with the
+# same rules as JMXModifier.list_header_names / list_unique_domain_names / list_unique_sampler_names.
+# The same pass also keeps a small index of the values the JMXModifier operations match on (test names, header
+# names, sampler paths, argument values), so the checkout pages can count the elements an operation will touch
+# without parsing the file again (see the count_* functions).
+# Inventories are cached in memory by (path, modification time, size), so going back and forth between the pages
+# does not rescan files that have not changed. Files missing from the cache are parsed in worker processes.
+
+INVENTORY_HEADERS = 'headers'
+INVENTORY_DOMAINS = 'domains'
+INVENTORY_SAMPLERS = 'samplers'
+INVENTORY_KINDS = (INVENTORY_HEADERS, INVENTORY_DOMAINS, INVENTORY_SAMPLERS)
+
+INDEX_TEST_NAMES = 'test_names'  # Counter of the testname of every element
+INDEX_HEADER_NAMES = 'header_names'  # Counter of the stripped, lowercased header names of the Header Managers
+INDEX_DOMAIN_VALUES = 'domain_values'  # Counter of the raw HTTPSampler.domain values, as the operations match them
+INDEX_PATHS = 'paths'  # HTTPSampler.path of every HTTP sampler
+INDEX_REVERSED_PATHS = 'reversed_paths'  # The same paths reversed and sorted, for suffix counts with bisect
+INDEX_ARGUMENT_VALUES = 'argument_values'  # Argument.value of every parameter / body data
+
+_inventory_cache = {}  # Absolute path -> (cache key, inventory)
+
+
+def build_jmx_inventory(file_path):
+    """
+    Parses `file_path` and returns {'file_path': ..., 'headers': Counter, 'domains': Counter, 'samplers': Counter}
+    plus the INDEX_* entries. Raises ET.ParseError for an invalid JMX file.
+    """
+    headers = Counter()
+    domains = Counter()
+    samplers = Counter()
+    test_names = Counter()
+    header_names = Counter()
+    domain_values = Counter()
+    paths = []
+    argument_values = []
+    header_manager_depth = 0
+    http_sampler_depth = 0
+    collection_depth = 0
+
+    for event, element in ET.iterparse(file_path, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == 'HeaderManager':
+                header_manager_depth += 1
+            elif tag == 'HTTPSamplerProxy':
+                http_sampler_depth += 1
+            elif tag == 'collectionProp':
+                collection_depth += 1
+            test_name = element.get('testname')
+            if test_name:
+                test_names[test_name] += 1
+                test_class = element.get('testclass')
+                if test_class and test_class != 'HTTPSamplerProxy':
+                    samplers[test_name] += 1
+            continue
+
+        if tag == 'stringProp':
+            name = element.get('name')
+            text = element.text
+            if header_manager_depth and name and name.lower() == 'header.name':
+                header_names[(text or '').strip().lower()] += 1
+                if name == 'Header.name' and text:
+                    headers[text] += 1
+            elif http_sampler_depth and name == 'HTTPSampler.domain' and text:
+                domain_values[text] += 1
+                if text.strip():
+                    domains[text.strip()] += 1
+            elif http_sampler_depth and name == 'HTTPSampler.path' and text:
+                paths.append(text)
+            elif collection_depth and name == 'Argument.value' and text:
+                argument_values.append(text)
+        elif tag == 'HeaderManager':
+            header_manager_depth -= 1
+        elif tag == 'HTTPSamplerProxy':
+            http_sampler_depth -= 1
+        elif tag == 'collectionProp':
+            collection_depth -= 1
+        # Everything needed from this element has been read; free its content as the parse goes on.
+        element.clear()
+
+    return {
+        'file_path': file_path,
+        INVENTORY_HEADERS: headers,
+        INVENTORY_DOMAINS: domains,
+        INVENTORY_SAMPLERS: samplers,
+        INDEX_TEST_NAMES: test_names,
+        INDEX_HEADER_NAMES: header_names,
+        INDEX_DOMAIN_VALUES: domain_values,
+        INDEX_PATHS: paths,
+        INDEX_REVERSED_PATHS: sorted(path[::-1] for path in paths),
+        INDEX_ARGUMENT_VALUES: argument_values
+    }
+
+
+def _cache_key(file_path):
+    stat = os.stat(file_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def get_cached_inventory(file_path):
+    """Returns the cached inventory of `file_path`, or None when the file is not cached or has changed since."""
+    entry = _inventory_cache.get(os.path.abspath(file_path))
+    if entry is None:
+        return None
+    try:
+        return entry[1] if entry[0] == _cache_key(file_path) else None
+    except OSError:
+        return None
+
+
+def _store_inventory(file_path, key, inventory):
+    _inventory_cache[os.path.abspath(file_path)] = (key, inventory)
+
+
+def clear_inventory_cache():
+    _inventory_cache.clear()
+
+
+def iter_jmx_inventories(file_paths, max_workers=None, check_cancelled=None):
+    """
+    Yields (file_path, inventory, error) for every file as soon as it is available: cached inventories first,
+    then the others in the order their worker process finishes them. `error` is the exception raised while reading
+    the file (inventory is then None). `check_cancelled` is called between files and may raise to stop early.
+    """
+    pending = []
+    for file_path in file_paths:
+        inventory = get_cached_inventory(file_path)
+        if inventory is not None:
+            yield file_path, inventory, None
+        else:
+            pending.append(file_path)
+
+    if not pending:
+        return
+
+    keys = {}
+    for file_path in pending:
+        try:
+            # Taken before parsing, so a file modified meanwhile is simply rescanned next time.
+            keys[file_path] = _cache_key(file_path)
+        except OSError:
+            keys[file_path] = None
+
+    if len(pending) == 1:
+        # A single file is not worth starting a worker process for.
+        file_path = pending[0]
+        try:
+            inventory = build_jmx_inventory(file_path)
+        except Exception as e:
+            yield file_path, None, e
+        else:
+            if keys[file_path] is not None:
+                _store_inventory(file_path, keys[file_path], inventory)
+            yield file_path, inventory, None
+        return
+
+    workers = min(len(pending), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(build_jmx_inventory, file_path): file_path for file_path in pending}
+        try:
+            for future in as_completed(futures):
+                if check_cancelled is not None:
+                    check_cancelled()
+                file_path = futures[future]
+                try:
+                    inventory = future.result()
+                except Exception as e:
+                    yield file_path, None, e
+                    continue
+                if keys[file_path] is not None:
+                    _store_inventory(file_path, keys[file_path], inventory)
+                yield file_path, inventory, None
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def merge_inventory_counts(inventories, kind):
+    """Sums the `kind` counters of several inventories."""
+    total = Counter()
+    for inventory in inventories:
+        total.update(inventory[kind])
+    return total
+
+
+# --- Dry-run counts: how many elements each JMXModifier operation would touch in a file ---
+
+def count_elements_by_test_name(inventory, name):
+    """Elements enabled, disabled or deleted by the *_samplers_by_name operations."""
+    return inventory[INDEX_TEST_NAMES].get(name, 0)
+
+
+def count_headers(inventory, header_name):
+    """Header Manager entries modified or deleted for `header_name` (case-insensitive)."""
+    return inventory[INDEX_HEADER_NAMES].get(header_name.strip().lower(), 0)
+
+
+def count_endpoints_by_domain(inventory, domain):
+    """
+    HTTP samplers matched by the *_domain_endpoints operations and replace_domain_name. Like them, the domain must
+    match exactly: a listed domain whose value has surrounding whitespace in the file counts 0.
+    """
+    return inventory[INDEX_DOMAIN_VALUES].get(domain, 0)
+
+
+def count_endpoints_by_path_suffix(inventory, suffix):
+    """HTTP samplers whose path ends with `suffix` (the *_endpoints operations)."""
+    reversed_paths = inventory[INDEX_REVERSED_PATHS]
+    reversed_suffix = suffix[::-1]
+    low = bisect.bisect_left(reversed_paths, reversed_suffix)
+    high = bisect.bisect_right(reversed_paths, reversed_suffix + '\uffff', low)
+    return high - low
+
+
+def count_paths_containing(inventory, text):
+    """HTTP sampler paths changed by replace_string_in_url."""
+    return sum(1 for path in inventory[INDEX_PATHS] if text in path)
+
+
+def count_arguments_containing(inventory, text):
+    """Parameters / body data changed by replace_string_in_body_and_params."""
+    return sum(1 for value in inventory[INDEX_ARGUMENT_VALUES] if text in value)
+
+
+# --- Self-testing / Main block for local execution (Optional, for development) ---
+if __name__ == "__main__":
+    # Checks that the dry-run domain counts match what JMXModifier.delete_domain_endpoints really removes,
+    # on the given JMX files and on a copy of each where one domain is padded with whitespace.
+    # Usage: python -m jmeter_methods.jmx_inventory [file.jmx ...]
+    import sys
+    import tempfile
+    from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+
+    jmx_files_to_test = sys.argv[1:] or [r"D:\Projects\Python\JmeterAutomation\Sample_Script.jmx"]  # <--- UPDATE
+
+    def removed_samplers(file_path, domain):
+        modifier = JMXModifier(file_path)
+        before = sum(1 for _ in modifier.root.iter("HTTPSamplerProxy"))
+        modifier.delete_domain_endpoints(domain)
+        return before - sum(1 for _ in modifier.root.iter("HTTPSamplerProxy"))
+
+    def check(file_path):
+        inventory = build_jmx_inventory(file_path)
+        mismatches = 0
+        for domain in set(inventory[INVENTORY_DOMAINS]) | set(inventory[INDEX_DOMAIN_VALUES]):
+            counted, removed = count_endpoints_by_domain(inventory, domain), removed_samplers(file_path, domain)
+            if counted != removed:
+                mismatches += 1
+                print(f"MISMATCH {file_path}: domain {domain!r} counted {counted}, operation touches {removed}")
+        print(f"{file_path}: {len(inventory[INDEX_DOMAIN_VALUES])} domain value(s), {mismatches} mismatch(es).")
+        return mismatches
+
+    failures = 0
+    for jmx_file_to_test in jmx_files_to_test:
+        failures += check(jmx_file_to_test)
+        tree = ET.parse(jmx_file_to_test)
+        for prop in tree.getroot().iter("stringProp"):
+            if prop.get("name") == "HTTPSampler.domain" and prop.text and prop.text.strip():
+                prop.text = f"  {prop.text.strip()} "
+                break
+        with tempfile.TemporaryDirectory() as temp_dir:
+            padded_file = os.path.join(temp_dir, "padded_domain.jmx")
+            tree.write(padded_file, encoding="utf-8", xml_declaration=True)
+            failures += check(padded_file)
+    sys.exit(1 if failures else 0)
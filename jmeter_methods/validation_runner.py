@@ -0,0 +1,90 @@
+import importlib
+import xml.etree.ElementTree as ET
+
+PARSING_VALIDATION_OPTION_NAME = "JMX File Parsing"
+
+# --- IMPORTANT: Register every validation module here, in the order the validations should run ---
+# Each entry is (THIS_VALIDATION_OPTION_NAME of the module, module name). The modules are only imported when one of
+# their validations is run, so listing the options (GUI, command line help) does not load every validator.
+VALIDATOR_MODULES = [
+    ("Naming Convention (TXN_NN_Desc)", "jmeter_methods.Val_Backend_TXN_Naming_Convention"),
+    ("HTTP Request Naming (KPI_method_urlPath)", "jmeter_methods.Val_Backend_HTTPRequest_Naming_Standard"),
+    ("Server Name/Domain Hygiene", "jmeter_methods.Val_Backend_Server_Name_Hygiene"),
+    ("Extractor Variable Naming Standards", "jmeter_methods.Val_Backend_Extractor_Variable_Standards"),
+    ("Variable Naming Conventions", "jmeter_methods.Val_Backend_Variable_Naming_Conventions"),
+    ("Hardcoded Value Detection", "jmeter_methods.Val_Hardcoded_Value_Detection"),
+    ("Unused Extractors/Variables Detection", "jmeter_methods.Val_Backend_Unused_Extractors_And_Variables_Detection"),
+    ("Unextracted Variables Detection", "jmeter_methods.Val_Backend_Unextracted_Variable_Detection"),
+    ("Duplicate Extractors/Variable Conflicts", "jmeter_methods.Val_Backend_Duplicate_Extractors"),
+    ("Load Generator Efficiency", "jmeter_methods.Val_Load_Generator_Efficiency"),
+]
+
+ALL_VALIDATION_OPTIONS = [name for name, _ in VALIDATOR_MODULES]
+
+
+def load_validator(validation_name, module_name):
+    """Imports a validation module and returns its analyze_jmeter_script function."""
+    module = importlib.import_module(module_name)
+    if module.THIS_VALIDATION_OPTION_NAME != validation_name:
+        raise ValueError(f"Validation module '{module_name}' is registered as '{validation_name}' "
+                         f"but declares '{module.THIS_VALIDATION_OPTION_NAME}'.")
+    return module.analyze_jmeter_script
+
+
+def parse_jmx_file(file_path):
+    """
+    Parses a JMX file once for all validators.
+    Returns (root_element, issues): root_element is None when the file could not be parsed,
+    in which case `issues` holds the parsing error to report.
+    """
+    try:
+        return ET.parse(file_path).getroot(), []
+    except ET.ParseError as e:
+        return None, [{
+            'severity': 'ERROR',
+            'validation_option_name': PARSING_VALIDATION_OPTION_NAME,
+            'type': 'XML Parsing',
+            'location': 'JMX File',
+            'description': f"Failed to parse JMX file: {e}. Ensure it's a valid XML.",
+            'thread_group': 'N/A'
+        }]
+    except FileNotFoundError:
+        return None, [{
+            'severity': 'ERROR',
+            'validation_option_name': PARSING_VALIDATION_OPTION_NAME,
+            'type': 'File Not Found',
+            'location': 'JMX File',
+            'description': f"JMX file not found at: {file_path}",
+            'thread_group': 'N/A'
+        }]
+
+
+def get_selected_validators(validations):
+    """
+    Returns the (validation_name, analyze_function) pairs of the selected validations, in run order.
+    Only the modules of the selected validations are imported.
+    """
+    return [(name, load_validator(name, module_name)) for name, module_name in VALIDATOR_MODULES
+            if name in validations]
+
+
+def run_validator(validation_name, analyze_function, root_element, validations):
+    """Runs one validation module and returns its list of issues."""
+    result = analyze_function(root_element, validations)
+    # Validation modules return an (issues, debug_log) tuple.
+    issues = result[0] if isinstance(result, tuple) else result
+    if issues is None:
+        return [{'severity': 'ERROR', 'validation_option_name': validation_name,
+                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
+                 'description': f"The '{validation_name}' validation module returned None.",
+                 'thread_group': 'N/A'}]
+    return issues
+
+
+def validate_jmx_file(file_path, validations):
+    """Parses `file_path` and runs every selected validation on it. Returns the list of issues."""
+    root_element, issues = parse_jmx_file(file_path)
+    if root_element is not None:
+        for validation_name, analyze_function in get_selected_validators(validations):
+            issues.extend(run_validator(validation_name, analyze_function, root_element, validations))
+    return issues
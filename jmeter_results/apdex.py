@@ -0,0 +1,201 @@
+# apdex.py
+import re
+import json
+import numpy as np
+
+# Apdex scores of a run, per label, per thread group, per time bucket and overall. A successful sample is
+# satisfied when its elapsed time is at most the label's threshold T, tolerating up to 4T, and frustrated above;
+# a failed sample is always frustrated. Score = (satisfied + tolerating / 2) / samples, rated with the usual bands
+# (Excellent >= 0.94, Good >= 0.85, Fair >= 0.70, Poor >= 0.50, Unacceptable below).
+# T is resolved once per label (exact name, then the first matching pattern, then the default) and kept in an
+# array indexed by label code, so each chunk is classified with array comparisons and counted with bincount,
+# in the same pass as the other consumers. Thresholds are read from a JSON file:
+#
+#   {
+#     "default": 500,
+#     "labels": {"TXN_01_Login": 1000},
+#     "patterns": {"\\.(js|css|png)$": 200, "^TXN_": 2000}
+#   }
+
+DEFAULT_APDEX_THRESHOLD_MS = 500
+DEFAULT_APDEX_BUCKET_SECONDS = 60
+FRUSTRATION_FACTOR = 4
+
+APDEX_ZONES = ('satisfied', 'tolerating', 'frustrated')
+
+# (minimum score, rating), best first.
+APDEX_RATINGS = [
+    (0.94, 'Excellent'),
+    (0.85, 'Good'),
+    (0.70, 'Fair'),
+    (0.50, 'Poor'),
+    (0.0, 'Unacceptable'),
+]
+
+
+def get_apdex_rating(score):
+    for minimum, rating in APDEX_RATINGS:
+        if score >= minimum:
+            return rating
+    return APDEX_RATINGS[-1][1]
+
+
+def _validate_threshold(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or value <= 0:
+        raise ValueError(f"Apdex threshold of {where} must be a positive number of milliseconds.")
+    return value
+
+
+class ApdexThresholds:
+    """The Apdex threshold T (ms) of every label: by exact name, then by the first matching pattern, then default."""
+
+    def __init__(self, default=DEFAULT_APDEX_THRESHOLD_MS, labels=None, patterns=None):
+        self.default = _validate_threshold(default, "the default")
+        self.by_label = {str(label): _validate_threshold(value, f"'{label}'")
+                         for label, value in (labels or {}).items()}
+        self.patterns = []
+        for pattern, value in (patterns or {}).items():
+            try:
+                self.patterns.append((re.compile(pattern), _validate_threshold(value, f"pattern '{pattern}'")))
+            except re.error as e:
+                raise ValueError(f"Invalid Apdex pattern '{pattern}': {e}") from None
+
+    def resolve(self, label):
+        threshold = self.by_label.get(label)
+        if threshold is not None:
+            return threshold
+        for pattern, threshold in self.patterns:
+            if pattern.search(label):
+                return threshold
+        return self.default
+
+    def to_dict(self):
+        return {'default': self.default, 'labels': dict(self.by_label),
+                'patterns': {pattern.pattern: threshold for pattern, threshold in self.patterns}}
+
+
+def load_apdex_thresholds(path):
+    """Reads an Apdex thresholds file (see the format above). Raises ValueError when it is invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a JSON object.")
+    return ApdexThresholds(data.get('default', DEFAULT_APDEX_THRESHOLD_MS), data.get('labels'), data.get('patterns'))
+
+
+def _threshold_value(threshold):
+    """A threshold as written in the thresholds file: an int unless it has a fraction."""
+    threshold = float(threshold)
+    return int(threshold) if threshold.is_integer() else threshold
+
+
+def _apdex_row(counts):
+    satisfied, tolerating, frustrated = (int(count) for count in counts)
+    samples = satisfied + tolerating + frustrated
+    score = (satisfied + tolerating / 2.0) / samples if samples else 0.0
+    return {'samples': samples, 'satisfied': satisfied, 'tolerating': tolerating, 'frustrated': frustrated,
+            'score': round(score, 3), 'rating': get_apdex_rating(score) if samples else 'N/A'}
+
+
+class ApdexAggregator:
+    """
+    Chunk consumer counting the satisfied, tolerating and frustrated samples of a run per label, per thread group
+    and per time bucket of `bucket_seconds`. It must share the label dictionary of the run.
+    """
+
+    def __init__(self, label_dictionary, thresholds=None, bucket_seconds=DEFAULT_APDEX_BUCKET_SECONDS):
+        self.label_dictionary = label_dictionary
+        self.thresholds = thresholds or ApdexThresholds()
+        self.bucket_seconds = bucket_seconds
+        self.label_thresholds = np.zeros(0, dtype=np.float64)  # Label code -> T in ms (fractions kept)
+        self.by_label = np.zeros((0, len(APDEX_ZONES)), dtype=np.int64)
+        self.by_thread_group = np.zeros((0, len(APDEX_ZONES)), dtype=np.int64)
+        self.by_bucket = {}  # Bucket start in epoch ms -> [satisfied, tolerating, frustrated]
+
+    def _resolve_thresholds(self):
+        resolved = len(self.label_thresholds)
+        if resolved < len(self.label_dictionary):
+            new = [self.thresholds.resolve(label) for label in self.label_dictionary.labels[resolved:]]
+            self.label_thresholds = np.concatenate([self.label_thresholds, np.array(new, dtype=np.float64)])
+
+    @staticmethod
+    def _grow(counts, size):
+        if size > len(counts):
+            counts = np.concatenate([counts, np.zeros((size - len(counts), counts.shape[1]), dtype=np.int64)])
+        return counts
+
+    def consume(self, chunk):
+        if not chunk.size:
+            return
+        self._resolve_thresholds()
+        labels = np.asarray(chunk.labels)
+        elapsed = np.asarray(chunk.elapsed).astype(np.int64)
+        threshold = self.label_thresholds[labels]
+        # Zone index: 0 satisfied, 1 tolerating, 2 frustrated.
+        zones = (elapsed > threshold).astype(np.int64) + (elapsed > threshold * FRUSTRATION_FACTOR)
+        zones[~np.asarray(chunk.success)] = 2
+
+        self.by_label = self._grow(self.by_label, len(self.label_dictionary))
+        self.by_label += np.bincount(labels.astype(np.int64) * 3 + zones,
+                                     minlength=len(self.by_label) * 3).reshape(-1, 3)
+        if chunk.thread_groups is not None:
+            groups = np.asarray(chunk.thread_groups).astype(np.int64)
+            self.by_thread_group = self._grow(self.by_thread_group, len(self.label_dictionary.thread_groups))
+            self.by_thread_group += np.bincount(groups * 3 + zones,
+                                                minlength=len(self.by_thread_group) * 3).reshape(-1, 3)
+
+        bucket_ms = self.bucket_seconds * 1000
+        buckets = np.asarray(chunk.timestamps) // bucket_ms
+        keys, counts = np.unique(buckets * 3 + zones, return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            start = key // 3 * bucket_ms
+            bucket = self.by_bucket.get(start)
+            if bucket is None:
+                bucket = self.by_bucket[start] = np.zeros(len(APDEX_ZONES), dtype=np.int64)
+            bucket[key % 3] += count
+
+    def merge(self, other):
+        """Adds the counts of `other` (another file or process, same thresholds and bucket size) to this one."""
+        label_remap = np.array([self.label_dictionary.add(label) for label in other.label_dictionary.labels],
+                               dtype=np.int64)
+        group_remap = np.array([self.label_dictionary.thread_groups.add(group)
+                                for group in other.label_dictionary.thread_groups.labels], dtype=np.int64)
+        self._resolve_thresholds()
+        self.by_label = self._grow(self.by_label, len(self.label_dictionary))
+        np.add.at(self.by_label, label_remap[:len(other.by_label)], other.by_label)
+        self.by_thread_group = self._grow(self.by_thread_group, len(self.label_dictionary.thread_groups))
+        np.add.at(self.by_thread_group, group_remap[:len(other.by_thread_group)], other.by_thread_group)
+        for start, counts in other.by_bucket.items():
+            bucket = self.by_bucket.get(start)
+            if bucket is None:
+                self.by_bucket[start] = counts.copy()
+            else:
+                bucket += counts
+
+    def summary(self):
+        """
+        Returns {'thresholds', 'frustration_factor', 'bucket_seconds', 'total', 'labels', 'thread_groups',
+        'timeline'}. Every row has 'samples', 'satisfied', 'tolerating', 'frustrated', 'score' and 'rating';
+        label rows also have their 'label' and 'threshold', thread group rows their 'thread_group' and timeline
+        rows their bucket 'start' (epoch ms).
+        """
+        self._resolve_thresholds()
+        labels = [dict(_apdex_row(self.by_label[code]), label=self.label_dictionary[code],
+                       threshold=_threshold_value(self.label_thresholds[code]))
+                  for code in np.flatnonzero(self.by_label.sum(axis=1)).tolist()]
+        thread_groups = [dict(_apdex_row(self.by_thread_group[code]),
+                              thread_group=self.label_dictionary.thread_groups[code])
+                         for code in np.flatnonzero(self.by_thread_group.sum(axis=1)).tolist()]
+        timeline = [dict(_apdex_row(self.by_bucket[start]), start=start) for start in sorted(self.by_bucket)]
+        return {
+            'thresholds': self.thresholds.to_dict(),
+            'frustration_factor': FRUSTRATION_FACTOR,
+            'bucket_seconds': self.bucket_seconds,
+            'total': _apdex_row(self.by_label.sum(axis=0)),
+            'labels': labels,
+            'thread_groups': thread_groups,
+            'timeline': timeline,
+        }
@@ -0,0 +1,229 @@
+# columnar_cache.py
+import os
+import json
+import shutil
+import hashlib
+import numpy as np
+
+from jmeter_results.jtl_reader import JtlReader, JtlChunk, LabelDictionary, ThreadGroupDictionary, NUMERIC_COLUMNS, \
+    DEFAULT_CHUNK_BYTES
+
+# Columnar on-disk copy of a JTL file, so a run is parsed once and every later report reopens it instantly.
+# The cache is a folder next to the results file ('<name>.jtl.columns') holding one raw fixed-width file per
+# column ('<attribute>.col'), the label and thread group dictionaries and a meta.json file written last.
+# Columns are opened with np.memmap: nothing is read until a slice of a column is actually used.
+# The cache is rebuilt when the results file changes (modification time or size) or the format changes.
+# Text columns (messages, URLs...) are not cached; they are only needed by passes that read the JTL itself.
+# The merged stream of a distributed run (jtl_merge.py) is cached the same way, with its source node column,
+# and stays valid as long as none of its files changes.
+
+CACHE_FORMAT_VERSION = 3
+CACHE_FOLDER_SUFFIX = '.columns'
+MERGED_CACHE_FOLDER_PREFIX = 'merged-'
+CACHE_META_FILE_NAME = 'meta.json'
+CACHE_LABELS_FILE_NAME = 'labels.json'
+CACHE_THREAD_GROUPS_FILE_NAME = 'thread_groups.json'
+COLUMN_FILE_EXTENSION = '.col'
+DEFAULT_ROWS_PER_CHUNK = 1024 * 1024
+
+# Cached attribute -> dtype: the numeric JtlChunk columns plus the label and thread group codes and the success flags.
+CACHED_COLUMNS = dict([(attribute, np.dtype(dtype)) for attribute, dtype in NUMERIC_COLUMNS.values()] +
+                      [('labels', np.dtype(np.int32)), ('thread_groups', np.dtype(np.int32)),
+                       ('success', np.dtype(np.bool_))])
+NODE_COLUMN_DTYPE = np.dtype(np.int16)
+
+
+def get_cache_directory(jtl_path, cache_dir=None):
+    """The cache folder of `jtl_path`: next to it by default, or inside `cache_dir`."""
+    folder_name = os.path.basename(jtl_path) + CACHE_FOLDER_SUFFIX
+    return os.path.join(cache_dir, folder_name) if cache_dir else os.path.abspath(jtl_path) + CACHE_FOLDER_SUFFIX
+
+
+def get_merged_cache_directory(jtl_paths, cache_dir=None):
+    """The cache folder of the merged stream of `jtl_paths`, named after the files (next to the first one)."""
+    digest = hashlib.sha1('\n'.join(os.path.abspath(path) for path in jtl_paths).encode('utf-8')).hexdigest()[:12]
+    folder_name = f"{MERGED_CACHE_FOLDER_PREFIX}{digest}{CACHE_FOLDER_SUFFIX}"
+    return os.path.join(cache_dir or os.path.dirname(os.path.abspath(jtl_paths[0])), folder_name)
+
+
+def _source_signatures(jtl_paths):
+    signatures = []
+    for jtl_path in jtl_paths:
+        stat = os.stat(jtl_path)
+        signatures.append({'path': os.path.abspath(jtl_path), 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size})
+    return signatures
+
+
+class ColumnarCacheWriter:
+    """
+    Writes a cache folder from the chunks of `source_paths` (one JTL file, or the files of a merged run, whose
+    `node_names` are then stored as well). It is a chunk consumer: pass it to analyze_jtl_files so the cache is
+    built during the first analysis, then call `close` (or `abort` when the pass failed).
+    """
+
+    def __init__(self, directory, source_paths, label_dictionary, node_names=None):
+        self.directory = directory
+        self.label_dictionary = label_dictionary
+        self.node_names = list(node_names) if node_names else None
+        # Taken first, so a file changed meanwhile is cached again next time.
+        self.sources = _source_signatures(source_paths)
+        self.size = 0
+        self.columns = dict(CACHED_COLUMNS)
+        if self.node_names:
+            self.columns['nodes'] = NODE_COLUMN_DTYPE
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        os.makedirs(self.directory)
+        self._files = {attribute: open(os.path.join(self.directory, attribute + COLUMN_FILE_EXTENSION), 'wb')
+                       for attribute in self.columns}
+
+    def consume(self, chunk):
+        for attribute, dtype in self.columns.items():
+            self._files[attribute].write(np.ascontiguousarray(getattr(chunk, attribute), dtype=dtype).tobytes())
+        self.size += chunk.size
+
+    def _close_files(self):
+        for f in self._files.values():
+            f.close()
+
+    def close(self, skipped_rows=0):
+        """
+        Completes the cache; `skipped_rows` is the number of malformed rows the reader left out.
+        Until meta.json exists, the folder is never taken for a valid cache.
+        """
+        self._close_files()
+        with open(os.path.join(self.directory, CACHE_LABELS_FILE_NAME), "w", encoding="utf-8") as f:
+            json.dump(self.label_dictionary.labels, f)
+        with open(os.path.join(self.directory, CACHE_THREAD_GROUPS_FILE_NAME), "w", encoding="utf-8") as f:
+            json.dump(self.label_dictionary.thread_groups.labels, f)
+        meta = {
+            'version': CACHE_FORMAT_VERSION,
+            'sources': self.sources,
+            'node_names': self.node_names,
+            'rows': self.size,
+            'skipped_rows': skipped_rows,
+            'columns': {attribute: dtype.str for attribute, dtype in self.columns.items()}
+        }
+        with open(os.path.join(self.directory, CACHE_META_FILE_NAME), "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=2)
+
+    def abort(self):
+        self._close_files()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class ColumnarRun:
+    """
+    The memory-mapped columns of a cached JTL file: `timestamps`, `elapsed`, `labels`, `success` and the other
+    numeric columns, as read-only arrays of `size` rows. Label codes refer to `label_dictionary`.
+    A merged run also has a `nodes` column, the index in `node_names` of the load generator of every sample.
+    """
+
+    def __init__(self, directory, meta, label_dictionary):
+        self.directory = directory
+        self.size = meta['rows']
+        self.skipped_rows = meta.get('skipped_rows', 0)
+        self.node_names = meta.get('node_names')
+        self.label_dictionary = label_dictionary
+        self._label_remap = None  # (other dictionary, label and thread group code translations) of the last `chunk`
+        self.columns = {}
+        for attribute, dtype in meta['columns'].items():
+            path = os.path.join(directory, attribute + COLUMN_FILE_EXTENSION)
+            # np.memmap cannot map an empty file.
+            self.columns[attribute] = np.memmap(path, dtype=np.dtype(dtype), mode='r', shape=(self.size,)) \
+                if self.size else np.zeros(0, dtype=np.dtype(dtype))
+
+    def __len__(self):
+        return self.size
+
+    def __getattr__(self, name):
+        columns = self.__dict__.get('columns')
+        if columns is not None and name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def select(self, labels=None, start_timestamp=None, end_timestamp=None, success=None):
+        """
+        Row indices of the samples matching all the given filters: `labels` (names), a timestamp range
+        (start inclusive, end exclusive) and the success flag.
+        """
+        mask = np.ones(self.size, dtype=bool)
+        if labels is not None:
+            codes = [self.label_dictionary.get(label) for label in labels]
+            mask &= np.isin(self.labels, [code for code in codes if code is not None])
+        if start_timestamp is not None:
+            mask &= self.timestamps >= start_timestamp
+        if end_timestamp is not None:
+            mask &= self.timestamps < end_timestamp
+        if success is not None:
+            mask &= self.success == success
+        return np.flatnonzero(mask)
+
+    def chunk(self, rows, label_dictionary=None):
+        """
+        A JtlChunk of the rows `rows` (a slice or row indices), so cached runs go through the same consumers as
+        parsed files. With `label_dictionary`, label and thread group codes are translated into that dictionary.
+        """
+        columns = {attribute: np.asarray(values[rows]) for attribute, values in self.columns.items()}
+        if label_dictionary is None or label_dictionary is self.label_dictionary or not len(self.label_dictionary):
+            return JtlChunk(self.label_dictionary, len(columns['labels']), columns)
+        if self._label_remap is None or self._label_remap[0] is not label_dictionary:
+            self._label_remap = (label_dictionary, np.array(
+                [label_dictionary.add(label) for label in self.label_dictionary.labels], dtype=np.int32), np.array(
+                [label_dictionary.thread_groups.add(name) for name in self.label_dictionary.thread_groups.labels],
+                dtype=np.int32))
+        columns['labels'] = self._label_remap[1][columns['labels']]
+        columns['thread_groups'] = self._label_remap[2][columns['thread_groups']]
+        return JtlChunk(label_dictionary, len(columns['labels']), columns)
+
+    def iter_chunks(self, label_dictionary=None, rows_per_chunk=DEFAULT_ROWS_PER_CHUNK):
+        for start in range(0, self.size, rows_per_chunk):
+            yield self.chunk(slice(start, start + rows_per_chunk), label_dictionary)
+
+
+def _open_cache(directory, source_paths):
+    try:
+        with open(os.path.join(directory, CACHE_META_FILE_NAME), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(directory, CACHE_LABELS_FILE_NAME), "r", encoding="utf-8") as f:
+            labels = json.load(f)
+        with open(os.path.join(directory, CACHE_THREAD_GROUPS_FILE_NAME), "r", encoding="utf-8") as f:
+            thread_groups = json.load(f)
+        sources = _source_signatures(source_paths)
+    except (OSError, ValueError):
+        return None
+    if meta.get('version') != CACHE_FORMAT_VERSION or meta.get('sources') != sources or \
+            not set(CACHED_COLUMNS).issubset(meta.get('columns', ())):
+        return None
+    return ColumnarRun(directory, meta, LabelDictionary(labels, ThreadGroupDictionary(thread_groups)))
+
+
+def open_columnar_cache(jtl_path, cache_dir=None):
+    """Returns the ColumnarRun of `jtl_path`, or None when there is no cache or it is out of date."""
+    return _open_cache(get_cache_directory(jtl_path, cache_dir), [jtl_path])
+
+
+def open_merged_cache(jtl_paths, cache_dir=None):
+    """Returns the ColumnarRun of the merged stream of `jtl_paths`, or None when missing or out of date."""
+    return _open_cache(get_merged_cache_directory(jtl_paths, cache_dir), jtl_paths)
+
+
+def build_columnar_cache(jtl_path, cache_dir=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Converts `jtl_path` into its columnar cache and returns the ColumnarRun."""
+    label_dictionary = LabelDictionary()
+    writer = ColumnarCacheWriter(get_cache_directory(jtl_path, cache_dir), [jtl_path], label_dictionary)
+    reader = JtlReader(jtl_path, label_dictionary, chunk_bytes)
+    try:
+        for chunk in reader:
+            writer.consume(chunk)
+    except BaseException:
+        writer.abort()
+        raise
+    writer.close(reader.skipped_rows)
+    return open_columnar_cache(jtl_path, cache_dir)
+
+
+def load_jtl_columns(jtl_path, cache_dir=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """The ColumnarRun of `jtl_path`, converting the file first when its cache is missing or out of date."""
+    run = open_columnar_cache(jtl_path, cache_dir)
+    return run if run is not None else build_columnar_cache(jtl_path, cache_dir, chunk_bytes)
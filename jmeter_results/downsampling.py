@@ -0,0 +1,65 @@
+# downsampling.py
+import numpy as np
+
+# Largest-Triangle-Three-Buckets (LTTB) downsampling of chart series, so a report draws a run of any length with
+# about as many points as a chart has pixels. The points between the first and the last one are split into
+# `threshold - 2` equal buckets, and each bucket keeps the point forming the largest triangle with the point kept
+# in the previous bucket and the average of the next bucket: spikes and level changes survive, flat stretches
+# collapse. The bucket bounds and averages are computed for all buckets at once; the choice in a bucket depends on
+# the previous one, so buckets are walked in order, each with one vectorized argmax over its points. Series sharing
+# their x values (all the series of a run are on the same time grid) are walked together, one row each.
+# The highest point of the series is always kept, so the peak of a chart is never smoothed away.
+
+DEFAULT_CHART_POINTS = 1000
+MIN_CHART_POINTS = 3
+
+
+def lttb_indices(x, y, threshold=DEFAULT_CHART_POINTS):
+    """
+    Indices of the points of the series (x, y) kept by LTTB, at most `threshold` (all of them when the series is
+    shorter). `x` must be increasing. `y` may also be 2-D, several series sharing the same x values (e.g. the
+    metrics of a time series); they are downsampled together and the result has one row of indices per series.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    rows = np.atleast_2d(y)
+    size = len(x)
+    if size <= threshold or threshold < MIN_CHART_POINTS:
+        indices = np.arange(size)
+        return indices if y.ndim == 1 else np.tile(indices, (len(rows), 1))
+
+    bucket_count = threshold - 2
+    bounds = (np.arange(bucket_count + 1) * ((size - 2) / bucket_count)).astype(np.int64) + 1
+    bounds[-1] = size - 1
+    starts, ends = bounds[:-1], bounds[1:]
+    lengths = ends - starts
+    # Average point of every bucket (up to size - 1, so the last bucket stops before the last point).
+    average_x = np.add.reduceat(x[:-1], starts) / lengths
+    average_y = np.add.reduceat(rows[:, :-1], starts, axis=1) / lengths
+    next_x = np.append(average_x[1:], x[-1])
+    next_y = np.concatenate([average_y[:, 1:], rows[:, -1:]], axis=1)
+
+    row_indexes = np.arange(len(rows))
+    selected = np.empty((len(rows), threshold), dtype=np.int64)
+    selected[:, 0] = 0
+    selected[:, -1] = size - 1
+    previous = np.zeros(len(rows), dtype=np.int64)
+    for bucket in range(bucket_count):
+        start, end = starts[bucket], ends[bucket]
+        ax = x[previous][:, None]
+        ay = rows[row_indexes, previous][:, None]
+        areas = np.abs((ax - next_x[bucket]) * (rows[:, start:end] - ay) -
+                       (ax - x[start:end]) * (next_y[:, bucket, None] - ay))
+        previous = start + areas.argmax(axis=1)
+        selected[:, bucket + 1] = previous
+
+    peaks = rows.argmax(axis=1)
+    inner = (peaks > 0) & (peaks < size - 1)
+    selected[row_indexes[inner], np.searchsorted(ends, peaks[inner], side='right') + 1] = peaks[inner]
+    return selected[0] if y.ndim == 1 else selected
+
+
+def lttb(x, y, threshold=DEFAULT_CHART_POINTS):
+    """The (x, y) arrays of the series downsampled with LTTB to at most `threshold` points."""
+    indices = lttb_indices(x, y, threshold)
+    return np.asarray(x)[indices], np.asarray(y)[indices]
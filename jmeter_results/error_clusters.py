@@ -0,0 +1,199 @@
+# error_clusters.py
+import re
+import hashlib
+import numpy as np
+
+from jmeter_results.jtl_reader import LabelDictionary
+
+# Groups the failed samples of a run into error clusters. The responseCode, responseMessage and failureMessage of
+# a failed sample are normalized into templates by masking what varies between occurrences of the same error
+# (UUIDs, timestamps, IP addresses, hex values, tokens, ids and numbers), with rules compiled once. Every distinct
+# template gets an int code, so the counts per cluster, per label and per time bucket are vectorized group-bys
+# over the failed rows of each chunk, all in the same pass as the other consumers.
+# A cluster is identified by a hash of its template, stable from one run to the next.
+# Only the failed rows have their text extracted. Chunks read from a columnar cache carry no text columns; their
+# failed samples are counted in `rows_without_text`.
+
+DEFAULT_ERROR_BUCKET_SECONDS = 60
+DEFAULT_TOP_CLUSTERS = 20
+TOP_LABELS_PER_CLUSTER = 5
+MAX_CACHED_MESSAGES = 200000
+
+# (rule, replacement), applied in order: the specific shapes first, then whatever digits are left.
+MASKING_RULES = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), '<UUID>'),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\b"), '<TIMESTAMP>'),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), '<IP>'),
+    (re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+"), '<EMAIL>'),
+    (re.compile(r"\b0[xX][0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{12,}\b"), '<HEX>'),
+    (re.compile(r"\b(?=[A-Za-z0-9_\-]*\d)(?=[A-Za-z0-9_\-]*[A-Za-z])[A-Za-z0-9_\-]{20,}={0,2}"), '<TOKEN>'),
+    # Any other run of 6+ word characters holding a digit (short hex ids, session ids, order numbers); a number
+    # with a unit ('1200ms') is left to the next rule so that it masks like '500ms'.
+    (re.compile(r"\b(?!\d+(?:\.\d+)?(?:ms|s|sec|min|kb|mb|gb)\b)(?=[A-Za-z0-9_\-]*\d)[A-Za-z0-9_\-]{6,}\b",
+                re.IGNORECASE), '<ID>'),
+    # Whole numbers only, optionally followed by their unit: digits inside a word are not masked one by one.
+    (re.compile(r"\b\d+(?:\.\d+)?(?=(?:ms|s|sec|min|kb|mb|gb)?\b)", re.IGNORECASE), '<N>'),
+]
+_TEXT_COLUMNS = ('responseCode', 'responseMessage', 'failureMessage')
+_FIELD_SEPARATOR = '\x1f'
+
+
+def normalize_message(text):
+    """The template of an error message: `text` with its variable parts masked."""
+    for rule, replacement in MASKING_RULES:
+        text = rule.sub(replacement, text)
+    return text.strip()
+
+
+def get_cluster_id(template):
+    """Stable short id of a cluster template."""
+    return hashlib.sha1(template.encode('utf-8')).hexdigest()[:12]
+
+
+class ErrorClusterAggregator:
+    """
+    Chunk consumer counting the failed samples of a run by error cluster, overall, per label and per time bucket
+    of `bucket_seconds`. `summary` gives the largest clusters. It must share the label dictionary of the run.
+    """
+
+    def __init__(self, label_dictionary, bucket_seconds=DEFAULT_ERROR_BUCKET_SECONDS):
+        self.label_dictionary = label_dictionary
+        self.bucket_seconds = bucket_seconds
+        self.templates = LabelDictionary()  # Cluster code -> template (the three normalized fields)
+        self.examples = []  # Cluster code -> raw fields of its first occurrence
+        self.errors = 0
+        self.rows_without_text = 0
+        self.count = np.zeros(0, dtype=np.int64)
+        self.first_timestamp = np.zeros(0, dtype=np.int64)
+        self.last_timestamp = np.zeros(0, dtype=np.int64)
+        self.by_label = {}  # (cluster code, label code) -> count
+        self.by_bucket = {}  # (cluster code, bucket start in epoch ms) -> count
+        self._normalized = {}  # Raw field -> template, for messages that repeat verbatim
+
+    def _normalize(self, text):
+        template = self._normalized.get(text)
+        if template is None:
+            template = normalize_message(text)
+            if len(self._normalized) >= MAX_CACHED_MESSAGES:
+                self._normalized.clear()
+            self._normalized[text] = template
+        return template
+
+    def _grow(self, size):
+        extra = size - len(self.count)
+        if extra > 0:
+            self.count = np.concatenate([self.count, np.zeros(extra, dtype=np.int64)])
+            self.first_timestamp = np.concatenate([self.first_timestamp,
+                                                   np.full(extra, np.iinfo(np.int64).max, dtype=np.int64)])
+            self.last_timestamp = np.concatenate([self.last_timestamp, np.zeros(extra, dtype=np.int64)])
+
+    def consume(self, chunk):
+        rows = np.flatnonzero(~np.asarray(chunk.success))
+        if not len(rows):
+            return
+        self.errors += len(rows)
+        if not chunk.has_text:
+            self.rows_without_text += len(rows)
+            return
+        fields = [chunk.text(column, rows) for column in _TEXT_COLUMNS]
+        codes = np.empty(len(rows), dtype=np.int64)
+        for i, raw in enumerate(zip(*fields)):
+            # HTTP status codes are kept; other response codes are messages ('Non HTTP response code: ...').
+            response_code = raw[0] if raw[0].isdigit() else self._normalize(raw[0])
+            code = self.templates.add(_FIELD_SEPARATOR.join([response_code, self._normalize(raw[1]),
+                                                             self._normalize(raw[2])]))
+            if code == len(self.examples):
+                self.examples.append(list(raw))
+            codes[i] = code
+        self._add_counts(codes, chunk.labels[rows], chunk.timestamps[rows])
+
+    def _add_counts(self, codes, labels, timestamps):
+        self._grow(len(self.templates))
+        self.count += np.bincount(codes, minlength=len(self.count))
+        np.minimum.at(self.first_timestamp, codes, timestamps)
+        np.maximum.at(self.last_timestamp, codes, timestamps)
+        keys, counts = np.unique((codes << 32) | labels.astype(np.int64), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            pair = (key >> 32, key & 0xFFFFFFFF)
+            self.by_label[pair] = self.by_label.get(pair, 0) + count
+        bucket_ms = self.bucket_seconds * 1000
+        buckets = timestamps // bucket_ms
+        keys, counts = np.unique((codes << 32) | (buckets - buckets.min()), return_counts=True)
+        first_bucket = int(buckets.min())
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            pair = (key >> 32, ((key & 0xFFFFFFFF) + first_bucket) * bucket_ms)
+            self.by_bucket[pair] = self.by_bucket.get(pair, 0) + count
+
+    def merge(self, other):
+        """Adds the clusters of `other` (another file or process, same bucket size) to this one."""
+        remap = [self.templates.add(template) for template in other.templates.labels]
+        label_remap = [self.label_dictionary.add(label) for label in other.label_dictionary.labels]
+        for code, example in zip(remap, other.examples):
+            if code == len(self.examples):
+                self.examples.append(example)
+        self._grow(len(self.templates))
+        remap_array = np.array(remap, dtype=np.int64)
+        self.count[remap_array] += other.count
+        self.first_timestamp[remap_array] = np.minimum(self.first_timestamp[remap_array], other.first_timestamp)
+        self.last_timestamp[remap_array] = np.maximum(self.last_timestamp[remap_array], other.last_timestamp)
+        for (code, label), count in other.by_label.items():
+            pair = (remap[code], label_remap[label])
+            self.by_label[pair] = self.by_label.get(pair, 0) + count
+        for (code, bucket), count in other.by_bucket.items():
+            pair = (remap[code], bucket)
+            self.by_bucket[pair] = self.by_bucket.get(pair, 0) + count
+        self.errors += other.errors
+        self.rows_without_text += other.rows_without_text
+
+    def summary(self, top=DEFAULT_TOP_CLUSTERS):
+        """
+        Returns {'errors', 'clusters_total', 'bucket_seconds', 'rows_without_text', 'clusters': [...]} with the
+        `top` largest clusters, each with its 'id', 'response_code', 'response_message' and 'failure_message'
+        templates, 'count', 'percent' (of the errors), 'labels' (the largest, as [label, count]),
+        'first_timestamp', 'last_timestamp', 'timeline' ([[bucket start, count], ...]) and 'example'.
+        """
+        labels_of = {}
+        for (code, label), count in self.by_label.items():
+            labels_of.setdefault(code, []).append([self.label_dictionary[label], count])
+        timeline_of = {}
+        for (code, bucket), count in self.by_bucket.items():
+            timeline_of.setdefault(code, []).append([bucket, count])
+
+        clusters = []
+        for code in np.argsort(-self.count, kind='stable')[:top].tolist():
+            template = self.templates[code]
+            response_code, response_message, failure_message = template.split(_FIELD_SEPARATOR)
+            clusters.append({
+                'id': get_cluster_id(template),
+                'response_code': response_code,
+                'response_message': response_message,
+                'failure_message': failure_message,
+                'count': int(self.count[code]),
+                'percent': self.count[code] / self.errors * 100 if self.errors else 0.0,
+                'labels': sorted(labels_of.get(code, []), key=lambda item: -item[1])[:TOP_LABELS_PER_CLUSTER],
+                'first_timestamp': int(self.first_timestamp[code]),
+                'last_timestamp': int(self.last_timestamp[code]),
+                'timeline': sorted(timeline_of.get(code, [])),
+                'example': dict(zip(('response_code', 'response_message', 'failure_message'), self.examples[code])),
+            })
+        return {
+            'errors': self.errors,
+            'clusters_total': len(self.templates),
+            'bucket_seconds': self.bucket_seconds,
+            'rows_without_text': self.rows_without_text,
+            'clusters': clusters,
+        }
+
+
+# --- Self-testing / Main block for local execution (Optional, for development) ---
+if __name__ == "__main__":
+    # Messages that differ only by an id must collapse to one template.
+    same_template = [
+        [f"Request {i:08x} failed: read timed out" for i in range(0, 2000 * 7919, 7919)],
+        [f"Invalid session=AbC{i}xyz for user" for i in range(100, 2100)],
+        [f"Request took {elapsed}ms, limit 1000ms" for elapsed in (500, 1200, 30000)],
+    ]
+    for messages in same_template:
+        templates = {normalize_message(message) for message in messages}
+        assert len(templates) == 1, f"{len(templates)} templates for {messages[0]!r}: {sorted(templates)[:5]}"
+        print(f"OK  {messages[0]!r} -> {templates.pop()!r}")
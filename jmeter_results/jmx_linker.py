@@ -0,0 +1,147 @@
+# jmx_linker.py
+import re
+import xml.etree.ElementTree as ET
+
+# Links the aggregated results of a run (ResultsAggregator.summary) back to the elements of the JMX script that
+# produced them. JMeter labels a sample with the testname of its sampler or Transaction Controller, so the link is a
+# hash join: the script's samplers and Transaction Controllers are indexed by testname in one streaming pass, then
+# every results label is a dict lookup. Both sides stay linear, however many labels the run has.
+#   - Labels ending in '-<N>' are the sub-results of a sampler (redirects, embedded resources); they are linked to
+#     the sampler when there is no element with the full name.
+#   - Elements whose testname holds a variable or function ('${...}') cannot be matched by name.
+#   - The children of a Transaction Controller that generates a parent sample record no sample of their own.
+# Elements that are executable and link to no label are flagged as never executed; labels that link to no element
+# are flagged as orphans (renamed or deleted elements, samples of another script).
+
+RESULTS_PERCENTILE = 95
+
+ELEMENT_TRANSACTION_CONTROLLER = 'Transaction Controller'
+ELEMENT_SAMPLER = 'Sampler'
+
+STATUS_EXECUTED = 'EXECUTED'
+STATUS_NEVER_EXECUTED = 'NEVER EXECUTED'
+STATUS_DISABLED = 'DISABLED'
+STATUS_DYNAMIC_NAME = 'DYNAMIC NAME'
+STATUS_IN_PARENT_SAMPLE = 'IN PARENT SAMPLE'
+
+THREAD_GROUP_TAGS = ('ThreadGroup', 'SetupThreadGroup', 'PostThreadGroup', 'TestFragmentController')
+
+_SUB_RESULT_SUFFIX = re.compile(r"-\d+$")
+
+
+def _element_type(tag):
+    if tag == 'TransactionController':
+        return ELEMENT_TRANSACTION_CONTROLLER
+    if tag.endswith('Sampler') or tag.endswith('SamplerProxy'):
+        return ELEMENT_SAMPLER
+    return None
+
+
+def index_jmx_elements(file_path):
+    """
+    Reads the samplers and Transaction Controllers of the JMX file `file_path` in one streaming pass.
+    Returns a list of {'name', 'type', 'tag', 'thread_group', 'enabled', 'in_parent_sample'} in script order;
+    `enabled` is False when the element or one of its parents is disabled. Raises ET.ParseError for an invalid file.
+    """
+    elements = []
+    tag_stack = []
+    # One entry per open hashTree: the element whose children it holds, as (element, enabled, thread group,
+    # inside a parent-sample Transaction Controller).
+    owners = [(None, True, 'N/A', False)]
+    previous = None  # The last test element closed directly in the current hashTree
+
+    for event, element in ET.iterparse(file_path, events=('start', 'end')):
+        tag = element.tag
+        if event == 'start':
+            if tag == 'hashTree':
+                owners.append(previous or owners[-1])
+                previous = None
+            tag_stack.append(tag)
+            continue
+
+        tag_stack.pop()
+        if tag == 'hashTree':
+            owners.pop()
+            previous = None
+        elif tag_stack and tag_stack[-1] == 'hashTree' and element.get('testname') is not None:
+            _, parent_enabled, thread_group, in_parent_sample = owners[-1]
+            name = element.get('testname')
+            enabled = parent_enabled and element.get('enabled', 'true') != 'false'
+            if tag in THREAD_GROUP_TAGS:
+                thread_group = name
+            element_type = _element_type(tag)
+            if element_type is not None:
+                elements.append({
+                    'name': name,
+                    'type': element_type,
+                    'tag': tag,
+                    'thread_group': thread_group,
+                    'enabled': enabled,
+                    'in_parent_sample': in_parent_sample,
+                })
+            if element_type == ELEMENT_TRANSACTION_CONTROLLER:
+                parent = element.find("boolProp[@name='TransactionController.parent']")
+                in_parent_sample = in_parent_sample or (parent is not None and parent.text == 'true')
+            previous = (tag, enabled, thread_group, in_parent_sample)
+            element.clear()
+    return elements
+
+
+def _results_figures(row, percentile):
+    return {
+        'samples': row['samples'],
+        'errors': row['errors'],
+        'error_rate': row['error_rate'],
+        'throughput': row['throughput'],
+        'mean': row['mean'],
+        'percentile': row['percentiles'].get(percentile),
+    }
+
+
+def link_results(elements, summary, percentile=RESULTS_PERCENTILE):
+    """
+    Joins the script `elements` (see index_jmx_elements) with the label rows of the results `summary`.
+    Returns {'percentile', 'elements': [element + 'status' and 'results'], 'orphan_labels': [figures + 'label'],
+    'executed', 'never_executed', 'labels_total', 'labels_linked'}. 'results' holds the samples, errors,
+    error_rate, throughput, mean and percentile of the element's label, or None.
+    """
+    if percentile not in summary['percentiles']:
+        percentile = max(summary['percentiles'])
+    elements_by_name = {}
+    for position, element in enumerate(elements):
+        elements_by_name.setdefault(element['name'], []).append(position)
+
+    rows_by_name = {}
+    orphan_labels = []
+    for row in summary['labels']:
+        label = row['label']
+        if label in elements_by_name:
+            rows_by_name[label] = row
+        elif _SUB_RESULT_SUFFIX.sub('', label) not in elements_by_name:
+            orphan_labels.append(dict(_results_figures(row, percentile), label=label))
+
+    linked = []
+    for element in elements:
+        row = rows_by_name.get(element['name'])
+        if row is not None:
+            status = STATUS_EXECUTED
+        elif not element['enabled']:
+            status = STATUS_DISABLED
+        elif '${' in element['name']:
+            status = STATUS_DYNAMIC_NAME
+        elif element['in_parent_sample']:
+            status = STATUS_IN_PARENT_SAMPLE
+        else:
+            status = STATUS_NEVER_EXECUTED
+        linked.append(dict(element, status=status,
+                           results=_results_figures(row, percentile) if row is not None else None))
+
+    return {
+        'percentile': percentile,
+        'elements': linked,
+        'orphan_labels': orphan_labels,
+        'executed': sum(1 for element in linked if element['status'] == STATUS_EXECUTED),
+        'never_executed': sum(1 for element in linked if element['status'] == STATUS_NEVER_EXECUTED),
+        'labels_total': len(summary['labels']),
+        'labels_linked': len(summary['labels']) - len(orphan_labels),
+    }
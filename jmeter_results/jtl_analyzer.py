@@ -0,0 +1,177 @@
+# jtl_analyzer.py
+import os
+import json
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from jmeter_results.jtl_reader import JtlReader, LabelDictionary, DEFAULT_CHUNK_BYTES, find_shard_offsets
+from jmeter_results.results_aggregator import ResultsAggregator, DEFAULT_PERCENTILES
+from jmeter_results.latency_histogram import DEFAULT_SIGNIFICANT_DIGITS
+from jmeter_results.columnar_cache import ColumnarCacheWriter, open_columnar_cache, open_merged_cache, \
+    get_cache_directory, get_merged_cache_directory
+from jmeter_results.jtl_merge import JtlMerger, DEFAULT_REORDER_WINDOW_MS
+
+# Runs the chunks of one or more JTL files through the ResultsAggregator and any number of extra consumers.
+# A consumer is any object with a `consume(chunk)` method; it sees every chunk once, right after it is parsed,
+# so all the figures of a run are computed in a single pass over the files.
+# With `use_cache`, files that have an up-to-date columnar cache (columnar_cache.py) are read from it instead of
+# being parsed, and the cache of the others is written during the same pass.
+# With `merge`, the files are the load generators of one distributed run and are read as a single time-ordered
+# stream (jtl_merge.py); with `use_cache` that merged stream is cached as a whole.
+# With `workers` > 1, every file is split into shards at record boundaries and the shards are parsed in worker
+# processes. Each worker runs fresh copies of the consumers over its shard with its own label dictionary, and the
+# partial states (counts, sums, histograms...) are merged in shard order, so labels keep the order they first
+# appear in. This needs consumers with a `merge(other)` method; merged streams and cached runs are read in a single
+# process (a time-ordered merge and a cache file are both sequential by nature).
+
+DEFAULT_WORKERS = 1
+MIN_SHARD_BYTES = 32 * 1024 * 1024  # Smaller shards cost more in process start-up and merging than they save
+
+
+def _run_chunks(source_name, chunks, consumers, on_progress):
+    rows_read = 0
+    for chunk in chunks:
+        for consumer in consumers:
+            consumer.consume(chunk)
+        rows_read += chunk.size
+        if on_progress is not None:
+            on_progress(source_name, rows_read)
+
+
+def _run_with_cache_writer(source_name, chunks, consumers, on_progress, cache_writer, skipped_rows_of):
+    """Runs `chunks` through `consumers` and the optional `cache_writer`, completing the cache on success."""
+    try:
+        _run_chunks(source_name, chunks, list(consumers) + ([cache_writer] if cache_writer else []), on_progress)
+    except BaseException:
+        if cache_writer:
+            cache_writer.abort()
+        raise
+    if cache_writer:
+        cache_writer.close(skipped_rows_of())
+
+
+def analyze_jtl_files(file_paths, percentiles=DEFAULT_PERCENTILES, consumers=(), chunk_bytes=DEFAULT_CHUNK_BYTES,
+                      on_progress=None, significant_digits=DEFAULT_SIGNIFICANT_DIGITS, use_cache=False,
+                      cache_dir=None, merge=False, reorder_window_ms=DEFAULT_REORDER_WINDOW_MS, label_dictionary=None,
+                      workers=DEFAULT_WORKERS, min_shard_bytes=MIN_SHARD_BYTES):
+    """
+    Aggregates the samples of `file_paths` and returns (aggregator, skipped_rows).
+    `on_progress(source_name, rows_read)` is called after every chunk. `significant_digits` is the precision of
+    the latency histograms the percentiles are computed from. Chunks read from a cache have no text columns.
+    Consumers that keep label codes must be built on `label_dictionary`, the dictionary the chunks are read with.
+    `workers` > 1 parses shards of at least `min_shard_bytes` in that many processes (see above); it is ignored
+    with `use_cache` or `merge`, or when a consumer cannot `merge`.
+    """
+    label_dictionary = label_dictionary if label_dictionary is not None else LabelDictionary()
+    aggregator = ResultsAggregator(label_dictionary, percentiles, significant_digits)
+    consumers = [aggregator] + list(consumers)
+
+    if workers > 1 and not use_cache and not (merge and len(file_paths) > 1) and \
+            all(hasattr(consumer, 'merge') for consumer in consumers):
+        return aggregator, _analyze_sharded(file_paths, consumers, chunk_bytes, on_progress, workers,
+                                            min_shard_bytes)
+
+    if merge and len(file_paths) > 1:
+        return aggregator, _analyze_merged(file_paths, label_dictionary, aggregator, consumers, chunk_bytes,
+                                           on_progress, use_cache, cache_dir, reorder_window_ms)
+
+    skipped_rows = 0
+    for file_path in file_paths:
+        run = open_columnar_cache(file_path, cache_dir) if use_cache else None
+        if run is not None:
+            _run_chunks(file_path, run.iter_chunks(label_dictionary), consumers, on_progress)
+            skipped_rows += run.skipped_rows
+            continue
+        reader = JtlReader(file_path, label_dictionary, chunk_bytes)
+        cache_writer = ColumnarCacheWriter(get_cache_directory(file_path, cache_dir), [file_path], label_dictionary) \
+            if use_cache else None
+        _run_with_cache_writer(file_path, reader, consumers, on_progress, cache_writer, lambda: reader.skipped_rows)
+        skipped_rows += reader.skipped_rows
+    return aggregator, skipped_rows
+
+
+def _analyze_shard(file_path, start_offset, end_offset, pickled_consumers, chunk_bytes):
+    """Worker side: runs fresh copies of the consumers over one shard, with a label dictionary of its own."""
+    consumers = pickle.loads(pickled_consumers)
+    label_dictionary = LabelDictionary()
+    for consumer in consumers:
+        consumer.label_dictionary = label_dictionary
+    reader = JtlReader(file_path, label_dictionary, chunk_bytes, start_offset, end_offset)
+    _run_chunks(file_path, reader, consumers, None)
+    return consumers, reader.skipped_rows, reader.rows_read
+
+
+def _analyze_sharded(file_paths, consumers, chunk_bytes, on_progress, workers, min_shard_bytes):
+    shards = []
+    for file_path in file_paths:
+        shard_count = max(min(workers, os.path.getsize(file_path) // max(min_shard_bytes, 1)), 1)
+        offsets = find_shard_offsets(file_path, shard_count)
+        shards.extend((file_path, start, end) for start, end in zip(offsets, offsets[1:]))
+    if len(shards) == 1:
+        # A single small file is not worth starting a worker process for.
+        reader = JtlReader(file_paths[0], consumers[0].label_dictionary, chunk_bytes)
+        _run_chunks(file_paths[0], reader, consumers, on_progress)
+        return reader.skipped_rows
+
+    skipped_rows = 0
+    rows_read = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+        # Pickled once, while the consumers are still empty: the executor sends the arguments of a task in the
+        # background, when the consumers may already hold merged results.
+        pickled_consumers = pickle.dumps(consumers)
+        futures = [executor.submit(_analyze_shard, file_path, start, end, pickled_consumers, chunk_bytes)
+                   for file_path, start, end in shards]
+        for (file_path, _, _), future in zip(shards, futures):
+            partials, shard_skipped_rows, shard_rows = future.result()
+            for consumer, partial in zip(consumers, partials):
+                consumer.merge(partial)
+            skipped_rows += shard_skipped_rows
+            rows_read[file_path] = rows_read.get(file_path, 0) + shard_rows
+            if on_progress is not None:
+                on_progress(file_path, rows_read[file_path])
+    return skipped_rows
+
+
+def _analyze_merged(file_paths, label_dictionary, aggregator, consumers, chunk_bytes, on_progress, use_cache,
+                    cache_dir, reorder_window_ms):
+    source_name = f"{len(file_paths)} merged files"
+    node_names = [os.path.basename(path) for path in file_paths]
+    if use_cache:
+        run = open_merged_cache(file_paths, cache_dir)
+        if run is not None:
+            aggregator.node_names = run.node_names
+            _run_chunks(source_name, run.iter_chunks(label_dictionary), consumers, on_progress)
+            return run.skipped_rows
+
+    # The cached copy of a single file, when there is one, is a faster source than the file itself.
+    sources = []
+    readers = []
+    cached_skipped_rows = 0
+    for file_path in file_paths:
+        run = open_columnar_cache(file_path, cache_dir) if use_cache else None
+        if run is not None:
+            sources.append(run.iter_chunks(label_dictionary))
+            cached_skipped_rows += run.skipped_rows
+        else:
+            reader = JtlReader(file_path, label_dictionary, chunk_bytes)
+            readers.append(reader)
+            sources.append(reader)
+
+    merger = JtlMerger(sources, label_dictionary, node_names, reorder_window_ms)
+    aggregator.node_names = merger.node_names
+    cache_writer = ColumnarCacheWriter(get_merged_cache_directory(file_paths, cache_dir), file_paths,
+                                       label_dictionary, node_names) if use_cache else None
+
+    def skipped_rows():
+        return cached_skipped_rows + sum(reader.skipped_rows for reader in readers)
+
+    _run_with_cache_writer(source_name, merger, consumers, on_progress, cache_writer, skipped_rows)
+    aggregator.out_of_order_rows = merger.out_of_order_rows
+    return skipped_rows()
+
+
+def write_results_json(summary, output_path, source_files):
+    """Writes the summary of a run as JSON, for pipelines and other tools."""
+    data = dict(summary, source_files=[os.path.abspath(f) for f in source_files])
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
@@ -0,0 +1,138 @@
+# jtl_merge.py
+import heapq
+import numpy as np
+
+from jmeter_results.jtl_reader import JtlChunk, CHUNK_ARRAYS
+
+# Streaming k-way merge of the JTL files written by the load generators of a distributed run.
+# Each source keeps a small sorted buffer of pending samples. A heap orders the sources by their horizon: the
+# latest timestamp read from the source, minus a reorder window. Every sample up to the lowest horizon is
+# final and is emitted, merged across sources by timestamp. Then the source that holds the others back reads its
+# next chunk. Memory stays at a few chunks per source, and the sources are never sorted as a whole.
+# JMeter writes a sample when it ends while its timestamp is its start, so a file is only roughly in time order.
+# The reorder window absorbs that; samples that come later than the window allows are still emitted, and are
+# counted in `out_of_order_rows`.
+
+DEFAULT_REORDER_WINDOW_MS = 60 * 1000
+MIN_EMITTED_ROWS = 64 * 1024
+
+_SOURCE_CHUNK = '_source_chunk'
+_SOURCE_ROW = '_source_row'
+
+
+class JtlMerger:
+    """
+    Merges `sources` (iterables of JtlChunk sharing `label_dictionary`, one per load generator) into a single
+    stream of time-ordered JtlChunk objects whose `nodes` column is the index of the source of every sample.
+    """
+
+    def __init__(self, sources, label_dictionary, node_names=None, reorder_window_ms=DEFAULT_REORDER_WINDOW_MS):
+        self.sources = [iter(source) for source in sources]
+        self.label_dictionary = label_dictionary
+        self.node_names = list(node_names) if node_names else [f"node {i + 1}" for i in range(len(self.sources))]
+        self.reorder_window_ms = reorder_window_ms
+        self.rows_merged = 0
+        self.out_of_order_rows = 0
+        self._pending = [None] * len(self.sources)
+        self._latest = [np.iinfo(np.int64).min] * len(self.sources)
+        self._chunks = {}  # Serial -> source chunk, while some of its rows are pending (for the text columns)
+        self._next_serial = 0
+        self._last_emitted_timestamp = np.iinfo(np.int64).min
+
+    def _read_next(self, source):
+        """Reads the next chunk of `source` into its buffer. Returns False when the source is exhausted."""
+        chunk = next(self.sources[source], None)
+        while chunk is not None and not chunk.size:
+            chunk = next(self.sources[source], None)
+        if chunk is None:
+            return False
+        serial = self._next_serial
+        self._next_serial += 1
+        self._chunks[serial] = chunk
+        columns = {attribute: np.asarray(getattr(chunk, attribute)) for attribute in CHUNK_ARRAYS}
+        columns[_SOURCE_CHUNK] = np.full(chunk.size, serial, dtype=np.int64)
+        columns[_SOURCE_ROW] = np.arange(chunk.size, dtype=np.int64)
+        pending = self._pending[source]
+        if pending is not None:
+            columns = {name: np.concatenate([pending[name], values]) for name, values in columns.items()}
+        order = np.argsort(columns['timestamps'], kind='stable')
+        self._pending[source] = {name: values[order] for name, values in columns.items()}
+        self._latest[source] = max(self._latest[source], int(chunk.timestamps.max()))
+        return True
+
+    def _horizon(self, source):
+        return self._latest[source] - self.reorder_window_ms
+
+    def _ready_rows(self, watermark):
+        return sum(int(np.searchsorted(pending['timestamps'], watermark, side='right'))
+                   for pending in self._pending if pending is not None)
+
+    def _emit(self, watermark=None):
+        """Takes every pending sample up to `watermark` (all of them when None) as one time-ordered chunk."""
+        parts = []
+        for source, pending in enumerate(self._pending):
+            if pending is None:
+                continue
+            count = len(pending['timestamps']) if watermark is None else \
+                int(np.searchsorted(pending['timestamps'], watermark, side='right'))
+            if count:
+                part = {name: values[:count] for name, values in pending.items()}
+                part['nodes'] = np.full(count, source, dtype=np.int16)
+                parts.append(part)
+                self._pending[source] = {name: values[count:] for name, values in pending.items()}
+        if not parts:
+            return None
+
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+        order = np.argsort(columns['timestamps'], kind='stable')
+        columns = {name: values[order] for name, values in columns.items()}
+        self.out_of_order_rows += int(np.count_nonzero(columns['timestamps'] < self._last_emitted_timestamp))
+        self._last_emitted_timestamp = max(self._last_emitted_timestamp, int(columns['timestamps'][-1]))
+
+        source_chunks = columns.pop(_SOURCE_CHUNK)
+        source_rows = columns.pop(_SOURCE_ROW)
+        chunks = {serial: self._chunks[serial] for serial in np.unique(source_chunks).tolist()}
+        still_pending = set()
+        for pending in self._pending:
+            if pending is not None:
+                still_pending.update(np.unique(pending[_SOURCE_CHUNK]).tolist())
+        for serial in list(self._chunks):
+            if serial not in still_pending:
+                del self._chunks[serial]
+
+        merged = JtlChunk(self.label_dictionary, len(order), columns)
+
+        def text_source(column, rows):
+            values = [''] * len(rows)
+            row_chunks = source_chunks[rows]
+            for serial in np.unique(row_chunks).tolist():
+                positions = np.flatnonzero(row_chunks == serial)
+                texts = chunks[serial].text(column, source_rows[rows[positions]])
+                for position, text in zip(positions.tolist(), texts):
+                    values[position] = text
+            return values
+
+        merged._text_source = text_source
+        self.rows_merged += merged.size
+        return merged
+
+    def __iter__(self):
+        heap = []
+        for source in range(len(self.sources)):
+            if self._read_next(source):
+                heap.append((self._horizon(source), source))
+        heapq.heapify(heap)
+
+        while heap:
+            watermark = heap[0][0]
+            if self._ready_rows(watermark) >= MIN_EMITTED_ROWS:
+                chunk = self._emit(watermark)
+                if chunk is not None:
+                    yield chunk
+            _, source = heapq.heappop(heap)
+            if self._read_next(source):
+                heapq.heappush(heap, (self._horizon(source), source))
+
+        chunk = self._emit()
+        if chunk is not None:
+            yield chunk
@@ -0,0 +1,398 @@
+# jtl_reader.py
+import os
+import re
+import csv
+import numpy as np
+
+# Streams a JMeter CSV results file (.jtl) in chunks of a few MB and turns each chunk into NumPy columns.
+# Rows are split with vectorized byte operations: the positions of the newlines and commas of a chunk give the
+# bounds of every field, and the numeric fields are read digit by digit over the whole chunk at once. Only the rows
+# that contain quotes (labels or messages with commas) go through the csv module. Labels are dictionary-encoded:
+# a chunk holds one int32 code per sample, the names are kept once in a LabelDictionary shared by all chunks.
+# The thread group of every sample (its threadName without the ' N-M' thread number) is encoded the same way.
+# Memory stays bounded by the chunk size, whatever the size of the file.
+# A reader can also be limited to a byte range of the file (a shard, see find_shard_offsets), so several processes
+# can parse one large file in parallel.
+
+DEFAULT_CHUNK_BYTES = 8 * 1024 * 1024
+
+# Column order JMeter writes when the file has no header line (default jmeter.save.saveservice.* settings).
+DEFAULT_JTL_COLUMNS = ['timeStamp', 'elapsed', 'label', 'responseCode', 'responseMessage', 'threadName',
+                       'dataType', 'success', 'failureMessage', 'bytes', 'sentBytes', 'grpThreads', 'allThreads',
+                       'URL', 'Latency', 'IdleTime', 'Connect']
+
+REQUIRED_COLUMNS = ('timeStamp', 'elapsed', 'label', 'success')
+
+# JTL column -> (JtlChunk attribute, dtype). Optional columns missing from the file are read as zeros.
+NUMERIC_COLUMNS = {
+    'timeStamp': ('timestamps', np.int64),
+    'elapsed': ('elapsed', np.int32),
+    'Latency': ('latency', np.int32),
+    'Connect': ('connect', np.int32),
+    'IdleTime': ('idle_time', np.int32),
+    'bytes': ('bytes', np.int64),
+    'sentBytes': ('sent_bytes', np.int64),
+    'grpThreads': ('group_threads', np.int32),
+    'allThreads': ('all_threads', np.int32),
+}
+
+# Every array attribute of a JtlChunk ('nodes' only exists in merged streams, see jtl_merge.py).
+CHUNK_ARRAYS = [attribute for attribute, _ in NUMERIC_COLUMNS.values()] + ['labels', 'thread_groups', 'success']
+
+TEXT_COLUMNS = ('responseCode', 'responseMessage', 'threadName', 'dataType', 'failureMessage', 'URL')
+
+_NEWLINE = ord('\n')
+_COMMA = ord(',')
+_QUOTE = ord('"')
+_DIGIT_ZERO = ord('0')
+
+# JMeter names its threads '<thread group name> <group number>-<thread number>'.
+THREAD_NUMBER_PATTERN = re.compile(r" \d+-\d+$")
+
+
+class LabelDictionary:
+    """
+    Two-way mapping between sample labels and the int32 codes stored in the chunks. `thread_groups` is the
+    dictionary of the thread group codes, shared along with it.
+    """
+
+    def __init__(self, labels=(), thread_groups=None):
+        self.labels = []
+        self._codes = {}
+        self._byte_codes = {}
+        for label in labels:
+            self.add(label)
+        self.thread_groups = thread_groups if thread_groups is not None else ThreadGroupDictionary()
+
+    def __len__(self):
+        return len(self.labels)
+
+    def __getitem__(self, code):
+        return self.labels[code]
+
+    def add(self, label):
+        """Returns the code of `label`, adding it to the dictionary when it is new."""
+        code = self._codes.get(label)
+        if code is None:
+            code = len(self.labels)
+            self._codes[label] = code
+            self.labels.append(label)
+        return code
+
+    def get(self, label):
+        """The code of `label`, or None when it has never been seen."""
+        return self._codes.get(label)
+
+    def encode(self, labels):
+        return np.fromiter((self.add(label) for label in labels), dtype=np.int32, count=len(labels))
+
+    def encode_bytes(self, raw_labels):
+        """Like `encode` for the undecoded UTF-8 labels of the vectorized parser (decodes each new label once)."""
+        codes = list(map(self._byte_codes.get, raw_labels))
+        if None in codes:
+            for i, code in enumerate(codes):
+                if code is None:
+                    raw = raw_labels[i]
+                    code = self._byte_codes.get(raw)
+                    if code is None:
+                        code = self.add(raw.decode('utf-8', 'replace'))
+                        self._byte_codes[raw] = code
+                    codes[i] = code
+        return np.array(codes, dtype=np.int32)
+
+
+class ThreadGroupDictionary(LabelDictionary):
+    """Codes of the thread groups; `add` takes a thread name and keeps only its thread group part."""
+
+    def __init__(self, names=()):
+        self.labels = []
+        self._codes = {}
+        self._byte_codes = {}
+        for name in names:
+            self.add(name)
+
+    def add(self, thread_name):
+        return super().add(THREAD_NUMBER_PATTERN.sub('', thread_name))
+
+
+class JtlChunk:
+    """
+    The samples of one chunk of a JTL file as NumPy columns: `timestamps`, `elapsed`, `labels` (codes of
+    `label_dictionary`), `thread_groups` (codes of `label_dictionary.thread_groups`), `success` and the other
+    NUMERIC_COLUMNS attributes. `nodes` is the index of the load generator each sample comes from when several
+    files are merged, otherwise None. Text columns are only extracted on request with `text`, usually for a few
+    rows (e.g. the failed samples).
+    """
+
+    def __init__(self, label_dictionary, size, columns=None):
+        """`columns` optionally gives arrays for some attributes (e.g. slices of a columnar cache)."""
+        columns = columns or {}
+        self.label_dictionary = label_dictionary
+        self.size = size
+        self.labels = columns.get('labels')
+        self.thread_groups = columns.get('thread_groups')
+        self.success = columns.get('success')
+        self.nodes = columns.get('nodes')
+        for attribute, dtype in NUMERIC_COLUMNS.values():
+            values = columns.get(attribute)
+            setattr(self, attribute, values if values is not None else np.zeros(size, dtype=dtype))
+        self._text_source = None  # Function (column name, row indices) -> list of strings
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def has_text(self):
+        """Whether the text columns can be read (not for chunks of a columnar cache)."""
+        return self._text_source is not None
+
+    def text(self, column, rows=None):
+        """Returns the values of the text column `column` ('' when absent) for `rows` (all rows by default)."""
+        if rows is None:
+            rows = np.arange(self.size)
+        if self._text_source is None:
+            return [''] * len(rows)
+        return self._text_source(column, np.asarray(rows))
+
+
+class JtlReader:
+    """
+    Reads `file_path` chunk by chunk. Iterating over the reader yields JtlChunk objects; `skipped_rows` counts the
+    malformed rows (e.g. the truncated last line of an interrupted run) that were left out.
+    With `start_offset` / `end_offset` (record boundaries, see find_shard_offsets), only the records in that byte
+    range are read; the header line is still read from the start of the file.
+    Raises ValueError when a required column is missing or a numeric field is not a number (for instance
+    timestamps written with a date format instead of milliseconds).
+    """
+
+    def __init__(self, file_path, label_dictionary=None, chunk_bytes=DEFAULT_CHUNK_BYTES, start_offset=0,
+                 end_offset=None):
+        self.file_path = file_path
+        self.label_dictionary = label_dictionary if label_dictionary is not None else LabelDictionary()
+        self.chunk_bytes = chunk_bytes
+        self.start_offset = start_offset
+        self.end_offset = end_offset
+        self.columns = None
+        self.skipped_rows = 0
+        self.rows_read = 0
+
+    def __iter__(self):
+        with open(self.file_path, 'rb') as f:
+            self.columns = self._read_header(f)
+            self._column_index = {name: i for i, name in enumerate(self.columns)}
+            missing = [name for name in REQUIRED_COLUMNS if name not in self._column_index]
+            if missing:
+                raise ValueError(f"{self.file_path}: missing JTL column(s) {', '.join(missing)}. "
+                                 f"Only CSV results files are supported.")
+            if self.start_offset > f.tell():
+                f.seek(self.start_offset)
+            remaining = self.end_offset - f.tell() if self.end_offset is not None else None
+
+            remainder = b''
+            while True:
+                if remaining is None:
+                    block = f.read(self.chunk_bytes)
+                else:
+                    block = f.read(min(self.chunk_bytes, remaining)) if remaining > 0 else b''
+                    remaining -= len(block)
+                data = remainder + block
+                if not block:
+                    if data.strip():
+                        yield self._parse_chunk(data if data.endswith(b'\n') else data + b'\n')
+                    return
+                cut = _last_record_end(data)
+                if cut == 0:
+                    remainder = data  # A single record longer than the block; read more.
+                    continue
+                remainder = data[cut:]
+                chunk = self._parse_chunk(data[:cut])
+                if chunk.size:
+                    yield chunk
+
+    @staticmethod
+    def _read_header(f):
+        first_line = f.readline()
+        text = first_line.decode('utf-8', 'replace').lstrip('﻿')
+        if text.startswith('timeStamp'):
+            return next(csv.reader([text.rstrip('\r\n')]))
+        f.seek(0)
+        return list(DEFAULT_JTL_COLUMNS)
+
+    def _parse_chunk(self, data):
+        if b'\r' in data:
+            data = data.replace(b'\r\n', b'\n')
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        line_ends = np.flatnonzero(buffer == _NEWLINE)
+        line_starts = np.empty_like(line_ends)
+        line_starts[0] = 0
+        line_starts[1:] = line_ends[:-1] + 1
+        non_empty = line_ends > line_starts
+        line_ends, line_starts = line_ends[non_empty], line_starts[non_empty]
+        line_count = len(line_ends)
+        column_count = len(self.columns)
+
+        quotes = np.flatnonzero(buffer == _QUOTE)
+        quotes_per_line = np.bincount(np.searchsorted(line_ends, quotes), minlength=line_count)
+        # A line that starts inside a quoted field (an odd number of quotes before it) continues a multi-line
+        # record; like the lines with quotes, it is left to the csv module.
+        odd_quotes = quotes_per_line % 2
+        inside_quotes = (np.cumsum(odd_quotes) - odd_quotes) % 2 == 1
+        commas = np.flatnonzero(buffer == _COMMA)
+        comma_lines = np.searchsorted(line_ends, commas)
+        commas_per_line = np.bincount(comma_lines, minlength=line_count)
+        fast_lines = (quotes_per_line == 0) & ~inside_quotes & (commas_per_line == column_count - 1)
+
+        fast_rows = np.flatnonzero(fast_lines)
+        slow_rows = np.flatnonzero(~fast_lines)
+
+        # Field bounds of the rows split without the csv module: field k of a row spans
+        # bounds[row, k] + 1 .. bounds[row, k + 1].
+        bounds = np.empty((len(fast_rows), column_count + 1), dtype=np.int64)
+        bounds[:, 0] = line_starts[fast_rows] - 1
+        bounds[:, column_count] = line_ends[fast_rows]
+        if column_count > 1 and len(fast_rows):
+            bounds[:, 1:column_count] = commas[fast_lines[comma_lines]].reshape(len(fast_rows), column_count - 1)
+
+        slow_records = []
+        if len(slow_rows):
+            lines = (data[line_starts[row]:line_ends[row] + 1].decode('utf-8', 'replace') for row in slow_rows)
+            reader = csv.reader(lines)
+            kept_rows = []
+            lines_read = 0
+            # csv.reader joins the lines of a multi-line record; a record is kept at the row of its first line.
+            for record in reader:
+                row = slow_rows[lines_read]
+                lines_read = reader.line_num
+                if len(record) == column_count:
+                    kept_rows.append(row)
+                    slow_records.append(record)
+                else:
+                    self.skipped_rows += 1
+            slow_rows = np.array(kept_rows, dtype=np.int64)
+
+        # Chunk order: the fast and slow rows interleaved as in the file.
+        order = np.argsort(np.concatenate([fast_rows, slow_rows]), kind='stable')
+        size = len(order)
+        chunk = JtlChunk(self.label_dictionary, size)
+        self.rows_read += size
+
+        def combine(fast_values, slow_values, dtype):
+            return np.concatenate([np.asarray(fast_values, dtype=dtype),
+                                   np.asarray(slow_values, dtype=dtype)])[order]
+
+        column_index = self._column_index
+        for name, (attribute, dtype) in NUMERIC_COLUMNS.items():
+            index = column_index.get(name)
+            if index is None:
+                continue
+            fast_values = _parse_integers(buffer, bounds[:, index] + 1, bounds[:, index + 1],
+                                          self.file_path, name)
+            slow_values = [_parse_integer(record[index], self.file_path, name) for record in slow_records]
+            setattr(chunk, attribute, combine(fast_values, slow_values, dtype))
+
+        index = column_index['label']
+        fast_labels = self.label_dictionary.encode_bytes(
+            [data[start:end] for start, end in zip((bounds[:, index] + 1).tolist(), bounds[:, index + 1].tolist())])
+        slow_labels = self.label_dictionary.encode([record[index] for record in slow_records])
+        chunk.labels = combine(fast_labels, slow_labels, np.int32)
+
+        thread_groups = self.label_dictionary.thread_groups
+        index = column_index.get('threadName')
+        if index is None:
+            chunk.thread_groups = np.full(size, thread_groups.add(''), dtype=np.int32)
+        else:
+            fast_groups = thread_groups.encode_bytes(
+                [data[start:end] for start, end in zip((bounds[:, index] + 1).tolist(),
+                                                       bounds[:, index + 1].tolist())])
+            slow_groups = thread_groups.encode([record[index] for record in slow_records])
+            chunk.thread_groups = combine(fast_groups, slow_groups, np.int32)
+
+        index = column_index['success']
+        first_characters = buffer[np.minimum(bounds[:, index] + 1, len(buffer) - 1)] | 0x20  # Lowercase
+        fast_success = first_characters == ord('t')
+        slow_success = [record[index].strip().lower() == 'true' for record in slow_records]
+        chunk.success = combine(fast_success, slow_success, bool)
+
+        source_of_row = np.concatenate([np.arange(len(fast_rows)), -1 - np.arange(len(slow_rows))])[order]
+
+        def text_source(column, rows):
+            index = column_index.get(column)
+            if index is None:
+                return [''] * len(rows)
+            values = []
+            for source in source_of_row[rows].tolist():
+                if source >= 0:
+                    values.append(data[bounds[source, index] + 1:bounds[source, index + 1]].decode('utf-8', 'replace'))
+                else:
+                    values.append(slow_records[-1 - source][index])
+            return values
+
+        chunk._text_source = text_source
+        return chunk
+
+
+def read_jtl_chunks(file_path, label_dictionary=None, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    """Shortcut for iterating over JtlReader(file_path, ...)."""
+    return iter(JtlReader(file_path, label_dictionary, chunk_bytes))
+
+
+def find_shard_offsets(file_path, shard_count):
+    """
+    Splits `file_path` into at most `shard_count` byte ranges of about the same size, cut at record boundaries.
+    Returns the sorted offsets [0, ..., file size]; shard i spans offsets[i]..offsets[i + 1].
+    A cut is moved to the next line that starts with a digit (the timeStamp of a record), which keeps the
+    continuation lines of a multi-line quoted message in their record.
+    """
+    size = os.path.getsize(file_path)
+    offsets = [0]
+    with open(file_path, 'rb') as f:
+        for shard in range(1, shard_count):
+            f.seek(max(size * shard // shard_count - 1, offsets[-1]))
+            f.readline()  # Rest of the line the cut falls in
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line or line[:1].isdigit():
+                    break
+            if offsets[-1] < offset < size:
+                offsets.append(offset)
+    offsets.append(size)
+    return offsets
+
+
+def _last_record_end(data):
+    """
+    Offset just after the last complete record of `data` (0 when there is none): the last newline that is not
+    inside a quoted field, i.e. with an even number of quotes before it.
+    """
+    cut = data.rfind(b'\n') + 1
+    while cut and data.count(b'"', 0, cut) % 2:
+        cut = data.rfind(b'\n', 0, cut - 1) + 1
+    return cut
+
+
+def _parse_integers(buffer, starts, ends, file_path, column):
+    """Parses the unsigned decimal fields buffer[starts:ends] of every row at once (empty fields are 0)."""
+    values = np.zeros(len(starts), dtype=np.int64)
+    if not len(starts):
+        return values
+    widths = ends - starts
+    for offset in range(int(widths.max())):
+        active = widths > offset
+        digits = buffer[np.where(active, starts + offset, 0)].astype(np.int64) - _DIGIT_ZERO
+        if ((digits < 0) | (digits > 9))[active].any():
+            row = int(np.flatnonzero(active & ((digits < 0) | (digits > 9)))[0])
+            raise ValueError(f"{file_path}: column '{column}' has a non-numeric value "
+                             f"'{bytes(buffer[starts[row]:ends[row]]).decode('utf-8', 'replace')}'.")
+        values = np.where(active, values * 10 + digits, values)
+    return values
+
+
+def _parse_integer(text, file_path, column):
+    text = text.strip()
+    if not text:
+        return 0
+    try:
+        return int(text)
+    except ValueError:
+        raise ValueError(f"{file_path}: column '{column}' has a non-numeric value '{text}'.") from None
@@ -0,0 +1,257 @@
+# latency_histogram.py
+import math
+import zlib
+import struct
+import numpy as np
+
+# Log-bucketed latency histograms in the style of HdrHistogram. Values below 2 * 10^digits (rounded up to a power
+# of two) each get their own bucket; above that, every power-of-two range is split into the same number of linear
+# buckets, so a recorded value is known within a relative error of 10^-digits whatever its magnitude.
+# Histograms of the same precision are merged by adding their bucket counts, which makes them usable across
+# chunks, files and worker processes, and they serialize to a few KB (only the non-empty buckets, compressed).
+#   - LatencyHistogram: one histogram (e.g. a whole run, or one label after the fact).
+#   - HistogramSet: many sparse histograms keyed by an integer group (a label code, a time bucket...), recorded
+#     and queried with vectorized operations.
+
+DEFAULT_SIGNIFICANT_DIGITS = 3
+MIN_SIGNIFICANT_DIGITS = 1
+MAX_SIGNIFICANT_DIGITS = 5
+
+_SERIALIZATION_VERSION = 1
+_SERIALIZATION_HEADER = struct.Struct('<BBqqqq')  # version, digits, total count, min, max, sum
+_GROUP_BITS = 32
+_BUCKET_MASK = (1 << _GROUP_BITS) - 1
+
+
+def _sub_bucket_bits(significant_digits):
+    if not MIN_SIGNIFICANT_DIGITS <= significant_digits <= MAX_SIGNIFICANT_DIGITS:
+        raise ValueError(f"Histogram precision must be {MIN_SIGNIFICANT_DIGITS} to {MAX_SIGNIFICANT_DIGITS} "
+                         f"significant digits, not {significant_digits}.")
+    return math.ceil(math.log2(2 * 10 ** significant_digits))
+
+
+def bucket_indexes(values, sub_bucket_bits):
+    """Bucket index of every value of `values` (negative values are counted as 0)."""
+    values = np.maximum(np.asarray(values, dtype=np.int64), 0)
+    sub_bucket_count = 1 << sub_bucket_bits
+    half_count = sub_bucket_count >> 1
+    # frexp gives the bit length of the values exactly (they are far below 2^53).
+    shifts = np.maximum(np.frexp(values.astype(np.float64))[1].astype(np.int64) - sub_bucket_bits, 0)
+    return np.where(shifts == 0, values,
+                    sub_bucket_count + (shifts - 1) * half_count + (values >> shifts) - half_count)
+
+
+def _bucket_ranges(indexes, sub_bucket_bits):
+    indexes = np.asarray(indexes, dtype=np.int64)
+    sub_bucket_count = 1 << sub_bucket_bits
+    half_count = sub_bucket_count >> 1
+    above = np.maximum(indexes - sub_bucket_count, 0)
+    shifts = above // half_count + 1
+    mantissas = above % half_count + half_count
+    exact = indexes < sub_bucket_count
+    return np.where(exact, indexes, mantissas << shifts), np.where(exact, indexes, ((mantissas + 1) << shifts) - 1)
+
+
+def bucket_lowest_values(indexes, sub_bucket_bits):
+    """The lowest value counted in each bucket of `indexes`."""
+    return _bucket_ranges(indexes, sub_bucket_bits)[0]
+
+
+def bucket_highest_values(indexes, sub_bucket_bits):
+    """The highest value counted in each bucket of `indexes` (what percentiles are reported as)."""
+    return _bucket_ranges(indexes, sub_bucket_bits)[1]
+
+
+def _percentile_ranks(total_counts, percentiles):
+    """Nearest rank of every percentile, shape (len(total_counts), len(percentiles))."""
+    fractions = np.asarray(percentiles, dtype=np.float64) / 100.0
+    ranks = np.ceil(np.asarray(total_counts, dtype=np.float64)[:, None] * fractions[None, :]).astype(np.int64)
+    return np.maximum(ranks, 1)
+
+
+class LatencyHistogram:
+    """A single mergeable histogram of millisecond values."""
+
+    def __init__(self, significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = _sub_bucket_bits(significant_digits)
+        self.counts = np.zeros(1 << self.sub_bucket_bits, dtype=np.int64)
+        self.total_count = 0
+        self.min_value = 0
+        self.max_value = 0
+        self.value_sum = 0
+
+    def _grow(self, size):
+        if size > len(self.counts):
+            self.counts = np.concatenate([self.counts, np.zeros(size - len(self.counts), dtype=np.int64)])
+
+    def _add_extremes(self, count, min_value, max_value, value_sum):
+        if not count:
+            return
+        self.min_value = min(self.min_value, min_value) if self.total_count else min_value
+        self.max_value = max(self.max_value, max_value) if self.total_count else max_value
+        self.total_count += count
+        self.value_sum += value_sum
+
+    def record_values(self, values):
+        values = np.maximum(np.asarray(values, dtype=np.int64), 0)
+        if not len(values):
+            return
+        indexes = bucket_indexes(values, self.sub_bucket_bits)
+        self._grow(int(indexes.max()) + 1)
+        self.counts += np.bincount(indexes, minlength=len(self.counts))
+        self._add_extremes(len(values), int(values.min()), int(values.max()), int(values.sum()))
+
+    def add_bucket_counts(self, indexes, counts, min_value=None, max_value=None, value_sum=0):
+        """
+        Adds counts recorded elsewhere with the same precision (e.g. one group of a HistogramSet).
+        Without the exact extremes, the bounds of the lowest and highest non-empty buckets are used.
+        """
+        indexes = np.asarray(indexes, dtype=np.int64)
+        if not len(indexes):
+            return
+        if min_value is None:
+            min_value = int(bucket_lowest_values(indexes.min(), self.sub_bucket_bits))
+        if max_value is None:
+            max_value = int(bucket_highest_values(indexes.max(), self.sub_bucket_bits))
+        self._grow(int(indexes.max()) + 1)
+        np.add.at(self.counts, indexes, counts)
+        self._add_extremes(int(np.sum(counts)), min_value, max_value, value_sum)
+
+    def add(self, other):
+        """Merges `other` into this histogram."""
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Histograms of different precisions cannot be merged.")
+        self._grow(len(other.counts))
+        self.counts[:len(other.counts)] += other.counts
+        self._add_extremes(other.total_count, other.min_value, other.max_value, other.value_sum)
+
+    @property
+    def mean(self):
+        return self.value_sum / self.total_count if self.total_count else 0.0
+
+    def percentiles(self, percentiles):
+        """Values at `percentiles` (nearest rank; the highest value of the bucket, capped at the maximum)."""
+        if not self.total_count:
+            return [0] * len(percentiles)
+        cumulative = np.cumsum(self.counts)
+        indexes = np.searchsorted(cumulative, _percentile_ranks([self.total_count], percentiles)[0])
+        values = bucket_highest_values(indexes, self.sub_bucket_bits)
+        return np.clip(values, self.min_value, self.max_value).tolist()
+
+    def value_at_percentile(self, percentile):
+        return self.percentiles([percentile])[0]
+
+    def to_bytes(self):
+        """Compact binary form: the non-empty buckets, delta-encoded and compressed."""
+        indexes = np.flatnonzero(self.counts)
+        deltas = np.diff(indexes, prepend=0).astype(np.uint32)
+        header = _SERIALIZATION_HEADER.pack(_SERIALIZATION_VERSION, self.significant_digits, self.total_count,
+                                            self.min_value, self.max_value, self.value_sum)
+        body = struct.pack('<I', len(indexes)) + deltas.tobytes() + self.counts[indexes].astype(np.uint64).tobytes()
+        return header + zlib.compress(body)
+
+    @classmethod
+    def from_bytes(cls, data):
+        version, digits, total_count, min_value, max_value, value_sum = _SERIALIZATION_HEADER.unpack_from(data)
+        if version != _SERIALIZATION_VERSION:
+            raise ValueError(f"Unsupported histogram format version {version}.")
+        histogram = cls(digits)
+        body = zlib.decompress(data[_SERIALIZATION_HEADER.size:])
+        size = struct.unpack_from('<I', body)[0]
+        indexes = np.cumsum(np.frombuffer(body, dtype=np.uint32, count=size, offset=4).astype(np.int64))
+        counts = np.frombuffer(body, dtype=np.uint64, count=size, offset=4 + 4 * size).astype(np.int64)
+        if size:
+            histogram._grow(int(indexes[-1]) + 1)
+            histogram.counts[indexes] = counts
+        histogram.total_count, histogram.min_value, histogram.max_value, histogram.value_sum = \
+            total_count, min_value, max_value, value_sum
+        return histogram
+
+
+class HistogramSet:
+    """
+    Sparse histograms for many groups at once, stored as sorted (group << 32 | bucket) keys with their counts,
+    so memory follows the number of non-empty buckets rather than groups x buckets.
+    """
+
+    def __init__(self, significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = _sub_bucket_bits(significant_digits)
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.int64)
+
+    def record(self, groups, values):
+        """Records `values[i]` in the histogram of `groups[i]`."""
+        keys = (np.asarray(groups, dtype=np.int64) << _GROUP_BITS) | bucket_indexes(values, self.sub_bucket_bits)
+        keys, counts = np.unique(keys, return_counts=True)
+        self._merge(keys, counts)
+
+    def add_bucket_counts(self, groups, buckets, counts):
+        """Adds `counts[i]` samples to bucket `buckets[i]` of the histogram of `groups[i]`."""
+        keys = (np.asarray(groups, dtype=np.int64) << _GROUP_BITS) | np.asarray(buckets, dtype=np.int64)
+        keys, inverse = np.unique(keys, return_inverse=True)
+        self._merge(keys, np.bincount(inverse, weights=counts, minlength=len(keys)).astype(np.int64))
+
+    def add(self, other, group_remap=None):
+        """Merges `other`; `group_remap[g]` is the group in this set of group `g` of `other` (same by default)."""
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Histograms of different precisions cannot be merged.")
+        keys = other.keys
+        if group_remap is not None and len(keys):
+            keys = (np.asarray(group_remap, dtype=np.int64)[keys >> _GROUP_BITS] << _GROUP_BITS) | \
+                   (keys & _BUCKET_MASK)
+            order = np.argsort(keys, kind='stable')
+            self._merge(keys[order], other.counts[order])
+        else:
+            self._merge(keys, other.counts)
+
+    def _merge(self, keys, counts):
+        if not len(self.keys):
+            self.keys, self.counts = keys, counts
+            return
+        merged_keys, inverse = np.unique(np.concatenate([self.keys, keys]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, counts]),
+                                  minlength=len(merged_keys)).astype(np.int64)
+        self.keys = merged_keys
+
+    @property
+    def groups(self):
+        return self.keys >> _GROUP_BITS
+
+    def group_totals(self, group_count):
+        return np.bincount(self.groups, weights=self.counts, minlength=group_count).astype(np.int64)
+
+    def percentiles(self, percentiles, group_count, maxima=None):
+        """
+        Array of shape (group_count, len(percentiles)) with the value at each percentile for every group
+        (0 for empty groups). `maxima` (the exact maximum of every group) caps the reported bucket values.
+        """
+        result = np.zeros((group_count, len(percentiles)), dtype=np.int64)
+        if not len(self.keys):
+            return result
+        groups = self.groups
+        cumulative = np.cumsum(self.counts)
+        totals = self.group_totals(group_count)
+        segment_starts = np.searchsorted(groups, np.arange(group_count))
+        base = np.where(segment_starts > 0, cumulative[np.maximum(segment_starts - 1, 0)], 0)
+        positions = np.searchsorted(cumulative, base[:, None] + _percentile_ranks(totals, percentiles))
+        positions = np.minimum(positions, len(self.keys) - 1)
+        values = bucket_highest_values(self.keys[positions] & _BUCKET_MASK, self.sub_bucket_bits)
+        if maxima is not None:
+            values = np.minimum(values, np.asarray(maxima, dtype=np.int64)[:, None])
+        return np.where(totals[:, None] > 0, values, 0)
+
+    def histogram(self, group, min_value=None, max_value=None, value_sum=0):
+        """The histogram of `group` as a LatencyHistogram (pass the exact extremes and sum when known)."""
+        low, high = np.searchsorted(self.keys, [group << _GROUP_BITS, (group + 1) << _GROUP_BITS])
+        histogram = LatencyHistogram(self.significant_digits)
+        histogram.add_bucket_counts(self.keys[low:high] & _BUCKET_MASK, self.counts[low:high],
+                                    min_value, max_value, value_sum)
+        return histogram
+
+    def total_histogram(self, min_value=None, max_value=None, value_sum=0):
+        """All the groups merged into a single LatencyHistogram."""
+        histogram = LatencyHistogram(self.significant_digits)
+        histogram.add_bucket_counts(self.keys & _BUCKET_MASK, self.counts, min_value, max_value, value_sum)
+        return histogram
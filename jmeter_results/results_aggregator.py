@@ -0,0 +1,212 @@
+# results_aggregator.py
+import base64
+import numpy as np
+
+from jmeter_results.jtl_reader import LabelDictionary
+from jmeter_results.latency_histogram import HistogramSet, DEFAULT_SIGNIFICANT_DIGITS
+
+# Per-label statistics of a run, updated chunk by chunk with vectorized group-bys over the label codes
+# (np.bincount for the sums, ufunc.at for the extremes). Percentiles come from one log-bucketed histogram per
+# label (see latency_histogram.py), so memory does not grow with the number of samples.
+# The state is a handful of arrays indexed by label code, so two aggregators (other files, other processes) are
+# merged by remapping the codes of one onto the other.
+
+DEFAULT_PERCENTILES = (50, 90, 95, 99)
+TOTAL_LABEL = 'TOTAL'
+
+
+class ResultsAggregator:
+    """
+    Aggregates JtlChunk objects into per-label count, errors, mean/min/max elapsed, latency, connect time,
+    bytes, throughput and percentiles. Call `consume` for every chunk, `merge` to add another aggregator and
+    `summary` for the final figures.
+    """
+
+    def __init__(self, label_dictionary=None, percentiles=DEFAULT_PERCENTILES,
+                 significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+        self.label_dictionary = label_dictionary if label_dictionary is not None else LabelDictionary()
+        self.percentiles = tuple(percentiles)
+        self.count = np.zeros(0, dtype=np.int64)
+        self.errors = np.zeros(0, dtype=np.int64)
+        self.elapsed_sum = np.zeros(0, dtype=np.int64)
+        self.elapsed_min = np.zeros(0, dtype=np.int64)
+        self.elapsed_max = np.zeros(0, dtype=np.int64)
+        self.latency_sum = np.zeros(0, dtype=np.int64)
+        self.connect_sum = np.zeros(0, dtype=np.int64)
+        self.bytes_sum = np.zeros(0, dtype=np.int64)
+        self.sent_bytes_sum = np.zeros(0, dtype=np.int64)
+        self.first_timestamp = np.zeros(0, dtype=np.int64)
+        self.last_end = np.zeros(0, dtype=np.int64)
+        self.histograms = HistogramSet(significant_digits)  # Elapsed times, one histogram per label code
+        # Merged distributed runs only: samples and errors per load generator (see jtl_merge.py).
+        self.node_names = None
+        self.node_count = np.zeros(0, dtype=np.int64)
+        self.node_errors = np.zeros(0, dtype=np.int64)
+        self.out_of_order_rows = 0
+
+    def _grow(self, size):
+        old_size = len(self.count)
+        if size <= old_size:
+            return
+        extra = size - old_size
+        for name in ('count', 'errors', 'elapsed_sum', 'latency_sum', 'connect_sum', 'bytes_sum', 'sent_bytes_sum',
+                     'elapsed_max', 'last_end'):
+            setattr(self, name, np.concatenate([getattr(self, name), np.zeros(extra, dtype=np.int64)]))
+        unset = np.iinfo(np.int64).max
+        self.elapsed_min = np.concatenate([self.elapsed_min, np.full(extra, unset, dtype=np.int64)])
+        self.first_timestamp = np.concatenate([self.first_timestamp, np.full(extra, unset, dtype=np.int64)])
+
+    def consume(self, chunk):
+        """Adds the samples of `chunk` (read with this aggregator's label dictionary)."""
+        if not chunk.size:
+            return
+        size = len(self.label_dictionary)
+        self._grow(size)
+        labels = chunk.labels
+        elapsed = chunk.elapsed.astype(np.int64)
+
+        def sum_by_label(values):
+            return np.bincount(labels, weights=values, minlength=size).astype(np.int64)
+
+        self.count += np.bincount(labels, minlength=size)
+        self.errors += np.bincount(labels, weights=~chunk.success, minlength=size).astype(np.int64)
+        self.elapsed_sum += sum_by_label(elapsed)
+        self.latency_sum += sum_by_label(chunk.latency)
+        self.connect_sum += sum_by_label(chunk.connect)
+        self.bytes_sum += sum_by_label(chunk.bytes)
+        self.sent_bytes_sum += sum_by_label(chunk.sent_bytes)
+        np.minimum.at(self.elapsed_min, labels, elapsed)
+        np.maximum.at(self.elapsed_max, labels, elapsed)
+        np.minimum.at(self.first_timestamp, labels, chunk.timestamps)
+        np.maximum.at(self.last_end, labels, chunk.timestamps + elapsed)
+        self.histograms.record(labels, elapsed)
+        if chunk.nodes is not None:
+            self._consume_nodes(chunk.nodes, chunk.success)
+
+    def _consume_nodes(self, nodes, success):
+        size = max(int(nodes.max()) + 1, len(self.node_count))
+        self.node_count = np.bincount(nodes, minlength=size) + \
+            np.pad(self.node_count, (0, size - len(self.node_count)))
+        self.node_errors = np.bincount(nodes, weights=~success, minlength=size).astype(np.int64) + \
+            np.pad(self.node_errors, (0, size - len(self.node_errors)))
+
+    def merge(self, other):
+        """Adds the state of `other` (an aggregator of other files or another process) to this one."""
+        other_labels = other.label_dictionary.labels[:len(other.count)]
+        remap = np.array([self.label_dictionary.add(label) for label in other_labels], dtype=np.int64)
+        self._grow(len(self.label_dictionary))
+        if not len(remap):
+            return
+        for name in ('count', 'errors', 'elapsed_sum', 'latency_sum', 'connect_sum', 'bytes_sum', 'sent_bytes_sum'):
+            getattr(self, name)[remap] += getattr(other, name)
+        self.elapsed_min[remap] = np.minimum(self.elapsed_min[remap], other.elapsed_min)
+        self.elapsed_max[remap] = np.maximum(self.elapsed_max[remap], other.elapsed_max)
+        self.first_timestamp[remap] = np.minimum(self.first_timestamp[remap], other.first_timestamp)
+        self.last_end[remap] = np.maximum(self.last_end[remap], other.last_end)
+        self.histograms.add(other.histograms, remap)
+
+        self.out_of_order_rows += other.out_of_order_rows
+        if other.node_names:
+            self.node_names = self.node_names or list(other.node_names)
+            node_remap = []
+            for name in other.node_names:
+                if name not in self.node_names:
+                    self.node_names.append(name)
+                node_remap.append(self.node_names.index(name))
+            node_remap = np.array(node_remap[:len(other.node_count)], dtype=np.int64)
+            size = max(len(self.node_names), len(self.node_count))
+            self.node_count = np.pad(self.node_count, (0, size - len(self.node_count)))
+            self.node_errors = np.pad(self.node_errors, (0, size - len(self.node_errors)))
+            self.node_count[node_remap] += other.node_count
+            self.node_errors[node_remap] += other.node_errors
+
+    def label_percentiles(self):
+        """Array of shape (labels, percentiles) with the elapsed time percentiles of every label (nearest rank)."""
+        return self.histograms.percentiles(self.percentiles, len(self.count), self.elapsed_max)
+
+    def label_histogram(self, code):
+        """The elapsed time histogram of the label `code` as a LatencyHistogram."""
+        return self.histograms.histogram(code, int(self.elapsed_min[code]), int(self.elapsed_max[code]),
+                                         int(self.elapsed_sum[code]))
+
+    def total_histogram(self):
+        """The elapsed time histogram of all the samples together."""
+        used = self.count > 0
+        if not used.any():
+            return self.histograms.total_histogram()
+        return self.histograms.total_histogram(int(self.elapsed_min[used].min()), int(self.elapsed_max[used].max()),
+                                               int(self.elapsed_sum.sum()))
+
+    def summary(self, include_histograms=False):
+        """
+        Returns {'labels': [row, ...], 'total': row, 'percentiles': [...], 'start_timestamp', 'end_timestamp'}
+        where a row is a dict of the label's statistics (times in ms, throughput in samples/s, KB/s).
+        Labels are listed in the order they first appear in the results. With `include_histograms`, every row
+        also has its serialized histogram (base64 of LatencyHistogram.to_bytes) under 'histogram'.
+        Merged distributed runs also get 'nodes' (samples and errors per load generator) and 'out_of_order_rows'.
+        """
+        label_percentiles = self.label_percentiles()
+        rows = []
+        for code in np.flatnonzero(self.count).tolist():
+            rows.append(_statistics_row(
+                self.label_dictionary[code], int(self.count[code]), int(self.errors[code]),
+                int(self.elapsed_sum[code]), int(self.elapsed_min[code]), int(self.elapsed_max[code]),
+                int(self.latency_sum[code]), int(self.connect_sum[code]), int(self.bytes_sum[code]),
+                int(self.sent_bytes_sum[code]), int(self.first_timestamp[code]), int(self.last_end[code]),
+                dict(zip(self.percentiles, label_percentiles[code].tolist()))))
+
+        used = self.count > 0
+        total = _statistics_row(
+            TOTAL_LABEL, int(self.count.sum()), int(self.errors.sum()), int(self.elapsed_sum.sum()),
+            int(self.elapsed_min[used].min()) if used.any() else 0,
+            int(self.elapsed_max[used].max()) if used.any() else 0,
+            int(self.latency_sum.sum()), int(self.connect_sum.sum()), int(self.bytes_sum.sum()),
+            int(self.sent_bytes_sum.sum()),
+            int(self.first_timestamp[used].min()) if used.any() else 0,
+            int(self.last_end[used].max()) if used.any() else 0,
+            dict(zip(self.percentiles, self.total_histogram().percentiles(self.percentiles))))
+        if include_histograms:
+            for row in rows:
+                code = self.label_dictionary.get(row['label'])
+                row['histogram'] = base64.b64encode(self.label_histogram(code).to_bytes()).decode('ascii')
+            total['histogram'] = base64.b64encode(self.total_histogram().to_bytes()).decode('ascii')
+        summary = {
+            'labels': rows,
+            'total': total,
+            'percentiles': list(self.percentiles),
+            'start_timestamp': total['first_timestamp'],
+            'end_timestamp': total['last_end'],
+        }
+        if self.node_names:
+            missing = len(self.node_names) - len(self.node_count)  # Load generators without any sample
+            node_count = np.pad(self.node_count, (0, max(missing, 0)))
+            node_errors = np.pad(self.node_errors, (0, max(missing, 0)))
+            summary['nodes'] = [
+                {'node': name, 'samples': int(count), 'errors': int(errors),
+                 'error_rate': errors / count * 100 if count else 0.0}
+                for name, count, errors in zip(self.node_names, node_count.tolist(), node_errors.tolist())]
+            summary['out_of_order_rows'] = self.out_of_order_rows
+        return summary
+
+
+def _statistics_row(label, count, errors, elapsed_sum, elapsed_min, elapsed_max, latency_sum, connect_sum,
+                    bytes_sum, sent_bytes_sum, first_timestamp, last_end, percentiles):
+    duration_seconds = max(last_end - first_timestamp, 1) / 1000.0
+    return {
+        'label': label,
+        'samples': count,
+        'errors': errors,
+        'error_rate': errors / count * 100 if count else 0.0,
+        'mean': elapsed_sum / count if count else 0.0,
+        'min': elapsed_min,
+        'max': elapsed_max,
+        'percentiles': percentiles,
+        'mean_latency': latency_sum / count if count else 0.0,
+        'mean_connect': connect_sum / count if count else 0.0,
+        'throughput': count / duration_seconds,
+        'received_kb_per_second': bytes_sum / 1024.0 / duration_seconds,
+        'sent_kb_per_second': sent_bytes_sum / 1024.0 / duration_seconds,
+        'first_timestamp': first_timestamp,
+        'last_end': last_end,
+    }
+
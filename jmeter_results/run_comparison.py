@@ -0,0 +1,205 @@
+# run_comparison.py
+import math
+import numpy as np
+
+from jmeter_results.jtl_reader import JtlReader, LabelDictionary, DEFAULT_CHUNK_BYTES
+from jmeter_results.columnar_cache import load_jtl_columns
+from jmeter_results.latency_histogram import bucket_indexes, bucket_highest_values, DEFAULT_SIGNIFICANT_DIGITS, \
+    HistogramSet
+
+# Regression detection between a baseline run and a current run, label by label. Both runs are read with one
+# shared label dictionary, so labels are aligned by their codes. For every label present in both runs:
+#   - a Mann-Whitney U test on the elapsed times (ranks computed once over the distinct values, with the tie
+#     correction; the normal approximation is accurate for the sample sizes of a load test);
+#   - the delta of a percentile with a bootstrap confidence interval. Resampling n values B times is replaced by
+#     drawing the B resampled histograms directly (np.random.multinomial over the latency histogram buckets), so
+#     the cost follows the number of buckets, not the number of samples;
+#   - a two-proportion z-test on the error rates.
+# A label regresses when the test is significant, the whole confidence interval is above zero and the change is
+# large enough to matter (with enough samples, a 1 ms change is significant too). Improvements are the mirror.
+
+DEFAULT_COMPARISON_PERCENTILE = 95
+DEFAULT_ALPHA = 0.01
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_MIN_CHANGE_PERCENT = 5.0
+DEFAULT_BOOTSTRAP_RESAMPLES = 1000
+DEFAULT_BOOTSTRAP_SEED = 0
+MIN_SAMPLES_FOR_TEST = 20
+
+STATUS_REGRESSION = 'REGRESSION'
+STATUS_IMPROVEMENT = 'IMPROVEMENT'
+STATUS_NO_CHANGE = 'NO CHANGE'
+STATUS_INSUFFICIENT_DATA = 'INSUFFICIENT DATA'
+STATUS_ADDED = 'ADDED'
+STATUS_REMOVED = 'REMOVED'
+
+
+class RunSamples:
+    """The label codes, elapsed times and success flags of every sample of a run (one or more JTL files)."""
+
+    def __init__(self, file_paths, label_dictionary, use_cache=False, cache_dir=None,
+                 chunk_bytes=DEFAULT_CHUNK_BYTES):
+        self.file_paths = list(file_paths)
+        labels, elapsed, success = [], [], []
+        for file_path in self.file_paths:
+            if use_cache:
+                chunks = load_jtl_columns(file_path, cache_dir, chunk_bytes).iter_chunks(label_dictionary)
+            else:
+                chunks = JtlReader(file_path, label_dictionary, chunk_bytes)
+            for chunk in chunks:
+                labels.append(np.asarray(chunk.labels))
+                elapsed.append(np.asarray(chunk.elapsed))
+                success.append(np.asarray(chunk.success))
+        self.labels = np.concatenate(labels) if labels else np.zeros(0, dtype=np.int32)
+        self.elapsed = np.concatenate(elapsed).astype(np.int64) if elapsed else np.zeros(0, dtype=np.int64)
+        self.success = np.concatenate(success) if success else np.zeros(0, dtype=bool)
+        # Samples grouped by label: the rows of label `code` are order[starts[code]:starts[code + 1]].
+        self.order = np.argsort(self.labels, kind='stable')
+        self.starts = np.searchsorted(self.labels[self.order], np.arange(len(label_dictionary) + 1))
+
+    def label_rows(self, code):
+        if code + 1 >= len(self.starts):
+            return self.order[:0]
+        return self.order[self.starts[code]:self.starts[code + 1]]
+
+
+def mann_whitney_u(baseline, current):
+    """
+    Mann-Whitney U test of two samples. Returns (U of `current`, two-sided p-value, probability that a current
+    value is higher than a baseline value, ties counting half).
+    """
+    n1, n2 = len(current), len(baseline)
+    _, inverse, counts = np.unique(np.concatenate([current, baseline]), return_inverse=True, return_counts=True)
+    average_ranks = np.cumsum(counts) - (counts - 1) / 2.0
+    rank_sum = float(average_ranks[inverse[:n1]].sum())
+    u = rank_sum - n1 * (n1 + 1) / 2.0
+    n = n1 + n2
+    tie_term = float(np.sum(counts.astype(np.float64) ** 3 - counts)) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12.0 * ((n + 1) - tie_term))
+    mean_u = n1 * n2 / 2.0
+    if sigma == 0:
+        return u, 1.0, 0.5
+    z = (abs(u - mean_u) - 0.5) / sigma  # With continuity correction
+    return u, min(math.erfc(max(z, 0.0) / math.sqrt(2)), 1.0), u / (n1 * n2)
+
+
+def two_proportion_p_value(errors_1, count_1, errors_2, count_2):
+    """Two-sided p-value of a difference between two error rates (pooled z-test)."""
+    pooled = (errors_1 + errors_2) / (count_1 + count_2)
+    sigma = math.sqrt(pooled * (1 - pooled) * (1.0 / count_1 + 1.0 / count_2))
+    if sigma == 0:
+        return 1.0
+    return math.erfc(abs(errors_2 / count_2 - errors_1 / count_1) / sigma / math.sqrt(2))
+
+
+def _nearest_rank(count, percentile):
+    return max(int(math.ceil(count * percentile / 100.0)), 1)
+
+
+def bootstrap_percentiles(values, percentile, resamples, rng, sub_bucket_bits):
+    """
+    The `percentile` of `values` and of `resamples` bootstrap resamples of them, drawn as multinomial histograms
+    over the latency buckets. Returns (value, array of resampled values).
+    """
+    buckets, counts = np.unique(bucket_indexes(values, sub_bucket_bits), return_counts=True)
+    bucket_values = np.minimum(bucket_highest_values(buckets, sub_bucket_bits), int(values.max()))
+    rank = _nearest_rank(len(values), percentile)
+    value = int(bucket_values[np.searchsorted(np.cumsum(counts), rank)])
+    resampled = rng.multinomial(len(values), counts / len(values), size=resamples)
+    positions = (np.cumsum(resampled, axis=1) >= rank).argmax(axis=1)
+    return value, bucket_values[positions]
+
+
+def _run_figures(samples, rows, percentile, sub_bucket_bits):
+    elapsed = samples.elapsed[rows]
+    count = len(rows)
+    errors = int(count - np.count_nonzero(samples.success[rows]))
+    figures = {'samples': count, 'errors': errors, 'error_rate': errors / count * 100 if count else 0.0,
+               'mean': float(elapsed.mean()) if count else 0.0, 'percentile': 0}
+    if count:
+        buckets, counts = np.unique(bucket_indexes(elapsed, sub_bucket_bits), return_counts=True)
+        position = np.searchsorted(np.cumsum(counts), _nearest_rank(count, percentile))
+        figures['percentile'] = int(min(bucket_highest_values(buckets[position], sub_bucket_bits), elapsed.max()))
+    return figures
+
+
+def compare_runs(baseline_paths, current_paths, percentile=DEFAULT_COMPARISON_PERCENTILE, alpha=DEFAULT_ALPHA,
+                 confidence=DEFAULT_CONFIDENCE, min_change_percent=DEFAULT_MIN_CHANGE_PERCENT,
+                 resamples=DEFAULT_BOOTSTRAP_RESAMPLES, seed=DEFAULT_BOOTSTRAP_SEED, use_cache=False, cache_dir=None,
+                 significant_digits=DEFAULT_SIGNIFICANT_DIGITS):
+    """
+    Compares the current run with the baseline run, label by label. Returns {'transactions': [...], 'regressions',
+    'improvements', 'settings'}; every transaction has its label, status, the 'baseline' and 'current' figures
+    (samples, errors, error_rate, mean, percentile) and, when both runs have it, the percentile 'delta',
+    'delta_percent', the confidence interval 'ci_low'/'ci_high', 'p_value', 'probability_slower',
+    'error_rate_p_value' and the 'reasons' of a regression or improvement.
+    """
+    label_dictionary = LabelDictionary()
+    baseline = RunSamples(baseline_paths, label_dictionary, use_cache, cache_dir)
+    current = RunSamples(current_paths, label_dictionary, use_cache, cache_dir)
+    sub_bucket_bits = HistogramSet(significant_digits).sub_bucket_bits
+    rng = np.random.default_rng(seed)
+    tail = (1 - confidence) / 2 * 100
+
+    transactions = []
+    for code, label in enumerate(label_dictionary.labels):
+        baseline_rows, current_rows = baseline.label_rows(code), current.label_rows(code)
+        transaction = {
+            'label': label,
+            'baseline': _run_figures(baseline, baseline_rows, percentile, sub_bucket_bits),
+            'current': _run_figures(current, current_rows, percentile, sub_bucket_bits),
+        }
+        transactions.append(transaction)
+        if not len(baseline_rows) or not len(current_rows):
+            transaction['status'] = STATUS_ADDED if len(current_rows) else STATUS_REMOVED
+            continue
+
+        baseline_elapsed, current_elapsed = baseline.elapsed[baseline_rows], current.elapsed[current_rows]
+        delta = transaction['current']['percentile'] - transaction['baseline']['percentile']
+        transaction['delta'] = delta
+        transaction['delta_percent'] = delta / transaction['baseline']['percentile'] * 100 \
+            if transaction['baseline']['percentile'] else 0.0
+        if min(len(baseline_rows), len(current_rows)) < MIN_SAMPLES_FOR_TEST:
+            transaction['status'] = STATUS_INSUFFICIENT_DATA
+            continue
+
+        _, baseline_resampled = bootstrap_percentiles(baseline_elapsed, percentile, resamples, rng, sub_bucket_bits)
+        _, current_resampled = bootstrap_percentiles(current_elapsed, percentile, resamples, rng, sub_bucket_bits)
+        ci_low, ci_high = np.percentile(current_resampled - baseline_resampled, [tail, 100 - tail]).tolist()
+        _, p_value, probability_slower = mann_whitney_u(baseline_elapsed, current_elapsed)
+        transaction.update({
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+            'p_value': p_value,
+            'probability_slower': probability_slower,
+            'error_rate_p_value': two_proportion_p_value(
+                transaction['baseline']['errors'], transaction['baseline']['samples'],
+                transaction['current']['errors'], transaction['current']['samples']),
+        })
+        large_enough = abs(transaction['delta_percent']) >= min_change_percent
+        slower = p_value < alpha and large_enough and ci_low > 0 and probability_slower > 0.5
+        faster = p_value < alpha and large_enough and ci_high < 0 and probability_slower < 0.5
+        more_errors = transaction['error_rate_p_value'] < alpha and \
+            transaction['current']['error_rate'] > transaction['baseline']['error_rate']
+        transaction['reasons'] = []
+        if slower or faster:
+            transaction['reasons'].append(f"p{percentile:g} {delta:+d} ms ({transaction['delta_percent']:+.1f}%)")
+        if more_errors:
+            transaction['reasons'].append(f"error rate {transaction['baseline']['error_rate']:.2f}% -> "
+                                          f"{transaction['current']['error_rate']:.2f}%")
+        if slower or more_errors:
+            transaction['status'] = STATUS_REGRESSION
+        elif faster:
+            transaction['status'] = STATUS_IMPROVEMENT
+        else:
+            transaction['status'] = STATUS_NO_CHANGE
+
+    return {
+        'transactions': transactions,
+        'regressions': sum(1 for t in transactions if t['status'] == STATUS_REGRESSION),
+        'improvements': sum(1 for t in transactions if t['status'] == STATUS_IMPROVEMENT),
+        'settings': {'percentile': percentile, 'alpha': alpha, 'confidence': confidence,
+                     'min_change_percent': min_change_percent, 'resamples': resamples},
+        'baseline_files': baseline.file_paths,
+        'current_files': current.file_paths,
+    }
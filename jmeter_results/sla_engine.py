@@ -0,0 +1,178 @@
+# sla_engine.py
+import re
+import json
+import numpy as np
+
+# SLA gating of a run, per transaction. Transaction Controllers follow the 'TXN_NN_Description' convention enforced
+# by Val_Backend_TXN_Naming_Convention, so targets can be given for a full transaction name or for a step number
+# (NN), which keeps working when the description of a step is reworded. Targets are read from a JSON file:
+#
+#   {
+#     "defaults": {"p95": 2000, "error_rate": 1.0},
+#     "transactions": {
+#       "TXN_01_Login": {"p90": 1500, "p95": 1800},
+#       "02": {"p95": 3000, "throughput": 5}
+#     },
+#     "apply_defaults_to_all_labels": false
+#   }
+#
+# Metrics: 'pNN' (percentile, maximum ms), 'mean' (maximum ms), 'error_rate' (maximum %) and 'throughput'
+# (minimum samples/s). A label gets the defaults (TXN labels only, unless apply_defaults_to_all_labels), then its
+# step targets, then its name targets. Everything is evaluated from the aggregated state (the per-label
+# histograms and counters), so no second pass over the results is needed.
+# A transaction with targets that never ran fails the gate.
+
+TXN_NAME_PATTERN = re.compile(r"^TXN_(\d{2})_.*")
+STEP_KEY_PATTERN = re.compile(r"^\d{1,2}$")
+PERCENTILE_METRIC_PATTERN = re.compile(r"^p(\d{1,2}(?:\.\d+)?)$")
+
+METRIC_MEAN = 'mean'
+METRIC_ERROR_RATE = 'error_rate'
+METRIC_THROUGHPUT = 'throughput'
+MINIMUM_METRICS = (METRIC_THROUGHPUT,)  # The other metrics are maxima
+
+SLA_STATUS_PASS = 'PASS'
+SLA_STATUS_FAIL = 'FAIL'
+SLA_STATUS_NO_DATA = 'NO DATA'
+
+
+def get_step_number(label):
+    """The NN of a 'TXN_NN_Description' label, or None."""
+    match = TXN_NAME_PATTERN.match(label)
+    return int(match.group(1)) if match else None
+
+
+def _validate_targets(targets, where):
+    if not isinstance(targets, dict):
+        raise ValueError(f"SLA targets of {where} must be an object of metric: value.")
+    for metric, value in targets.items():
+        if metric not in (METRIC_MEAN, METRIC_ERROR_RATE, METRIC_THROUGHPUT) and \
+                not PERCENTILE_METRIC_PATTERN.match(metric):
+            raise ValueError(f"Unknown SLA metric '{metric}' in {where}. "
+                             f"Use pNN, mean, error_rate or throughput.")
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"SLA target '{metric}' of {where} must be a number.")
+    return dict(targets)
+
+
+class SlaTargets:
+    def __init__(self, defaults=None, transactions=None, apply_defaults_to_all_labels=False):
+        self.defaults = _validate_targets(defaults or {}, "the defaults")
+        self.by_name = {}
+        self.by_step = {}
+        self.apply_defaults_to_all_labels = apply_defaults_to_all_labels
+        for key, targets in (transactions or {}).items():
+            key = str(key)
+            if STEP_KEY_PATTERN.match(key):
+                self.by_step[int(key)] = _validate_targets(targets, f"step {key}")
+            else:
+                self.by_name[key] = _validate_targets(targets, f"'{key}'")
+
+    def resolve(self, label):
+        """The targets applying to `label` (empty when it is not gated)."""
+        step = get_step_number(label)
+        targets = {}
+        if step is not None or self.apply_defaults_to_all_labels:
+            targets.update(self.defaults)
+        if step is not None:
+            targets.update(self.by_step.get(step, {}))
+        targets.update(self.by_name.get(label, {}))
+        return targets
+
+    def percentiles(self):
+        """Every percentile used by a target."""
+        metrics = set(self.defaults)
+        for targets in list(self.by_name.values()) + list(self.by_step.values()):
+            metrics.update(targets)
+        return sorted(float(match.group(1)) for match in map(PERCENTILE_METRIC_PATTERN.match, metrics) if match)
+
+
+def load_sla_targets(path):
+    """Reads an SLA file (see the format above). Raises ValueError when it is invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except ValueError as e:
+        raise ValueError(f"{path} is not valid JSON: {e}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a JSON object.")
+    return SlaTargets(data.get('defaults'), data.get('transactions'), bool(data.get('apply_defaults_to_all_labels')))
+
+
+def _percentile_key(percentile):
+    return int(percentile) if float(percentile).is_integer() else percentile
+
+
+def evaluate_sla(aggregator, sla_targets):
+    """
+    Checks every gated label of `aggregator` (a ResultsAggregator) against `sla_targets`.
+    Returns {'passed', 'checks_total', 'checks_failed', 'transactions': [...]}; each transaction has its label,
+    step, status and checks ({'metric', 'target', 'actual', 'comparison', 'passed'}).
+    """
+    percentiles = sla_targets.percentiles()
+    size = len(aggregator.count)
+    label_percentiles = aggregator.histograms.percentiles(percentiles, size, aggregator.elapsed_max) \
+        if percentiles else np.zeros((size, 0), dtype=np.int64)
+    percentile_columns = {_percentile_key(p): column for column, p in enumerate(percentiles)}
+
+    transactions = []
+    seen_names = set()
+    seen_steps = set()
+    for code in np.flatnonzero(aggregator.count).tolist():
+        label = aggregator.label_dictionary[code]
+        step = get_step_number(label)
+        seen_names.add(label)
+        seen_steps.add(step)
+        targets = sla_targets.resolve(label)
+        if not targets:
+            continue
+
+        count = int(aggregator.count[code])
+        duration_seconds = max(int(aggregator.last_end[code]) - int(aggregator.first_timestamp[code]), 1) / 1000.0
+        actual_values = {
+            METRIC_MEAN: aggregator.elapsed_sum[code] / count,
+            METRIC_ERROR_RATE: aggregator.errors[code] / count * 100,
+            METRIC_THROUGHPUT: count / duration_seconds,
+        }
+        checks = []
+        for metric, target in targets.items():
+            match = PERCENTILE_METRIC_PATTERN.match(metric)
+            if match:
+                actual = int(label_percentiles[code, percentile_columns[_percentile_key(float(match.group(1)))]])
+            else:
+                actual = float(actual_values[metric])
+            minimum = metric in MINIMUM_METRICS
+            checks.append({
+                'metric': metric,
+                'target': target,
+                'actual': actual,
+                'comparison': '>=' if minimum else '<=',
+                'passed': actual >= target if minimum else actual <= target
+            })
+        transactions.append({
+            'label': label,
+            'step': step,
+            'samples': count,
+            'status': SLA_STATUS_PASS if all(check['passed'] for check in checks) else SLA_STATUS_FAIL,
+            'checks': checks
+        })
+
+    # Targets of transactions that never ran.
+    for name, targets in sla_targets.by_name.items():
+        if name not in seen_names:
+            transactions.append({'label': name, 'step': get_step_number(name), 'samples': 0,
+                                 'status': SLA_STATUS_NO_DATA, 'checks': []})
+    for step in sorted(sla_targets.by_step):
+        if step not in seen_steps:
+            transactions.append({'label': f"TXN_{step:02d}_*", 'step': step, 'samples': 0,
+                                 'status': SLA_STATUS_NO_DATA, 'checks': []})
+
+    transactions.sort(key=lambda t: (t['step'] is None, t['step'] or 0, t['label']))
+    checks_total = sum(len(t['checks']) for t in transactions)
+    checks_failed = sum(1 for t in transactions for check in t['checks'] if not check['passed'])
+    return {
+        'passed': all(t['status'] == SLA_STATUS_PASS for t in transactions),
+        'checks_total': checks_total,
+        'checks_failed': checks_failed,
+        'transactions': transactions
+    }
@@ -0,0 +1,347 @@
+# time_series.py
+import os
+import numpy as np
+
+from jmeter_results.latency_histogram import HistogramSet, bucket_indexes
+from jmeter_results.results_aggregator import TOTAL_LABEL
+from jmeter_results.columnar_cache import open_columnar_cache, open_merged_cache
+
+# Per-interval series of a run (throughput, error rate, mean/max/percentile elapsed time and active threads) for
+# the whole run, every label and every thread group. Every chunk is reduced to cells (series code, second) with
+# np.unique and np.bincount over packed int64 keys, and the elapsed times go into per-cell histogram buckets, so
+# memory follows the number of non-empty cells rather than the number of samples. When the run is complete,
+# the cells are rolled up into every resolution at once (1 s, 10 s, 1 min, 5 min, 1 h by default); percentiles
+# of a coarse interval come from the merged histograms of its seconds, not from averaged percentiles.
+# The rollups of a cached run (columnar_cache.py) are saved in its cache folder, so the charts of a long soak
+# test are drawn again without going through the samples.
+# Active threads are the highest allThreads value seen in the interval (grpThreads for thread group series).
+
+DEFAULT_RESOLUTIONS = (1, 10, 60, 300, 3600)  # Seconds
+DEFAULT_TIME_SERIES_PERCENTILES = (95,)
+TIME_SERIES_SIGNIFICANT_DIGITS = 2
+DEFAULT_MAX_POINTS = 1500
+
+SERIES_TOTAL = 'total'
+SERIES_LABEL = 'label'
+SERIES_THREAD_GROUP = 'thread_group'
+SERIES_KINDS = (SERIES_TOTAL, SERIES_LABEL, SERIES_THREAD_GROUP)
+
+TIME_SERIES_FILE_NAME = 'time_series.npz'
+TIME_SERIES_FORMAT_VERSION = 1
+
+CELL_METRICS = ('count', 'errors', 'elapsed_sum', 'elapsed_max', 'threads')
+_MAXIMUM_METRICS = ('elapsed_max', 'threads')
+_COMPACTION_CELLS = 4 * 1024 * 1024  # Pending cells of a series kind before they are reduced
+_OFFSET_BIAS = 1 << 31  # Keeps the time offsets of the packed keys positive
+_OFFSET_MASK = (1 << 32) - 1
+
+
+def _pack(codes, offsets):
+    return (np.asarray(codes, dtype=np.int64) << 32) | offsets
+
+
+def _reduce_cells(parts):
+    """Sums (maxima for _MAXIMUM_METRICS) the cell metrics of `parts` by cell key."""
+    if len(parts) == 1:
+        return parts[0]
+    cells, inverse = np.unique(np.concatenate([part['cells'] for part in parts]), return_inverse=True)
+    reduced = {'cells': cells}
+    for metric in CELL_METRICS:
+        values = np.concatenate([part[metric] for part in parts])
+        if metric in _MAXIMUM_METRICS:
+            reduced[metric] = np.zeros(len(cells), dtype=np.int64)
+            np.maximum.at(reduced[metric], inverse, values)
+        else:
+            reduced[metric] = np.bincount(inverse, weights=values, minlength=len(cells)).astype(np.int64)
+    return reduced
+
+
+def _reduce_buckets(parts):
+    """Sums the histogram bucket counts of `parts` by (cell key, bucket)."""
+    if len(parts) == 1:
+        return parts[0]
+    cells = np.concatenate([part['cells'] for part in parts])
+    buckets = np.concatenate([part['buckets'] for part in parts])
+    counts = np.concatenate([part['counts'] for part in parts])
+    unique_cells, cell_inverse = np.unique(cells, return_inverse=True)
+    keys, inverse = np.unique((cell_inverse.astype(np.int64) << 32) | buckets, return_inverse=True)
+    return {'cells': unique_cells[keys >> 32], 'buckets': keys & _OFFSET_MASK,
+            'counts': np.bincount(inverse, weights=counts, minlength=len(keys)).astype(np.int64)}
+
+
+class TimeSeriesAggregator:
+    """
+    Chunk consumer building the time series of a run. Pass it to analyze_jtl_files (it must share the label
+    dictionary of the run) and call `rollups` once every chunk is consumed.
+    """
+
+    def __init__(self, label_dictionary, percentiles=DEFAULT_TIME_SERIES_PERCENTILES,
+                 resolutions=DEFAULT_RESOLUTIONS, significant_digits=TIME_SERIES_SIGNIFICANT_DIGITS):
+        self.label_dictionary = label_dictionary
+        self.percentiles = tuple(percentiles)
+        self.resolutions = tuple(sorted(set(resolutions)))
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = HistogramSet(significant_digits).sub_bucket_bits
+        self.origin = None  # Epoch second the packed time offsets are relative to
+        self._cells = {kind: [] for kind in SERIES_KINDS}
+        self._buckets = {kind: [] for kind in SERIES_KINDS}
+
+    def consume(self, chunk):
+        if not chunk.size:
+            return
+        seconds = chunk.timestamps // 1000
+        if self.origin is None:
+            self.origin = int(seconds.min())
+        offsets = seconds - self.origin + _OFFSET_BIAS
+        elapsed = chunk.elapsed.astype(np.int64)
+        buckets = bucket_indexes(elapsed, self.sub_bucket_bits)
+        thread_groups = chunk.thread_groups if chunk.thread_groups is not None else np.zeros(chunk.size, np.int32)
+        for kind, codes, threads in ((SERIES_TOTAL, np.zeros(chunk.size, dtype=np.int32), chunk.all_threads),
+                                     (SERIES_LABEL, chunk.labels, chunk.all_threads),
+                                     (SERIES_THREAD_GROUP, thread_groups, chunk.group_threads)):
+            self._add(kind, _pack(codes, offsets), chunk.success, elapsed, buckets, threads)
+
+    def _add(self, kind, keys, success, elapsed, buckets, threads):
+        cells, inverse = np.unique(keys, return_inverse=True)
+        size = len(cells)
+        elapsed_max = np.zeros(size, dtype=np.int64)
+        np.maximum.at(elapsed_max, inverse, elapsed)
+        max_threads = np.zeros(size, dtype=np.int64)
+        np.maximum.at(max_threads, inverse, threads)
+        self._cells[kind].append({
+            'cells': cells,
+            'count': np.bincount(inverse, minlength=size),
+            'errors': np.bincount(inverse, weights=~success, minlength=size).astype(np.int64),
+            'elapsed_sum': np.bincount(inverse, weights=elapsed, minlength=size).astype(np.int64),
+            'elapsed_max': elapsed_max,
+            'threads': max_threads,
+        })
+        bucket_keys, counts = np.unique((inverse.astype(np.int64) << 32) | buckets, return_counts=True)
+        self._buckets[kind].append({'cells': cells[bucket_keys >> 32], 'buckets': bucket_keys & _OFFSET_MASK,
+                                    'counts': counts})
+        if sum(len(part['cells']) for part in self._buckets[kind]) > _COMPACTION_CELLS:
+            self._cells[kind] = [_reduce_cells(self._cells[kind])]
+            self._buckets[kind] = [_reduce_buckets(self._buckets[kind])]
+
+    def merge(self, other):
+        """Adds the cells of `other` (another shard or process, same settings) to this one."""
+        if other.origin is None:
+            return
+        if self.origin is None:
+            self.origin = other.origin
+        remaps = {
+            SERIES_TOTAL: np.zeros(1, dtype=np.int64),
+            SERIES_LABEL: np.array([self.label_dictionary.add(label) for label in other.label_dictionary.labels],
+                                   dtype=np.int64),
+            SERIES_THREAD_GROUP: np.array([self.label_dictionary.thread_groups.add(group)
+                                           for group in other.label_dictionary.thread_groups.labels],
+                                          dtype=np.int64),
+        }
+
+        def repack(cells):
+            offsets = (cells & _OFFSET_MASK) + (other.origin - self.origin)
+            return _pack(remaps[kind][cells >> 32], offsets)
+
+        for kind in SERIES_KINDS:
+            for part in other._cells[kind]:
+                self._cells[kind].append(dict(part, cells=repack(part['cells'])))
+            for part in other._buckets[kind]:
+                self._buckets[kind].append(dict(part, cells=repack(part['cells'])))
+
+    def rollups(self):
+        """The TimeSeriesRollups of everything consumed so far."""
+        names = {
+            SERIES_TOTAL: [TOTAL_LABEL],
+            SERIES_LABEL: list(self.label_dictionary.labels),
+            SERIES_THREAD_GROUP: list(self.label_dictionary.thread_groups.labels),
+        }
+        rollups = TimeSeriesRollups(self.percentiles, self.resolutions, self.significant_digits, names)
+        if self.origin is None:
+            return rollups
+        for kind in SERIES_KINDS:
+            cells = _reduce_cells(self._cells[kind])
+            buckets = _reduce_buckets(self._buckets[kind])
+            codes = cells['cells'] >> 32
+            seconds = (cells['cells'] & _OFFSET_MASK) - _OFFSET_BIAS + self.origin
+            bucket_cells = np.searchsorted(cells['cells'], buckets['cells'])
+            for resolution in self.resolutions:
+                first_interval = self.origin // resolution
+                keys, inverse = np.unique(_pack(codes, seconds // resolution - first_interval + _OFFSET_BIAS),
+                                          return_inverse=True)
+                size = len(keys)
+                series = {'codes': (keys >> 32).astype(np.int32),
+                          'times': ((keys & _OFFSET_MASK) - _OFFSET_BIAS + first_interval) * resolution * 1000}
+                for metric in CELL_METRICS:
+                    if metric in _MAXIMUM_METRICS:
+                        series[metric] = np.zeros(size, dtype=np.int64)
+                        np.maximum.at(series[metric], inverse, cells[metric])
+                    else:
+                        series[metric] = np.bincount(inverse, weights=cells[metric], minlength=size).astype(np.int64)
+                histograms = HistogramSet(self.significant_digits)
+                histograms.add_bucket_counts(inverse[bucket_cells], buckets['buckets'], buckets['counts'])
+                series['percentiles'] = histograms.percentiles(self.percentiles, size, series['elapsed_max'])
+                rollups.cells[(kind, resolution)] = series
+        return rollups
+
+
+class TimeSeriesRollups:
+    """
+    The series of a run at every resolution. `cells[(kind, resolution)]` holds, sorted by series code then
+    time, one entry per non-empty interval: 'codes' (index in `names[kind]`), 'times' (interval start, epoch ms),
+    the CELL_METRICS and 'percentiles' (intervals x `percentiles`).
+    """
+
+    def __init__(self, percentiles, resolutions, significant_digits, names):
+        self.percentiles = tuple(percentiles)
+        self.resolutions = tuple(resolutions)
+        self.significant_digits = significant_digits
+        self.names = names
+        self.cells = {}
+
+    def matches(self, percentiles, resolutions, significant_digits):
+        """Whether these rollups were computed with the given settings."""
+        return self.percentiles == tuple(percentiles) and self.resolutions == tuple(sorted(set(resolutions))) and \
+            self.significant_digits == significant_digits
+
+    def time_range(self):
+        """(first interval start, last interval start) in epoch ms at the finest resolution, or None when empty."""
+        cells = self.cells.get((SERIES_TOTAL, self.resolutions[0]))
+        if cells is None or not len(cells['times']):
+            return None
+        return int(cells['times'].min()), int(cells['times'].max())
+
+    def resolution_for(self, max_points=DEFAULT_MAX_POINTS):
+        """The finest resolution (seconds) that draws the whole run in at most `max_points` intervals."""
+        time_range = self.time_range()
+        for resolution in self.resolutions:
+            if time_range is None or (time_range[1] - time_range[0]) // (resolution * 1000) + 1 <= max_points:
+                return resolution
+        return self.resolutions[-1]
+
+    def series_names(self, kind):
+        """Names of the series of `kind` that have samples."""
+        cells = self.cells.get((kind, self.resolutions[0]))
+        if cells is None:
+            return []
+        return [self.names[kind][code] for code in np.unique(cells['codes']).tolist() if self.names[kind][code]]
+
+    def series(self, kind, name, resolution):
+        """
+        The series `name` of `kind` at `resolution`, one value per interval over the whole run (0 for intervals
+        without samples): dict of arrays 'times', 'samples', 'errors', 'throughput' (samples/s), 'error_rate' (%),
+        'mean', 'max', 'threads' and 'pNN' for every percentile. None when the series does not exist.
+        """
+        cells = self.cells.get((kind, resolution))
+        time_range = self.time_range()
+        if cells is None or time_range is None or name not in self.names[kind]:
+            return None
+        code = self.names[kind].index(name)
+        low, high = np.searchsorted(cells['codes'], [code, code + 1])
+        interval_ms = resolution * 1000
+        first = time_range[0] // interval_ms
+        positions = cells['times'][low:high] // interval_ms - first
+        size = int(time_range[1] // interval_ms - first + 1)
+
+        def dense(values, dtype=np.int64):
+            result = np.zeros(size, dtype=dtype)
+            result[positions] = values[low:high]
+            return result
+
+        samples = dense(cells['count'])
+        errors = dense(cells['errors'])
+        elapsed_sum = dense(cells['elapsed_sum'])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            series = {
+                'times': (first + np.arange(size, dtype=np.int64)) * interval_ms,
+                'samples': samples,
+                'errors': errors,
+                'throughput': samples / float(resolution),
+                'error_rate': np.where(samples > 0, errors / samples * 100, 0.0),
+                'mean': np.where(samples > 0, elapsed_sum / samples, 0.0),
+                'max': dense(cells['elapsed_max']),
+                'threads': dense(cells['threads']),
+            }
+        for column, percentile in enumerate(self.percentiles):
+            series[f"p{percentile:g}"] = dense(cells['percentiles'][:, column])
+        return series
+
+    def to_dict(self, resolution):
+        """All the series at `resolution` as plain lists, for JSON output."""
+        result = {'resolution_seconds': resolution, 'series': {}}
+        for kind in SERIES_KINDS:
+            result['series'][kind] = {}
+            for name in self.series_names(kind):
+                result['series'][kind][name] = {key: values.tolist()
+                                                for key, values in self.series(kind, name, resolution).items()}
+        return result
+
+    def save(self, path):
+        """Writes the rollups to `path` (.npz), replacing the file only once it is complete."""
+        arrays = {
+            'version': np.array(TIME_SERIES_FORMAT_VERSION),
+            'percentiles': np.array(self.percentiles, dtype=np.float64),
+            'resolutions': np.array(self.resolutions, dtype=np.int64),
+            'significant_digits': np.array(self.significant_digits),
+        }
+        for kind in SERIES_KINDS:
+            arrays[f"names/{kind}"] = np.array(self.names[kind], dtype=str)
+        for (kind, resolution), cells in self.cells.items():
+            for metric, values in cells.items():
+                arrays[f"{kind}/{resolution}/{metric}"] = values
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temporary_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Reads rollups written by `save`; None when the file is missing or from another format version."""
+        try:
+            data = np.load(path, allow_pickle=False)
+        except (OSError, ValueError):
+            return None
+        with data:
+            if 'version' not in data.files or int(data['version']) != TIME_SERIES_FORMAT_VERSION:
+                return None
+            rollups = cls([_plain_number(p) for p in data['percentiles'].tolist()], data['resolutions'].tolist(),
+                          int(data['significant_digits']),
+                          {kind: data[f"names/{kind}"].tolist() for kind in SERIES_KINDS})
+            for key in data.files:
+                parts = key.split('/')
+                if len(parts) == 3 and parts[0] in SERIES_KINDS:
+                    rollups.cells.setdefault((parts[0], int(parts[1])), {})[parts[2]] = data[key]
+        return rollups
+
+
+def _plain_number(value):
+    return int(value) if float(value).is_integer() else value
+
+
+def _cached_run(file_paths, cache_dir=None, merge=False):
+    if len(file_paths) == 1:
+        return open_columnar_cache(file_paths[0], cache_dir)
+    return open_merged_cache(file_paths, cache_dir) if merge else None
+
+
+def load_cached_time_series(file_paths, cache_dir=None, merge=False, percentiles=DEFAULT_TIME_SERIES_PERCENTILES,
+                            resolutions=DEFAULT_RESOLUTIONS, significant_digits=TIME_SERIES_SIGNIFICANT_DIGITS):
+    """
+    The saved rollups of the cached run of `file_paths` (one file, or the files of a merged run), or None when
+    the cache is missing or out of date, or the rollups were computed with other settings.
+    """
+    run = _cached_run(file_paths, cache_dir, merge)
+    if run is None:
+        return None
+    rollups = TimeSeriesRollups.load(os.path.join(run.directory, TIME_SERIES_FILE_NAME))
+    if rollups is None or not rollups.matches(percentiles, resolutions, significant_digits):
+        return None
+    return rollups
+
+
+def save_cached_time_series(rollups, file_paths, cache_dir=None, merge=False):
+    """Saves `rollups` in the cache folder of the run of `file_paths`. Returns False when there is no valid cache."""
+    run = _cached_run(file_paths, cache_dir, merge)
+    if run is None:
+        return False
+    rollups.save(os.path.join(run.directory, TIME_SERIES_FILE_NAME))
+    return True
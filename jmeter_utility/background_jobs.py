@@ -0,0 +1,121 @@
+# background_jobs.py
+import time
+import queue
+import threading
+
+# Tk widgets must only be touched from the thread running the mainloop. Long running work is therefore done by a
+# BackgroundJob: the worker thread never calls a widget, it posts events to a queue, and the mainloop drains that
+# queue every POLL_INTERVAL_MS via `after()` and hands each event to the page's callback.
+
+POLL_INTERVAL_MS = 50
+
+EVENT_STATUS = 'status'
+EVENT_PROGRESS = 'progress'
+EVENT_DONE = 'done'
+EVENT_CANCELLED = 'cancelled'
+EVENT_ERROR = 'error'
+
+
+class JobCancelled(Exception):
+    """Raised inside a worker by `BackgroundJob.check_cancelled` once the job has been cancelled."""
+
+
+class BackgroundJob:
+    """
+    Runs `target(job, *args)` in a daemon worker thread.
+
+    The worker reports with `job.post(event_type, **data)` and calls `job.check_cancelled()` between units of work.
+    `on_event(event_type, data)` is always called on the Tk thread. The last event is EVENT_DONE (data['result'] is
+    the value returned by `target`), EVENT_CANCELLED or EVENT_ERROR (data['error'] is the exception).
+    """
+
+    def __init__(self, widget, target, args=(), on_event=None):
+        self.widget = widget
+        self.target = target
+        self.args = args
+        self.on_event = on_event
+        self._events = queue.Queue()
+        self._cancel_requested = threading.Event()
+        self._finished = False
+        self._thread = None
+
+    @property
+    def cancelled(self):
+        return self._cancel_requested.is_set()
+
+    @property
+    def running(self):
+        return self._thread is not None and not self._finished
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.widget.after(POLL_INTERVAL_MS, self._drain_events)
+        return self
+
+    def cancel(self):
+        """Asks the worker to stop at its next `check_cancelled` call."""
+        self._cancel_requested.set()
+
+    def check_cancelled(self):
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+
+    def post(self, event_type, **data):
+        """Queues an event for the Tk thread. Safe to call from any thread."""
+        self._events.put((event_type, data))
+
+    def _run(self):
+        try:
+            result = self.target(self, *self.args)
+        except JobCancelled:
+            self.post(EVENT_CANCELLED)
+        except Exception as e:
+            self.post(EVENT_ERROR, error=e)
+        else:
+            self.post(EVENT_DONE, result=result)
+
+    def _drain_events(self):
+        try:
+            while True:
+                event_type, data = self._events.get_nowait()
+                if event_type in (EVENT_DONE, EVENT_CANCELLED, EVENT_ERROR):
+                    self._finished = True
+                if self.on_event is not None:
+                    self.on_event(event_type, data)
+        except queue.Empty:
+            pass
+
+        if not self._finished:
+            self.widget.after(POLL_INTERVAL_MS, self._drain_events)
+
+
+class ProgressEstimator:
+    """Estimates the remaining time of a job made of `total_units` roughly similar units of work."""
+
+    def __init__(self, total_units):
+        self.total_units = max(total_units, 1)
+        self.completed_units = 0
+        self.started_at = time.monotonic()
+
+    def advance(self, units=1):
+        self.completed_units = min(self.completed_units + units, self.total_units)
+
+    @property
+    def fraction(self):
+        return self.completed_units / self.total_units
+
+    def eta_seconds(self):
+        """Remaining seconds at the average speed so far, or None before the first unit is completed."""
+        if not self.completed_units:
+            return None
+        elapsed = time.monotonic() - self.started_at
+        return elapsed / self.completed_units * (self.total_units - self.completed_units)
+
+    def eta_text(self):
+        eta = self.eta_seconds()
+        if eta is None:
+            return "estimating..."
+        minutes, seconds = divmod(int(round(eta)), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes:02d}:{seconds:02d}"
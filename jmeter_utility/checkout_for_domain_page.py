@@ -1,5 +1,7 @@
 import ttkbootstrap as ttk
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_endpoints_by_domain
+from impact_preview import ImpactPreview
 
 class CheckoutPageForDomain(ttk.Frame):
     def __init__(self, parent):
@@ -16,6 +18,10 @@ class CheckoutPageForDomain(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill="both", expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # Button Frame (Keeps buttons aligned)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -48,6 +54,12 @@ class CheckoutPageForDomain(ttk.Frame):
         for idx, domain in enumerate(domains, start=1):
             ttk.Label(self.preview_frame, text=f"{idx}. {domain}", font=("Arial", 12)).pack(anchor="w", padx=20, pady=5)
 
+        # Dry run: endpoints each domain operation will touch in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"{action.capitalize()} endpoints of '{domain}'",
+              lambda inventory, name=domain: count_endpoints_by_domain(inventory, name)) for domain in domains])
+
     def go_back_to_endpoint_modifier_with_domain(self):
         self.parent.show_page(self.parent.endpoint_modifier_with_domain)
 
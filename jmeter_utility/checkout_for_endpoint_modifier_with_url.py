@@ -1,5 +1,7 @@
 import ttkbootstrap as ttk
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_endpoints_by_path_suffix
+from impact_preview import ImpactPreview
 
 
 class CheckoutPageForEndpointModifierWithURL(ttk.Frame):
@@ -17,6 +19,10 @@ class CheckoutPageForEndpointModifierWithURL(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill="both", expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # Button Frame (Keeps buttons aligned)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -51,6 +57,13 @@ class CheckoutPageForEndpointModifierWithURL(ttk.Frame):
             ttk.Label(self.preview_frame, text=f"{idx}. {endpoint}", font=("Arial", 12)).pack(anchor="w", padx=20,
                                                                                               pady=5)
 
+        # Dry run: endpoints each suffix will match in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"{action.capitalize()} endpoints ending with '{endpoint}'",
+              lambda inventory, suffix=endpoint: count_endpoints_by_path_suffix(inventory, suffix))
+             for endpoint in endpoints])
+
     def go_back_to_endpoint_modifier_with_url(self):
         """Return to the Endpoint Modifier with URL page."""
         self.parent.show_page(self.parent.endpoint_modifier_with_url)
@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 from tkinter import Frame, BOTH
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_headers
+from impact_preview import ImpactPreview
 
 
 class CheckoutPageForHeaderDelete(ttk.Frame):
@@ -17,6 +19,10 @@ class CheckoutPageForHeaderDelete(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill=BOTH, expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # Button Frame (For Back & Confirm)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -45,6 +51,12 @@ class CheckoutPageForHeaderDelete(ttk.Frame):
         for idx, header in enumerate(headers, start=1):
             ttk.Label(self.preview_frame, text=f"{idx}. {header}", font=("Arial", 12)).pack(anchor="w", padx=20, pady=5)
 
+        # Dry run: header entries each deletion will remove in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"Delete header '{header}'", lambda inventory, name=header: count_headers(inventory, name))
+             for header in headers])
+
     def go_back_to_delete_page(self):
         """Navigate back to the delete page."""
         self.parent.show_page(self.parent.http_header_delete_page)
@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 from tkinter import Frame, BOTH
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_headers
+from impact_preview import ImpactPreview
 
 
 class CheckoutPageForHeaderModify(ttk.Frame):
@@ -17,6 +19,10 @@ class CheckoutPageForHeaderModify(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill=BOTH, expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # Button Frame (For Back & Confirm)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -50,6 +56,11 @@ class CheckoutPageForHeaderModify(ttk.Frame):
             ttk.Label(self.preview_frame, text=header_name, font=("Arial", 12)).grid(row=row, column=0, padx=20, pady=5, sticky="w")
             ttk.Label(self.preview_frame, text=header_value, font=("Arial", 12)).grid(row=row, column=1, padx=20, pady=5, sticky="w")
 
+        # Dry run: header entries each modification will change in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"Modify header '{header_name}'", lambda inventory, name=header_name: count_headers(inventory, name))
+             for header_name in headers_to_modify])
 
     def confirm_changes(self):
         """Confirm the changes and apply modifications."""
@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 from tkinter import BOTH
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_paths_containing, count_arguments_containing
+from impact_preview import ImpactPreview
 
 class CheckoutPageForReplaceText(ttk.Frame):
     def __init__(self, parent):
@@ -16,6 +18,10 @@ class CheckoutPageForReplaceText(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill=BOTH, expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # 🛠 Button Frame (Align buttons)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -76,6 +82,14 @@ class CheckoutPageForReplaceText(ttk.Frame):
             ttk.Label(content_frame, text=f"🟢 {new_text}", font=("Arial", 12)).grid(row=row, column=1, padx=20, pady=5,
                                                                                      sticky="w")
 
+        # Dry run: URLs and parameters / body data each replacement will change in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"Replace '{old_text}'", lambda inventory, text=old_text, in_url=in_url, in_body=in_body:
+              (count_paths_containing(inventory, text) if in_url else 0) +
+              (count_arguments_containing(inventory, text) if in_body else 0))
+             for old_text, _, in_url, in_body in self.text_replacements])
+
     def go_back_to_replace_text(self):
         """Navigate back to the Replace Content page."""
         self.parent.show_page(self.parent.replace_content_page)  # Fixed reference to correct page
@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 from tkinter import BOTH
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_endpoints_by_domain
+from impact_preview import ImpactPreview
 
 class CheckoutPageForReplaceDomain(ttk.Frame):
     def __init__(self, parent):
@@ -16,6 +18,10 @@ class CheckoutPageForReplaceDomain(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill=BOTH, expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # 🛠 Button Frame (Align buttons)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -51,6 +57,13 @@ class CheckoutPageForReplaceDomain(ttk.Frame):
             ttk.Label(self.preview_frame, text=f"🔵 {old_domain}", font=("Arial", 12)).grid(row=row, column=0, padx=20, pady=5, sticky="w")
             ttk.Label(self.preview_frame, text=f"🟢 {new_domain}", font=("Arial", 12)).grid(row=row, column=1, padx=20, pady=5, sticky="w")
 
+        # Dry run: endpoints each domain replacement will change in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"Replace '{old_domain}' with '{new_domain}'",
+              lambda inventory, name=old_domain: count_endpoints_by_domain(inventory, name))
+             for old_domain, new_domain in domain_pairs])
+
     def go_back_to_replace_domain(self):
         """Navigate back to the Replace Domain Name page."""
         self.parent.show_page(self.parent.replace_domain_name_page)
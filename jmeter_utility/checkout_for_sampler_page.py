@@ -1,6 +1,8 @@
 import ttkbootstrap as ttk
 from tkinter import BOTH
 from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
+from jmeter_methods.jmx_inventory import count_elements_by_test_name
+from impact_preview import ImpactPreview
 
 class CheckoutForSamplerPage(ttk.Frame):
     def __init__(self, parent):
@@ -17,6 +19,10 @@ class CheckoutForSamplerPage(ttk.Frame):
         self.preview_frame = ttk.Frame(self)
         self.preview_frame.pack(fill=BOTH, expand=True, pady=20)
 
+        # Dry-run counts of the elements the changes will touch
+        self.impact_preview = ImpactPreview(self)
+        self.impact_preview.pack(fill="x", padx=20, pady=(0, 10))
+
         # 🛠 Button Frame (Align buttons)
         button_frame = ttk.Frame(self)
         button_frame.pack(fill="x", pady=10)
@@ -56,6 +62,12 @@ class CheckoutForSamplerPage(ttk.Frame):
 
         self.status_label.config(text="")  # Reset status message
 
+        # Dry run: elements each sampler operation will touch in every uploaded file
+        self.impact_preview.preview(
+            self.parent.file_upload_page.get_uploaded_files(),
+            [(f"{action.capitalize()} '{sampler}'",
+              lambda inventory, name=sampler: count_elements_by_test_name(inventory, name)) for sampler in samplers])
+
     def confirm_changes(self):
         """Apply the changes to uploaded JMX files and handle success/failure messages."""
         uploaded_files = self.parent.file_upload_page.uploaded_file_paths
@@ -1,13 +1,13 @@
 import ttkbootstrap as ttk
+from jmeter_methods.jmx_inventory import INVENTORY_DOMAINS
+from virtualized_check_list import VirtualizedCheckList
+from inventory_list_loader import InventoryListLoader
 
 class ListDomains(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding=20)
         self.parent = parent
 
-        # List to store the selected domain names
-        self.selected_domain_names = []  # Store BooleanVar objects for checkboxes
-
         # Action variable for radio buttons
         self.action_var = ttk.StringVar(value="")
 
@@ -15,22 +15,9 @@ class ListDomains(ttk.Frame):
         title_label = ttk.Label(self, text="📜 List of Domain Names", font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=4, pady=10)
 
-        # Scrollable Frame
-        self.scrollable_frame = ttk.Frame(self, padding=10)
-        self.scrollable_frame.grid(row=1, column=0, columnspan=3, pady=5, sticky="nsew")
-
-        # Add a Canvas for Scrollable Content
-        self.canvas = ttk.Canvas(self.scrollable_frame, width=500, height=600)
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        # Add a Vertical Scrollbar
-        self.scrollbar = ttk.Scrollbar(self.scrollable_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollbar.pack(side="right", fill="y")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Frame for the checkboxes inside the canvas
-        self.checkbox_frame = ttk.Frame(self.canvas, padding=10, width=380)
-        self.canvas.create_window((0, 0), window=self.checkbox_frame, anchor="nw")
+        # Virtualized list: only the visible rows are drawn, so thousands of domains stay responsive
+        self.check_list = VirtualizedCheckList(self, width=500, height=600)
+        self.check_list.grid(row=1, column=0, columnspan=3, pady=5, padx=10, sticky="nsew")
 
         button_frame = ttk.Frame(self)
         button_frame.grid(row=2, column=0, columnspan=3, pady=10, sticky="ew")
@@ -50,34 +37,23 @@ class ListDomains(ttk.Frame):
         self.status_label = ttk.Label(self, text="", font=("Arial", 12), bootstyle="danger")
         self.status_label.grid(row=3, column=0, columnspan=3, pady=10)
 
-    def populate_domain_names(self, domain_names):
-        """Populate domain names with checkboxes."""
-        self.domain_names = domain_names  # Store the domain names list
-
-        # Clear previous checkboxes
-        for widget in self.checkbox_frame.winfo_children():
-            widget.destroy()
-
-        self.selected_domain_names = []  # Reset selected domain names
+        # Progress of the background loading of the uploaded files
+        self.inventory_loader = InventoryListLoader(self, self.check_list, INVENTORY_DOMAINS, "domains")
+        self.inventory_loader.grid(row=4, column=0, columnspan=3, pady=5, padx=10, sticky="ew")
 
-        # Create a Checkbutton for each domain in the list
-        for i, domain in enumerate(self.domain_names):
-            var = ttk.BooleanVar(value=False)  # Set initial state to False (unselected)
-            check_button = ttk.Checkbutton(self.checkbox_frame, text=domain, variable=var)
-            check_button.grid(row=i, column=0, sticky="w", padx=10, pady=5)
-            self.selected_domain_names.append(var)  # Store BooleanVar
+    def load_domain_names(self, file_paths):
+        """Load the domain names of `file_paths` in the background, filling the list as each file is read."""
+        self.status_label.config(text="")
+        self.inventory_loader.load(file_paths)
 
-        # Update the scroll region of the canvas after adding checkboxes
-        self.checkbox_frame.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+    def populate_domain_names(self, domain_names):
+        """Populate the selectable list of domain names."""
+        self.domain_names = domain_names  # Store the domain names list
+        self.check_list.set_items(self.domain_names)
 
     def get_selected_domain_names(self):
         """Return the list of selected domain names."""
-        selected = []
-        for i, var in enumerate(self.selected_domain_names):
-            if var.get():  # Check if checkbox is selected
-                selected.append(self.domain_names[i])
-        return selected
+        return self.check_list.get_selected_items()
 
     def navigate_to_modify_domain(self):
         """Navigate to the ModifySelectedDomainsPage with the selected domains."""
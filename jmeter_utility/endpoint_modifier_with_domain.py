@@ -1,6 +1,5 @@
 import ttkbootstrap as ttk
 from tkinter import StringVar
-from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
 
 
 class EndpointActionPageForDomain(ttk.Frame):
@@ -68,12 +67,8 @@ class EndpointActionPageForDomain(ttk.Frame):
                 self.status_label.config(text="⚠ No files uploaded!", bootstyle="danger")
                 return
 
-            unique_domains = set()
-            for file_path in uploaded_file_paths:
-                modifier = JMXModifier(file_path)
-                unique_domains.update(modifier.list_unique_domain_names())
-
-            self.parent.domain_list_page.populate_domain_names(list(sorted(unique_domains)))
+            # The list page reads the files in the background and fills in as each file is read
+            self.parent.domain_list_page.load_domain_names(uploaded_file_paths)
             self.parent.show_page(self.parent.domain_list_page)
 
         except Exception as e:
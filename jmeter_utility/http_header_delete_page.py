@@ -1,6 +1,5 @@
 import ttkbootstrap as ttk
 from tkinter import StringVar
-from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
 
 
 class HttpHeaderDeletePage(ttk.Frame):
@@ -62,12 +61,8 @@ class HttpHeaderDeletePage(ttk.Frame):
                 self.status_label.config(text="⚠ No files uploaded!", bootstyle="danger")
                 return
 
-            unique_headers = set()
-            for file_path in uploaded_file_paths:
-                modifier = JMXModifier(file_path)
-                unique_headers.update(modifier.list_header_names())
-
-            self.parent.http_header_list_page.populate_headers(list(sorted(unique_headers)))
+            # The list page reads the files in the background and fills in as each file is read
+            self.parent.http_header_list_page.load_headers(uploaded_file_paths)
             self.parent.show_page(self.parent.http_header_list_page)
 
         except Exception as e:
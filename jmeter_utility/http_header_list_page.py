@@ -1,10 +1,12 @@
 import ttkbootstrap as ttk
+from jmeter_methods.jmx_inventory import INVENTORY_HEADERS
+from virtualized_check_list import VirtualizedCheckList
+from inventory_list_loader import InventoryListLoader
 
 class ListHeadersPage(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding=20)
         self.parent = parent
-        self.selected_headers = []  # Store boolean variables for checkboxes
 
         # Configure grid layout for responsiveness
         self.columnconfigure(0, weight=1)
@@ -15,22 +17,9 @@ class ListHeadersPage(ttk.Frame):
         title_label = ttk.Label(self, text="📜 List of Headers", font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=3, pady=10, sticky="n")
 
-        # Scrollable Frame
-        self.scrollable_frame = ttk.Frame(self, padding=10)
-        self.scrollable_frame.grid(row=1, column=0, columnspan=3, pady=5, sticky="nsew")
-
-        # Increased Canvas Height for better visibility
-        self.canvas = ttk.Canvas(self.scrollable_frame, width=500, height=600)  # Adjusted height
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        # Add a Vertical Scrollbar
-        self.scrollbar = ttk.Scrollbar(self.scrollable_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollbar.pack(side="right", fill="y")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Frame for the checkboxes inside the canvas
-        self.checkbox_frame = ttk.Frame(self.canvas, padding=10, width=480)
-        self.canvas.create_window((0, 0), window=self.checkbox_frame, anchor="nw")
+        # Virtualized list: only the visible rows are drawn, so thousands of headers stay responsive
+        self.check_list = VirtualizedCheckList(self, width=500, height=600)
+        self.check_list.grid(row=1, column=0, columnspan=3, pady=5, padx=10, sticky="nsew")
 
         # Buttons (Compact Layout)
         button_frame = ttk.Frame(self)
@@ -49,26 +38,23 @@ class ListHeadersPage(ttk.Frame):
         self.status_label = ttk.Label(self, text="", font=("Arial", 12), bootstyle="danger")
         self.status_label.grid(row=3, column=0, columnspan=3, pady=10)
 
-    def populate_headers(self, headers):
-        """Populate headers with checkboxes for each header."""
-        self.headers = headers
-        for widget in self.checkbox_frame.winfo_children():
-            widget.destroy()  # Clear previous checkboxes
+        # Progress of the background loading of the uploaded files
+        self.inventory_loader = InventoryListLoader(self, self.check_list, INVENTORY_HEADERS, "headers")
+        self.inventory_loader.grid(row=4, column=0, columnspan=3, pady=5, padx=10, sticky="ew")
 
-        self.selected_headers = []
-        for i, header in enumerate(self.headers):
-            var = ttk.BooleanVar(value=False)
-            check_button = ttk.Checkbutton(self.checkbox_frame, text=header, variable=var, bootstyle="info")
-            check_button.grid(row=i, column=0, sticky="w", padx=5, pady=2)
-            self.selected_headers.append(var)
+    def load_headers(self, file_paths):
+        """Load the header names of `file_paths` in the background, filling the list as each file is read."""
+        self.status_label.config(text="")
+        self.inventory_loader.load(file_paths)
 
-        # Update the canvas size dynamically
-        self.checkbox_frame.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+    def populate_headers(self, headers):
+        """Populate the selectable list of headers."""
+        self.headers = headers
+        self.check_list.set_items(self.headers)
 
     def get_selected_headers(self):
         """Return the list of selected headers."""
-        return [self.headers[i] for i, var in enumerate(self.selected_headers) if var.get()]
+        return self.check_list.get_selected_items()
 
     def navigate_to_modify_headers(self):
         """Navigate to ModifySelectedHeadersPage."""
@@ -0,0 +1,108 @@
+# impact_preview.py
+import os
+import ttkbootstrap as ttk
+
+from jmeter_methods.jmx_inventory import iter_jmx_inventories
+
+from background_jobs import BackgroundJob, EVENT_PROGRESS, EVENT_DONE, EVENT_CANCELLED, EVENT_ERROR
+
+# Dry-run preview for the checkout pages: before anything is saved, shows how many elements each queued operation
+# will touch in each uploaded file. Counts come from the per-file index of jmx_inventory.py (cached, or built in
+# worker processes), so the preview never parses a file a second time and never blocks the window.
+
+
+class ImpactPreview(ttk.Frame):
+    def __init__(self, parent, height=8):
+        super().__init__(parent)
+        self.job = None
+        self.operations = []
+        self.totals = []
+        self.files_done = 0
+        self.total_files = 0
+
+        title_label = ttk.Label(self, text="🔎 Dry run: elements affected per file", font=("Arial", 13, "bold"))
+        title_label.pack(anchor="w", pady=(0, 5))
+
+        tree_frame = ttk.Frame(self)
+        tree_frame.pack(fill="both", expand=True)
+
+        self.tree = ttk.Treeview(tree_frame, columns=("elements",), height=height, bootstyle="info")
+        self.tree.heading("#0", text="Operation / File", anchor="w")
+        self.tree.heading("elements", text="Elements", anchor="e")
+        self.tree.column("#0", width=520, stretch=True)
+        self.tree.column("elements", width=100, anchor="e", stretch=False)
+        self.tree.tag_configure("no_match", foreground=ttk.Style().colors.warning)
+        self.tree.pack(side="left", fill="both", expand=True)
+
+        scrollbar = ttk.Scrollbar(tree_frame, orient="vertical", command=self.tree.yview)
+        scrollbar.pack(side="right", fill="y")
+        self.tree.configure(yscrollcommand=scrollbar.set)
+
+        self.status_label = ttk.Label(self, text="", font=("Arial", 11))
+        self.status_label.pack(anchor="w", pady=(5, 0))
+
+    def preview(self, file_paths, operations):
+        """
+        Counts in the background what each operation will touch in `file_paths`.
+        `operations` is a list of (label, count_function); count_function(inventory) returns a number of elements.
+        """
+        if self.job is not None and self.job.running:
+            self.job.cancel()
+
+        self.operations = list(operations)
+        self.totals = [0] * len(self.operations)
+        self.files_done = 0
+        self.total_files = len(file_paths)
+        self.tree.delete(*self.tree.get_children())
+        for index, (label, _) in enumerate(self.operations):
+            self.tree.insert("", "end", iid=f"op{index}", text=label, values=("…",), open=self.total_files <= 5)
+
+        if not file_paths or not self.operations:
+            self.status_label.config(text="No files uploaded." if not file_paths else "", bootstyle="warning")
+            return
+        self.status_label.config(text=f"Counting affected elements in {self.total_files} file(s)...",
+                                 bootstyle="info")
+
+        count_functions = [count_function for _, count_function in self.operations]
+        job = BackgroundJob(self, self._count_affected_elements, args=(list(file_paths), count_functions))
+        job.on_event = lambda event_type, data: self._on_job_event(job, event_type, data)
+        self.job = job.start()
+
+    @staticmethod
+    def _count_affected_elements(job, file_paths, count_functions):
+        for file_path, inventory, error in iter_jmx_inventories(file_paths, check_cancelled=job.check_cancelled):
+            counts = [count_function(inventory) for count_function in count_functions] if inventory else None
+            job.post(EVENT_PROGRESS, file_path=file_path, counts=counts, error=str(error) if error else None)
+
+    def _on_job_event(self, job, event_type, data):
+        if job is not self.job:
+            return  # Events of a preview that has been replaced by a newer one
+        if event_type == EVENT_PROGRESS:
+            self.files_done += 1
+            file_name = os.path.basename(data['file_path'])
+            for index in range(len(self.operations)):
+                if data['error'] is not None:
+                    self.tree.insert(f"op{index}", "end", text=f"{file_name} (could not be read)", values=("—",))
+                    continue
+                count = data['counts'][index]
+                self.totals[index] += count
+                self.tree.insert(f"op{index}", "end", text=file_name, values=(count,),
+                                 tags=("no_match",) if count == 0 else ())
+                self.tree.item(f"op{index}", values=(self.totals[index],))
+            self.status_label.config(text=f"Counted {self.files_done} of {self.total_files} file(s)...")
+        elif event_type == EVENT_DONE:
+            unmatched = 0
+            for index in range(len(self.operations)):
+                matched = self.totals[index] > 0
+                self.tree.item(f"op{index}", values=(self.totals[index],), tags=() if matched else ("no_match",))
+                unmatched += not matched
+            if unmatched:
+                self.status_label.config(text=f"⚠ {unmatched} operation(s) match nothing in the uploaded files.",
+                                         bootstyle="warning")
+            else:
+                self.status_label.config(text=f"{sum(self.totals)} element(s) will be affected in "
+                                              f"{self.total_files} file(s).", bootstyle="success")
+        elif event_type == EVENT_CANCELLED:
+            self.status_label.config(text="")
+        elif event_type == EVENT_ERROR:
+            self.status_label.config(text=f"Could not count affected elements: {data['error']}", bootstyle="danger")
@@ -0,0 +1,110 @@
+# inventory_list_loader.py
+import os
+import ttkbootstrap as ttk
+from collections import Counter
+
+from jmeter_methods.jmx_inventory import iter_jmx_inventories
+
+from background_jobs import BackgroundJob, EVENT_PROGRESS, EVENT_DONE, EVENT_CANCELLED, EVENT_ERROR
+
+# Loads the headers, domains or samplers of the uploaded files into a VirtualizedCheckList without blocking the
+# window: the files are read by worker processes (see jmx_inventory.py) and each finished file is merged into the
+# list as it arrives. Refreshes are throttled, so many small files do not rebuild the list for every file.
+
+REFRESH_INTERVAL_MS = 300
+MAX_FILES_IN_SUMMARY = 8
+
+
+class InventoryListLoader(ttk.Frame):
+    def __init__(self, parent, check_list, kind, item_label):
+        super().__init__(parent)
+        self.check_list = check_list
+        self.kind = kind
+        self.item_label = item_label  # e.g. "domains", used in the progress messages
+
+        self.job = None
+        self.file_counts = {}  # File path -> Counter of the items found in that file
+        self.file_errors = {}  # File path -> error message
+        self.total_files = 0
+        self._refresh_scheduled = False
+
+        self.progress_bar = ttk.Progressbar(self, orient="horizontal", mode="determinate", bootstyle="info")
+        self.progress_bar.pack(side="top", fill="x", pady=(0, 5))
+
+        self.progress_label = ttk.Label(self, text="", font=("Arial", 11), wraplength=700)
+        self.progress_label.pack(side="top", fill="x")
+
+    def load(self, file_paths):
+        """Starts loading the items of `file_paths` into the list, replacing its current content."""
+        if self.job is not None and self.job.running:
+            self.job.cancel()
+
+        self.file_counts = {}
+        self.file_errors = {}
+        self.total_files = len(file_paths)
+        self.check_list.set_items([])
+        self.progress_bar.config(value=0, bootstyle="info")
+        self.progress_label.config(text=f"Reading {self.item_label} from {self.total_files} file(s)...",
+                                   bootstyle="info")
+
+        job = BackgroundJob(self, self._read_inventories, args=(list(file_paths), self.kind))
+        job.on_event = lambda event_type, data: self._on_job_event(job, event_type, data)
+        self.job = job.start()
+
+    @staticmethod
+    def _read_inventories(job, file_paths, kind):
+        for file_path, inventory, error in iter_jmx_inventories(file_paths, check_cancelled=job.check_cancelled):
+            job.post(EVENT_PROGRESS, file_path=file_path, counts=inventory[kind] if inventory else None,
+                     error=str(error) if error else None)
+
+    def _on_job_event(self, job, event_type, data):
+        if job is not self.job:
+            return  # Events of a load that has been replaced by a newer one
+        if event_type == EVENT_PROGRESS:
+            file_name = os.path.basename(data['file_path'])
+            if data['error'] is not None:
+                self.file_errors[data['file_path']] = data['error']
+                last = f"{file_name} could not be read: {data['error']}"
+            else:
+                self.file_counts[data['file_path']] = data['counts']
+                last = f"{file_name}: {len(data['counts'])} {self.item_label}"
+            done = len(self.file_counts) + len(self.file_errors)
+            self.progress_bar.config(value=done / max(self.total_files, 1) * 100)
+            self.progress_label.config(text=f"Loaded {done} of {self.total_files} file(s) — {last}")
+            self._schedule_refresh()
+        elif event_type == EVENT_DONE:
+            self._refresh()
+            self._show_summary()
+        elif event_type == EVENT_CANCELLED:
+            self._refresh()
+        elif event_type == EVENT_ERROR:
+            self._refresh()
+            self.progress_label.config(text=f"Error while reading {self.item_label}: {data['error']}",
+                                       bootstyle="danger")
+
+    def _schedule_refresh(self):
+        if not self._refresh_scheduled:
+            self._refresh_scheduled = True
+            self.after(REFRESH_INTERVAL_MS, self._refresh)
+
+    def _refresh(self):
+        self._refresh_scheduled = False
+        totals = Counter()
+        for counts in self.file_counts.values():
+            totals.update(counts)
+        self.check_list.set_items(sorted(totals), keep_selection=True, counts=totals)
+
+    def _show_summary(self):
+        per_file = [f"{os.path.basename(path)}: {len(counts)}" for path, counts in self.file_counts.items()]
+        if len(per_file) > MAX_FILES_IN_SUMMARY:
+            per_file = per_file[:MAX_FILES_IN_SUMMARY] + [f"and {len(per_file) - MAX_FILES_IN_SUMMARY} more"]
+        text = f"{len(self.check_list.items)} unique {self.item_label} in {len(self.file_counts)} file(s)"
+        if per_file:
+            text += " (" + ", ".join(per_file) + ")"
+        if self.file_errors:
+            text += f". {len(self.file_errors)} file(s) could not be read: " + \
+                    ", ".join(os.path.basename(path) for path in self.file_errors)
+            self.progress_label.config(text=text, bootstyle="warning")
+        else:
+            self.progress_label.config(text=text, bootstyle="success")
+        self.progress_bar.config(value=100, bootstyle="success")
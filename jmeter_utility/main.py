@@ -1,37 +1,42 @@
 import ttkbootstrap as ttk
-from file_upload_page import FileUploadPage
-from select_functionality import SelectFunctionality
-from http_header_modify_page import HttpHeaderPage
-from http_header_delete_page import HttpHeaderDeletePage
-from endpoint_modifier_with_url import EndpointActionPage
-from endpoint_modifier_with_domain import EndpointActionPageForDomain
-from replace_domain_name_page import ReplaceDomainNamePage
-from replace_contents_page import ReplaceContentPage
-from http_header_list_page import ListHeadersPage
-from modify_selected_headers_page import ModifySelectedHeadersPage
-from checkout_for_http_header_modify import CheckoutPageForHeaderModify
-from checkout_for_http_header_delete import CheckoutPageForHeaderDelete
-from sampler_modifier_page import SamplerModifierPage
-from delete_selected_headers import DeleteSelectedHeadersPage
-from checkout_for_domain_page import CheckoutPageForDomain
-from domain_list_page import ListDomains
-from modify_selected_domains_page import ModifySelectedDomainsPage
-from checkout_for_replace_domain_page import CheckoutPageForReplaceDomain
-from replace_selected_domains_page import ReplaceSelectedDomainsPage
-from checkout_for_sampler_page import CheckoutForSamplerPage
-from sampler_list_page import ListSamplers
-from modify_selected_samplers_page import ModifySelectedSamplersPage
-from checkout_for_endpoint_modifier_with_url import CheckoutPageForEndpointModifierWithURL
-from checkout_for_replace_contents_page import CheckoutPageForReplaceText
-from homepage import HomePage
-
-
-# Script validator
-from validator_file_upload_page import ValidatorFileUploadPage
-from validator_options_page import ValidatorOptionsPage
-from validator_report_page import ValidatorReportPage
-
-
+import importlib
+
+# Every page of the application: attribute name on App -> (module, class).
+# Pages are only imported and built the first time they are used (App.__getattr__), so startup does not pay for
+# the pages, validators and report libraries a session never opens.
+PAGE_REGISTRY = {
+    'file_upload_page': ('file_upload_page', 'FileUploadPage'),
+    'select_functionality': ('select_functionality', 'SelectFunctionality'),
+    'http_header_modify_page': ('http_header_modify_page', 'HttpHeaderPage'),
+    'http_header_delete_page': ('http_header_delete_page', 'HttpHeaderDeletePage'),
+    'endpoint_modifier_with_url': ('endpoint_modifier_with_url', 'EndpointActionPage'),
+    'endpoint_modifier_with_domain': ('endpoint_modifier_with_domain', 'EndpointActionPageForDomain'),
+    'replace_domain_name_page': ('replace_domain_name_page', 'ReplaceDomainNamePage'),
+    'replace_contents_page': ('replace_contents_page', 'ReplaceContentPage'),
+    'http_header_list_page': ('http_header_list_page', 'ListHeadersPage'),
+    'modify_selected_headers_page': ('modify_selected_headers_page', 'ModifySelectedHeadersPage'),
+    'checkout_for_http_header_modify': ('checkout_for_http_header_modify', 'CheckoutPageForHeaderModify'),
+    'checkout_for_http_header_delete': ('checkout_for_http_header_delete', 'CheckoutPageForHeaderDelete'),
+    'sampler_modifier_page': ('sampler_modifier_page', 'SamplerModifierPage'),
+    'delete_selected_headers': ('delete_selected_headers', 'DeleteSelectedHeadersPage'),
+    'checkout_for_domain_page': ('checkout_for_domain_page', 'CheckoutPageForDomain'),
+    'domain_list_page': ('domain_list_page', 'ListDomains'),
+    'modify_selected_domains_page': ('modify_selected_domains_page', 'ModifySelectedDomainsPage'),
+    'checkout_for_replace_domain_page': ('checkout_for_replace_domain_page', 'CheckoutPageForReplaceDomain'),
+    'replace_selected_domains_page': ('replace_selected_domains_page', 'ReplaceSelectedDomainsPage'),
+    'checkout_for_sampler_page': ('checkout_for_sampler_page', 'CheckoutForSamplerPage'),
+    'sampler_list_page': ('sampler_list_page', 'ListSamplers'),
+    'modify_selected_samplers_page': ('modify_selected_samplers_page', 'ModifySelectedSamplersPage'),
+    'checkout_for_endpoint_modifier_with_url': ('checkout_for_endpoint_modifier_with_url',
+                                                'CheckoutPageForEndpointModifierWithURL'),
+    'checkout_for_replace_contents_page': ('checkout_for_replace_contents_page', 'CheckoutPageForReplaceText'),
+    'homepage': ('homepage', 'HomePage'),
+
+    # Script validator
+    'validator_file_upload_page': ('validator_file_upload_page', 'ValidatorFileUploadPage'),
+    'validator_options_page': ('validator_options_page', 'ValidatorOptionsPage'),
+    'validator_report_page': ('validator_report_page', 'ValidatorReportPage'),
+}
 
 
 class App(ttk.Window):
@@ -46,45 +51,32 @@ class App(ttk.Window):
         # Store a reference to the selected JMX files for validation, accessible across pages
         self.validator_jmx_files = []
 
-        # Initialize frames
-        self.file_upload_page = FileUploadPage(self)
-        self.select_functionality = SelectFunctionality(self)
-        self.http_header_modify_page = HttpHeaderPage(self)
-        self.http_header_delete_page = HttpHeaderDeletePage(self)
-        self.endpoint_modifier_with_url = EndpointActionPage(self)
-        self.endpoint_modifier_with_domain = EndpointActionPageForDomain(self)
-        self.replace_domain_name_page = ReplaceDomainNamePage(self)
-        self.replace_contents_page = ReplaceContentPage(self)
-        self.http_header_list_page = ListHeadersPage(self)
-        self.modify_selected_headers_page = ModifySelectedHeadersPage(self)
-        self.checkout_for_http_header_modify = CheckoutPageForHeaderModify(self)
-        self.checkout_for_http_header_delete = CheckoutPageForHeaderDelete(self)
-        self.sampler_modifier_page = SamplerModifierPage(self)
-        self.delete_selected_headers = DeleteSelectedHeadersPage(self)
-        self.checkout_for_domain_page = CheckoutPageForDomain(self)
-        self.domain_list_page = ListDomains(self)
-        self.modify_selected_domains_page = ModifySelectedDomainsPage(self)
-        self.checkout_for_replace_domain_page = CheckoutPageForReplaceDomain(self)
-        self.replace_selected_domains_page = ReplaceSelectedDomainsPage(self)
-        self.checkout_for_sampler_page = CheckoutForSamplerPage(self)
-        self.sampler_list_page = ListSamplers(self)
-        self.modify_selected_samplers_page = ModifySelectedSamplersPage(self)
-        self.checkout_for_endpoint_modifier_with_url = CheckoutPageForEndpointModifierWithURL(self)
-        self.checkout_for_replace_contents_page = CheckoutPageForReplaceText(self)
-        self.homepage = HomePage(self)
-
-        # --- NEW: Initialize Script Validator frames ---
-        self.validator_file_upload_page = ValidatorFileUploadPage(self)
-        self.validator_file_upload_page = ValidatorFileUploadPage(self)
-        self.validator_options_page = ValidatorOptionsPage(self)
-        self.validator_report_page = ValidatorReportPage(self)
-
-
+        # Pages are built on first use, see PAGE_REGISTRY
+        self.pages = {}
 
         # Start with the file upload page
         #self.show_page(self.file_upload_page)
         self.show_page(self.homepage)
 
+    def __getattr__(self, name):
+        # Only called for attributes that do not exist yet: build registered pages on first access.
+        if name in PAGE_REGISTRY:
+            return self.get_page(name)
+        return super().__getattr__(name)
+
+    def get_page(self, name):
+        """Returns the page registered as `name`, importing and building it the first time."""
+        page = self.pages.get(name)
+        if page is None:
+            module_name, class_name = PAGE_REGISTRY[name]
+            page_class = getattr(importlib.import_module(module_name), class_name)
+            page = page_class(self)
+            # Some pages pack themselves when built; keep them hidden until show_page is called.
+            page.pack_forget()
+            self.pages[name] = page
+            setattr(self, name, page)
+        return page
+
     def show_page(self, page):
         """Hide all pages and show the specified one."""
         for child in self.winfo_children():
@@ -1,33 +1,20 @@
 import ttkbootstrap as ttk
+from jmeter_methods.jmx_inventory import INVENTORY_SAMPLERS
+from virtualized_check_list import VirtualizedCheckList
+from inventory_list_loader import InventoryListLoader
 
 class ListSamplers(ttk.Frame):
     def __init__(self, parent):
         super().__init__(parent, padding=20)
         self.parent = parent
 
-        # List to store selected samplers
-        self.selected_samplers = []
-
         # Title Label
         title_label = ttk.Label(self, text="List of Samplers", font=("Arial", 16, "bold"))
         title_label.grid(row=0, column=0, columnspan=4, pady=10)
 
-        # Scrollable Frame
-        self.scrollable_frame = ttk.Frame(self, padding=10)
-        self.scrollable_frame.grid(row=1, column=0, columnspan=3, pady=5, sticky="nsew")
-
-        # Add a Canvas for Scrollable Content
-        self.canvas = ttk.Canvas(self.scrollable_frame, width=500, height=400)
-        self.canvas.pack(side="left", fill="both", expand=True)
-
-        # Add a Vertical Scrollbar
-        self.scrollbar = ttk.Scrollbar(self.scrollable_frame, orient="vertical", command=self.canvas.yview)
-        self.scrollbar.pack(side="right", fill="y")
-        self.canvas.configure(yscrollcommand=self.scrollbar.set)
-
-        # Frame for checkboxes inside the canvas
-        self.checkbox_frame = ttk.Frame(self.canvas, padding=10, width=380)
-        self.canvas.create_window((0, 0), window=self.checkbox_frame, anchor="nw")
+        # Virtualized list: only the visible rows are drawn, so thousands of samplers stay responsive
+        self.check_list = VirtualizedCheckList(self, width=500, height=400)
+        self.check_list.grid(row=1, column=0, columnspan=3, pady=5, padx=10, sticky="nsew")
 
         button_frame = ttk.Frame(self)
         button_frame.grid(row=2, column=0, columnspan=3, pady=10, sticky="ew")
@@ -44,34 +31,23 @@ class ListSamplers(ttk.Frame):
         self.status_label = ttk.Label(self, text="", font=("Arial", 12), bootstyle="danger")
         self.status_label.grid(row=3, column=0, columnspan=3, pady=10)
 
-    def populate_sampler_names(self, sampler_names):
-        """Populate samplers with checkboxes."""
-        self.sampler_names = sampler_names  # Store sampler names list
-
-        # Clear previous checkboxes
-        for widget in self.checkbox_frame.winfo_children():
-            widget.destroy()
-
-        self.selected_samplers = []  # Reset selected samplers
+        # Progress of the background loading of the uploaded files
+        self.inventory_loader = InventoryListLoader(self, self.check_list, INVENTORY_SAMPLERS, "samplers")
+        self.inventory_loader.grid(row=4, column=0, columnspan=3, pady=5, padx=10, sticky="ew")
 
-        # Create a Checkbutton for each sampler
-        for i, sampler in enumerate(self.sampler_names):
-            var = ttk.BooleanVar(value=False)  # Unselected by default
-            check_button = ttk.Checkbutton(self.checkbox_frame, text=sampler, variable=var)
-            check_button.grid(row=i, column=0, sticky="w", padx=10, pady=5)
-            self.selected_samplers.append(var)  # Store BooleanVar
+    def load_sampler_names(self, file_paths):
+        """Load the sampler names of `file_paths` in the background, filling the list as each file is read."""
+        self.status_label.config(text="")
+        self.inventory_loader.load(file_paths)
 
-        # Update the scroll region of the canvas
-        self.checkbox_frame.update_idletasks()
-        self.canvas.config(scrollregion=self.canvas.bbox("all"))
+    def populate_sampler_names(self, sampler_names):
+        """Populate the selectable list of samplers."""
+        self.sampler_names = sampler_names  # Store sampler names list
+        self.check_list.set_items(self.sampler_names)
 
     def get_selected_samplers(self):
         """Return the list of selected samplers."""
-        selected = []
-        for i, var in enumerate(self.selected_samplers):
-            if var.get():
-                selected.append(self.sampler_names[i])
-        return selected
+        return self.check_list.get_selected_items()
 
     def navigate_to_modify_samplers(self):
         """Navigate to modify page with selected samplers."""
@@ -1,6 +1,5 @@
 import ttkbootstrap as ttk
 from tkinter import StringVar, ttk, messagebox
-from jmeter_methods.Jmeter_Automation_Methods import JMXModifier
 
 class SamplerModifierPage(ttk.Frame):
     def __init__(self, parent):
@@ -88,12 +87,8 @@ class SamplerModifierPage(ttk.Frame):
                 self.status_label.config(text="No files uploaded!", bootstyle="danger")
                 return
 
-            unique_sampler_names = set()
-            for file_path in uploaded_file_paths:
-                modifier = JMXModifier(file_path)
-                unique_sampler_names.update(modifier.list_unique_sampler_names())
-
-            self.parent.sampler_list_page.populate_sampler_names(list(sorted(unique_sampler_names)))
+            # The list page reads the files in the background and fills in as each file is read
+            self.parent.sampler_list_page.load_sampler_names(uploaded_file_paths)
             self.parent.show_page(self.parent.sampler_list_page)
 
         except Exception as e:
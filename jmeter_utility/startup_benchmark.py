@@ -0,0 +1,82 @@
+# startup_benchmark.py
+"""
+Measures the cold start time of the application (import of main.py, construction of the window and first idle
+loop) in fresh interpreter processes, and checks it against a time budget.
+
+It also checks that the modules deferred until they are needed (the validators, jinja2, openpyxl) are not loaded
+at startup. Exits with code 1 when the budget is exceeded or a deferred module was loaded.
+
+Example:
+    python jmeter_utility/startup_benchmark.py --runs 5 --budget 1.5
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+STARTUP_BUDGET_SECONDS = 2.0
+DEFAULT_RUNS = 5
+DEFERRED_MODULE_PREFIXES = ('jinja2', 'openpyxl', 'jmeter_methods.Val_')
+
+APP_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+REPOSITORY_DIRECTORY = os.path.dirname(APP_DIRECTORY)
+
+# Runs in the child process: times the startup and reports which deferred modules were imported.
+_MEASURE_STARTUP = """
+import sys, time, json
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+app = main.App()
+app.update()
+ready = time.perf_counter()
+prefixes = tuple(sys.argv[1].split(','))
+loaded = sorted(name for name in sys.modules if name.startswith(prefixes))
+app.destroy()
+print(json.dumps({'import': imported - start, 'total': ready - start, 'pages_built': len(app.pages),
+                  'deferred_modules_loaded': loaded}))
+"""
+
+
+def measure_startup():
+    """Starts the application once in a new interpreter and returns its timings."""
+    environment = dict(os.environ)
+    environment['PYTHONPATH'] = os.pathsep.join(
+        [APP_DIRECTORY, REPOSITORY_DIRECTORY] + ([environment['PYTHONPATH']] if environment.get('PYTHONPATH') else []))
+    output = subprocess.run([sys.executable, '-c', _MEASURE_STARTUP, ','.join(DEFERRED_MODULE_PREFIXES)],
+                            cwd=APP_DIRECTORY, env=environment, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure the application's cold start time.")
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help="Number of cold starts to measure.")
+    parser.add_argument('--budget', type=float, default=STARTUP_BUDGET_SECONDS,
+                        help="Maximum median startup time in seconds.")
+    args = parser.parse_args(argv)
+
+    results = []
+    for run in range(args.runs):
+        result = measure_startup()
+        results.append(result)
+        print(f"Run {run + 1}: {result['total']:.3f}s (imports {result['import']:.3f}s, "
+              f"{result['pages_built']} page(s) built)")
+
+    median_total = statistics.median(result['total'] for result in results)
+    print(f"Median startup: {median_total:.3f}s (budget {args.budget:.3f}s)")
+
+    failed = False
+    if median_total > args.budget:
+        print(f"Startup time is over budget by {median_total - args.budget:.3f}s.", file=sys.stderr)
+        failed = True
+    loaded = sorted({name for result in results for name in result['deferred_modules_loaded']})
+    if loaded:
+        print("Modules that should be deferred were loaded at startup: " + ", ".join(loaded), file=sys.stderr)
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,8 @@
 import ttkbootstrap as ttk
 from tkinter import messagebox
 
+from Report.issue_writers import OUTPUT_FORMAT_LABELS, OUTPUT_FORMAT_HTML
+
 
 class ValidatorOptionsPage(ttk.Frame):
     def __init__(self, parent):
@@ -11,6 +13,8 @@ class ValidatorOptionsPage(ttk.Frame):
         self.pack(fill="both", expand=True)
 
         self.validation_options = self._define_validation_options()
+        self.output_format_vars = {output_format: ttk.BooleanVar(value=(output_format == OUTPUT_FORMAT_HTML))
+                                   for output_format in OUTPUT_FORMAT_LABELS}
         self._create_widgets()
 
     def _define_validation_options(self):
@@ -24,7 +28,8 @@ class ValidatorOptionsPage(ttk.Frame):
             "Hardcoded Value Detection": {"var": ttk.BooleanVar(value=True), "category": "Network"},
             "Unused Extractors/Variables Detection": {"var": ttk.BooleanVar(value=True), "category": "Network"},
             "Unextracted Variables Detection": {"var": ttk.BooleanVar(value=True), "category": "Network"},
-            "Duplicate Extractors/Variable Conflicts": {"var": ttk.BooleanVar(value=True), "category": "Network"}
+            "Duplicate Extractors/Variable Conflicts": {"var": ttk.BooleanVar(value=True), "category": "Network"},
+            "Load Generator Efficiency": {"var": ttk.BooleanVar(value=True), "category": "Performance"}
 
         }
 
@@ -41,6 +46,15 @@ class ValidatorOptionsPage(ttk.Frame):
                                   bootstyle="info-round-toggle")
             chk.pack(anchor="w", padx=50, pady=3)
 
+        ttk.Label(options_frame, text="Output Formats:", font=("Arial", 16, "bold"),
+                  bootstyle="primary").pack(pady=(20, 10))
+
+        formats_frame = ttk.Frame(options_frame)
+        formats_frame.pack(anchor="w", padx=50)
+        for output_format, label in OUTPUT_FORMAT_LABELS.items():
+            ttk.Checkbutton(formats_frame, text=label, variable=self.output_format_vars[output_format],
+                            bootstyle="info-round-toggle").pack(side="left", padx=(0, 20), pady=3)
+
         button_frame = ttk.Frame(self)
         button_frame.pack(pady=20)
 
@@ -56,6 +70,9 @@ class ValidatorOptionsPage(ttk.Frame):
         selected = [name for name, config in self.validation_options.items() if config['var'].get()]
         return selected
 
+    def get_selected_output_formats(self):
+        return [output_format for output_format, var in self.output_format_vars.items() if var.get()]
+
     def generate_report(self):
         selected_files = self.parent.get_validator_jmx_files()
         selected_validations = self.get_selected_validations()
@@ -71,6 +88,13 @@ class ValidatorOptionsPage(ttk.Frame):
             self.parent.show_page(self.parent.validator_file_upload_page)
             return
 
+        selected_output_formats = self.get_selected_output_formats()
+        if not selected_output_formats:
+            messagebox.showwarning("No Output Format Selected", "Please select at least one output format.",
+                                   parent=self.parent)
+            return
+
         # Delegate the report generation process to the ValidatorReportPage
-        self.parent.validator_report_page.start_report_generation(selected_files, selected_validations)
+        self.parent.validator_report_page.start_report_generation(selected_files, selected_validations,
+                                                                  selected_output_formats)
         self.parent.show_page(self.parent.validator_report_page)
\ No newline at end of file
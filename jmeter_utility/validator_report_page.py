@@ -2,66 +2,20 @@
 import ttkbootstrap as ttk
 from tkinter import messagebox
 import os
-import threading
 import webbrowser
-import xml.etree.ElementTree as ET
-from datetime import datetime
 
-# Import core validation logic for TXN Naming
-from jmeter_methods.Val_Backend_TXN_Naming_Convention import analyze_jmeter_script as analyze_txn_naming_script, \
-    THIS_VALIDATION_OPTION_NAME as TXN_VALIDATION_OPTION_NAME
-
-# Import core validation logic for KPI Naming
-from jmeter_methods.Val_Backend_HTTPRequest_Naming_Standard import analyze_jmeter_script as analyze_kpi_naming_script, \
-    THIS_VALIDATION_OPTION_NAME as KPI_VALIDATION_OPTION_NAME
-
-# Import core validation logic for Server Name/Domain Hygiene
-from jmeter_methods.Val_Backend_Server_Name_Hygiene import analyze_jmeter_script as analyze_server_hygiene_script, \
-    THIS_VALIDATION_OPTION_NAME as SERVER_HYGIENE_VALIDATION_OPTION_NAME
-
-# Import core validation logic for Extractor and Variable Naming Standards
-from jmeter_methods.Val_Backend_Extractor_Variable_Standards import \
-    analyze_jmeter_script as analyze_extractor_standards_script, \
-    THIS_VALIDATION_OPTION_NAME as EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME
-
-# Import core validation logic for Variable Naming Convention
-from jmeter_methods.Val_Backend_Variable_Naming_Conventions import analyze_jmeter_script as analyze_variable_standards, \
-    THIS_VALIDATION_OPTION_NAME as VARIABLE_NAMING_CONVENTION_OPTION_NAME
-
-# Import core validation logic for Hard coded value detection
-from jmeter_methods.Val_Hardcoded_Value_Detection import analyze_jmeter_script as analyze_hardcoded_value_detection, \
-    THIS_VALIDATION_OPTION_NAME as HARDCODED_VALUE_DETECTION_OPTION_NAME
-
-# Import core validation logic for unused extractor variable detection.
-from jmeter_methods.Val_Backend_Unused_Extractors_And_Variables_Detection import \
-    analyze_jmeter_script as analyze_unused_extrator_and_variable_detection, \
-    THIS_VALIDATION_OPTION_NAME as UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION
-
-# Import core validation logic for Unextracted Variables Detection
-from jmeter_methods.Val_Backend_Unextracted_Variable_Detection import \
-    analyze_jmeter_script as analyze_unextracted_variable_detection, \
-    THIS_VALIDATION_OPTION_NAME as UNEXTRACTED_VARIABLE_DETECTION
-
-# Import core validation logic for Duplicate extractors
-from jmeter_methods.Val_Backend_Duplicate_Extractors import analyze_jmeter_script as analyze_duplicate_extractor_detection, \
-    THIS_VALIDATION_OPTION_NAME as DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME
+# Import the validation runner (every validation module is registered there)
+from jmeter_methods.validation_runner import PARSING_VALIDATION_OPTION_NAME, parse_jmx_file, get_selected_validators, \
+    run_validator
 
 # Import report generation functions
-from Report.report_generator import generate_html_report
-
-# --- IMPORTANT: Update this list with all your validation option names ---
-ALL_VALIDATION_OPTIONS = [
-    TXN_VALIDATION_OPTION_NAME,
-    KPI_VALIDATION_OPTION_NAME,
-    SERVER_HYGIENE_VALIDATION_OPTION_NAME,
-    EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME,
-    VARIABLE_NAMING_CONVENTION_OPTION_NAME,
-    HARDCODED_VALUE_DETECTION_OPTION_NAME,
-    UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION,
-    UNEXTRACTED_VARIABLE_DETECTION,
-    DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME
-    # ADDED THIS LINE
-]
+from Report.report_generator import generate_html_report, REPORT_MODE_AUTO
+from Report.suite_dashboard import SuiteDashboard, get_dashboard_output_path, get_baseline_path
+from Report.issue_fingerprints import IssueFingerprinter
+from Report.issue_writers import OUTPUT_FORMAT_HTML, open_issue_writers
+
+from background_jobs import BackgroundJob, ProgressEstimator, EVENT_STATUS, EVENT_PROGRESS, EVENT_DONE, \
+    EVENT_CANCELLED, EVENT_ERROR
 
 
 class ValidatorReportPage(ttk.Frame):
@@ -80,39 +34,114 @@ class ValidatorReportPage(ttk.Frame):
         self.status_label = ttk.Label(self, text="Awaiting JMX files...", font=("Arial", 12), bootstyle="info")
         self.status_label.pack(pady=5)
 
+        # Progress of the validators on the file currently being processed
+        self.file_progress_bar = ttk.Progressbar(self, orient="horizontal", length=600, mode="determinate",
+                                                 bootstyle="secondary")
+        self.file_progress_bar.pack(pady=(10, 5), padx=50, fill="x")
+
+        self.detail_label = ttk.Label(self, text="", font=("Arial", 11), bootstyle="secondary")
+        self.detail_label.pack(pady=5)
+
+        self.cancel_button = ttk.Button(self, text="Cancel", command=self.cancel_report_generation,
+                                        state=ttk.DISABLED, bootstyle="danger outline")
+        self.cancel_button.pack(pady=10)
+
         self.open_report_button = ttk.Button(self, text="Open Latest Report Folder", command=self.open_reports_folder,
                                              state=ttk.DISABLED, bootstyle="success outline")
         self.open_report_button.pack(pady=10)
 
+        self.open_dashboard_button = ttk.Button(self, text="Open Suite Dashboard", command=self.open_dashboard,
+                                                state=ttk.DISABLED, bootstyle="info outline")
+        self.open_dashboard_button.pack(pady=10)
+
+        self.save_baseline_button = ttk.Button(self, text="Save Run as Baseline", command=self.save_baseline,
+                                               state=ttk.DISABLED, bootstyle="warning outline")
+        self.save_baseline_button.pack(pady=10)
+
         back_button = ttk.Button(self, text="Back to Options", bootstyle="secondary",
                                  command=lambda: self.parent.show_page(self.parent.validator_options_page))
         back_button.pack(pady=10)
 
         self.reports_generated_paths = []
+        self.dashboard_path = None
+        self.last_dashboard = None
+        self.baseline_path = None
+        self.job = None
+
+    def start_report_generation(self, files, validations, output_formats=(OUTPUT_FORMAT_HTML,)):
+        if self.job is not None and self.job.running:
+            messagebox.showwarning("Validation Running", "A validation run is already in progress. "
+                                   "Cancel it or wait for it to finish.", parent=self.parent)
+            return
+
+        if not files:
+            self.status_label.config(text="No JMX files selected for validation.")
+            messagebox.showwarning("No Files", "No JMX files were found to validate.", parent=self.parent)
+            return
 
-    def start_report_generation(self, files, validations):
         self.reports_generated_paths = []
-        self.report_label.config(text="Report Generation in Progress...")
+        self.dashboard_path = None
+        self.last_dashboard = None
+        self.baseline_path = None
+        self.report_label.config(text="Report Generation in Progress...", bootstyle="primary")
         self.progress_bar.config(mode="determinate", value=0)
-        self.status_label.config(text="Starting validation process...")
+        self.file_progress_bar.config(value=0)
+        self.status_label.config(text="Starting validation process...", bootstyle="info")
+        self.detail_label.config(text="")
+        self.cancel_button.config(state=ttk.NORMAL)
         self.open_report_button.config(state=ttk.DISABLED)
-
-        thread = threading.Thread(target=self._generate_reports_threaded, args=(files, validations), daemon=True)
-        thread.start()
-
-    def _generate_reports_threaded(self, files, validations):
+        self.open_dashboard_button.config(state=ttk.DISABLED)
+        self.save_baseline_button.config(state=ttk.DISABLED)
+
+        self.job = BackgroundJob(self, self._generate_reports, args=(list(files), list(validations),
+                                                                     list(output_formats)),
+                                 on_event=self._on_job_event).start()
+
+    def cancel_report_generation(self):
+        if self.job is not None and self.job.running:
+            self.job.cancel()
+            self.cancel_button.config(state=ttk.DISABLED)
+            self.status_label.config(text="Cancelling after the current validation step...", bootstyle="warning")
+
+    @staticmethod
+    def _generate_reports(job, files, validations, output_formats):
+        """
+        Runs in the worker thread: validates every file and writes the reports.
+        It never touches a widget; everything the user sees is posted through `job`.
+        """
         total_files = len(files)
+        selected_validators = get_selected_validators(validations)
+        # One unit of work per validator per file, plus one for parsing and reporting each file.
+        units_per_file = len(selected_validators) + 1
+        estimator = ProgressEstimator(total_files * units_per_file)
+        reports_generated_paths = []
+        writers = []
+
+        def post_progress(file_index, file_name, step_index, step_name):
+            job.post(EVENT_PROGRESS, overall=estimator.fraction * 100,
+                     file=step_index / units_per_file * 100,
+                     text=f"File {file_index + 1}/{total_files}: {file_name} \u2014 "
+                          f"step {min(step_index + 1, units_per_file)}/{units_per_file}: {step_name} \u2014 "
+                          f"ETA {estimator.eta_text()}")
 
         try:
-            if not files:
-                self.status_label.config(text="No JMX files selected for validation.")
-                messagebox.showwarning("No Files", "No JMX files were found to validate.", parent=self.parent)
-                return
+            # Suite-level statistics are accumulated file by file while the per-file reports are produced.
+            dashboard_path = get_dashboard_output_path(files)
+            os.makedirs(os.path.dirname(dashboard_path), exist_ok=True)
+            # The baseline is stored next to the dashboard; scripts are fingerprinted by their path relative to it.
+            baseline_path = get_baseline_path(dashboard_path)
+            suite_root = os.path.dirname(os.path.abspath(baseline_path))
+            dashboard = SuiteDashboard(validations, suite_root)
+
+            # Machine-readable outputs (JSON Lines, SARIF, JUnit) are written next to the dashboard,
+            # streaming the issues of each validator as soon as they are produced.
+            writers = open_issue_writers(output_formats, os.path.dirname(dashboard_path))
 
             for i, file_path in enumerate(files):
+                job.check_cancelled()
                 file_name = os.path.basename(file_path)
-                self.status_label.config(text=f"Processing: {file_name} ({i + 1}/{total_files})")
-                self.update_idletasks()
+                job.post(EVENT_STATUS, text=f"Processing: {file_name} ({i + 1}/{total_files})", bootstyle="info")
+                post_progress(i, file_name, 0, "Parsing JMX")
 
                 jmx_file_directory = os.path.dirname(file_path)
                 current_file_output_dir = os.path.join(jmx_file_directory, "JMeter_Validation_Reports")
@@ -120,221 +149,133 @@ class ValidatorReportPage(ttk.Frame):
                 if not os.path.exists(current_file_output_dir):
                     os.makedirs(current_file_output_dir)
 
-                root_element = None
-                all_issues_for_current_file = []
-
-                try:
-                    tree = ET.parse(file_path)
-                    root_element = tree.getroot()
-                except ET.ParseError as e:
-                    all_issues_for_current_file.append({
-                        'severity': 'ERROR',
-                        'validation_option_name': "JMX File Parsing",
-                        'type': 'XML Parsing',
-                        'location': 'JMX File',
-                        'description': f"Failed to parse JMX file: {e}. Ensure it's a valid XML.",
-                        'thread_group': 'N/A'
-                    })
-                    self.status_label.config(
-                        text=f"Skipped {file_name}: Failed to parse JMX. Report generated with parsing error.",
-                        bootstyle="danger")
-                    self.update_idletasks()
-                except FileNotFoundError:
-                    all_issues_for_current_file.append({
-                        'severity': 'ERROR',
-                        'validation_option_name': "JMX File Parsing",
-                        'type': 'File Not Found',
-                        'location': 'JMX File',
-                        'description': f"JMX file not found at: {file_path}",
-                        'thread_group': 'N/A'
-                    })
-                    self.status_label.config(
-                        text=f"Skipped {file_name}: JMX file not found. Report generated with error.",
-                        bootstyle="danger")
-                    self.update_idletasks()
-
-                if root_element is not None:
-                    # The following blocks now correctly unpack the (issues, debug_log) tuple
-                    # and append issues to the master list.
-
-                    if TXN_VALIDATION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {TXN_VALIDATION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        txn_issues, _ = analyze_txn_naming_script(root_element, validations)
-                        if txn_issues is not None:
-                            all_issues_for_current_file.extend(txn_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': TXN_VALIDATION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{TXN_VALIDATION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if KPI_VALIDATION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {KPI_VALIDATION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        kpi_issues, _ = analyze_kpi_naming_script(root_element, validations)
-                        if kpi_issues is not None:
-                            all_issues_for_current_file.extend(kpi_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': KPI_VALIDATION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{KPI_VALIDATION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if SERVER_HYGIENE_VALIDATION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {SERVER_HYGIENE_VALIDATION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        server_hygiene_issues, _ = analyze_server_hygiene_script(root_element, validations)
-                        if server_hygiene_issues is not None:
-                            all_issues_for_current_file.extend(server_hygiene_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': SERVER_HYGIENE_VALIDATION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{SERVER_HYGIENE_VALIDATION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        extractor_issues, _ = analyze_extractor_standards_script(root_element, validations)
-                        if extractor_issues is not None:
-                            all_issues_for_current_file.extend(extractor_issues)
-                        else:
-                            all_issues_for_current_file.append({'severity': 'ERROR',
-                                                                'validation_option_name': EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME,
-                                                                'type': 'Internal Module Error',
-                                                                'location': 'JMeter Script Analysis',
-                                                                'description': f"The '{EXTRACTOR_STANDARDS_VALIDATION_OPTION_NAME}' validation module returned None.",
-                                                                'thread_group': 'N/A'})
-
-                    if VARIABLE_NAMING_CONVENTION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {VARIABLE_NAMING_CONVENTION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        variable_naming_convention_issues, _ = analyze_variable_standards(root_element, validations)
-                        if variable_naming_convention_issues is not None:
-                            all_issues_for_current_file.extend(variable_naming_convention_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': VARIABLE_NAMING_CONVENTION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{VARIABLE_NAMING_CONVENTION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if HARDCODED_VALUE_DETECTION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {HARDCODED_VALUE_DETECTION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        hardcoded_value_detecion_issues, _ = analyze_hardcoded_value_detection(root_element,
-                                                                                               validations)
-                        if hardcoded_value_detecion_issues is not None:
-                            all_issues_for_current_file.extend(hardcoded_value_detecion_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': HARDCODED_VALUE_DETECTION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{HARDCODED_VALUE_DETECTION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        unused_extrators_and_variable_detection_issues, _ = analyze_unused_extrator_and_variable_detection(
-                            root_element, validations)
-                        if unused_extrators_and_variable_detection_issues is not None:
-                            all_issues_for_current_file.extend(unused_extrators_and_variable_detection_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{UNUSED_EXTRACTOR_AND_VARIABLE_DETECTION}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    # NEW BLOCK for Unextracted Variables Detection
-                    if UNEXTRACTED_VARIABLE_DETECTION in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {UNEXTRACTED_VARIABLE_DETECTION}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        unextracted_variable_issues, _ = analyze_unextracted_variable_detection(root_element,
-                                                                                                validations)
-                        if unextracted_variable_issues is not None:
-                            all_issues_for_current_file.extend(unextracted_variable_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': UNEXTRACTED_VARIABLE_DETECTION,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{UNEXTRACTED_VARIABLE_DETECTION}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
-                    if DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME in validations:
-                        self.status_label.config(
-                            text=f"Processing {file_name}: Validating {DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME}...",
-                            bootstyle="info")
-                        self.update_idletasks()
-                        duplicate_extractor_issues, _ = analyze_duplicate_extractor_detection(root_element,
-                                                                                                validations)
-                        if duplicate_extractor_issues is not None:
-                            all_issues_for_current_file.extend(duplicate_extractor_issues)
-                        else:
-                            all_issues_for_current_file.append(
-                                {'severity': 'ERROR', 'validation_option_name': DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME,
-                                 'type': 'Internal Module Error', 'location': 'JMeter Script Analysis',
-                                 'description': f"The '{DUPLICATE_EXTRACTOR_DETECTION_OPTION_NAME}' validation module returned None.",
-                                 'thread_group': 'N/A'})
-
+                root_element, all_issues_for_current_file = parse_jmx_file(file_path)
+                fingerprinter = IssueFingerprinter(file_path, suite_root)
+                fingerprinter.assign(all_issues_for_current_file)
+                for writer in writers:
+                    writer.write_issues(file_path, all_issues_for_current_file)
+
+                if root_element is None:
+                    job.post(EVENT_STATUS,
+                             text=f"Skipped {file_name}: {all_issues_for_current_file[0]['type']}. "
+                                  f"Report generated with error.",
+                             bootstyle="danger")
+                    estimator.advance(len(selected_validators))
+                else:
+                    for step, (validation_name, analyze_function) in enumerate(selected_validators, start=1):
+                        job.check_cancelled()
+                        post_progress(i, file_name, step, validation_name)
+                        validator_issues = run_validator(validation_name, analyze_function, root_element,
+                                                         validations)
+                        fingerprinter.assign(validator_issues)
+                        for writer in writers:
+                            writer.write_issues(file_path, validator_issues)
+                        all_issues_for_current_file.extend(validator_issues)
+                        estimator.advance()
+
+                for writer in writers:
+                    writer.end_file(file_path, validations)
 
                 report_data = {
                     "file_path": file_path,
                     "issues": all_issues_for_current_file
                 }
 
-                report_html_path = os.path.join(current_file_output_dir,
-                                                f"{os.path.splitext(file_name)[0]}_validation_report.html")
-                generate_html_report(report_data, report_html_path,
-                                     validations)
-                self.reports_generated_paths.append(report_html_path)
-
-                progress_value = ((i + 1) / total_files) * 100
-                self.progress_bar["value"] = progress_value
-                self.update_idletasks()
-
-            self.status_label.config(text="Report generation complete!")
-            self.report_label.config(text="Reports Generated Successfully!")
-            self.open_report_button.config(state=ttk.NORMAL)
-
-            if self.reports_generated_paths:
-                first_report_example_dir = os.path.dirname(self.reports_generated_paths[0])
-                messagebox.showinfo("Reports Generated",
-                                    f"Validation reports have been generated in 'JMeter_Validation_Reports' subfolders located alongside each JMX file (e.g., in '{first_report_example_dir}').",
-                                    parent=self.parent)
-            else:
-                messagebox.showwarning("No Reports", "No reports were generated due to errors or no files selected.",
-                                       parent=self.parent)
-
-        except Exception as e:
+                report_html_path = None
+                if OUTPUT_FORMAT_HTML in output_formats:
+                    post_progress(i, file_name, units_per_file - 1, "Writing report")
+                    report_html_path = os.path.join(current_file_output_dir,
+                                                    f"{os.path.splitext(file_name)[0]}_validation_report.html")
+                    # Very large reports switch to the lazily rendered (virtual) mode so they still open quickly.
+                    generate_html_report(report_data, report_html_path,
+                                         validations, report_mode=REPORT_MODE_AUTO, compress=True)
+                    reports_generated_paths.append(report_html_path)
+                checked_validations = [PARSING_VALIDATION_OPTION_NAME] + \
+                    (list(validations) if root_element is not None else [])
+                dashboard.add_file(file_path, all_issues_for_current_file, report_html_path, checked_validations)
+                estimator.advance()
+                post_progress(i, file_name, units_per_file, "Done")
+
+            for writer in writers:
+                writer.close()
+                reports_generated_paths.append(writer.output_path)
+
+            # Compare with the baseline stored next to the dashboard, if a run was saved as baseline before.
+            baseline_diff = dashboard.compare_with_baseline(baseline_path)
+
+            generated_dashboard_path = None
+            if OUTPUT_FORMAT_HTML in output_formats:
+                job.post(EVENT_STATUS, text="Generating suite dashboard...", bootstyle="info")
+                dashboard.generate(dashboard_path)
+                generated_dashboard_path = dashboard_path
+        finally:
+            for writer in writers:
+                writer.close()
+
+        return {
+            'reports_generated_paths': reports_generated_paths,
+            'dashboard': dashboard,
+            'dashboard_path': generated_dashboard_path,
+            'baseline_path': baseline_path,
+            'baseline_diff': baseline_diff
+        }
+
+    def _on_job_event(self, event_type, data):
+        """Applies the events posted by the worker. Always runs on the Tk thread."""
+        if event_type == EVENT_STATUS:
+            self.status_label.config(text=data['text'], bootstyle=data.get('bootstyle', 'info'))
+        elif event_type == EVENT_PROGRESS:
+            self.progress_bar["value"] = data['overall']
+            self.file_progress_bar["value"] = data['file']
+            self.detail_label.config(text=data['text'])
+        elif event_type == EVENT_DONE:
+            self._on_reports_generated(data['result'])
+        elif event_type == EVENT_CANCELLED:
+            self.cancel_button.config(state=ttk.DISABLED)
+            self.status_label.config(text="Report generation cancelled. Reports of completed files were kept.",
+                                     bootstyle="warning")
+            self.report_label.config(text="Report Generation Cancelled", bootstyle="warning")
+            self.detail_label.config(text="")
+        elif event_type == EVENT_ERROR:
+            e = data['error']
+            self.cancel_button.config(state=ttk.DISABLED)
             self.status_label.config(text=f"An unexpected error occurred: {e}", bootstyle="danger")
             self.report_label.config(text="Report Generation Failed!", bootstyle="danger")
             messagebox.showerror("Error", f"An unexpected error occurred during report generation: {e}.",
                                  parent=self.parent)
-        finally:
-            self.progress_bar["value"] = 100
-            self.update_idletasks()
+
+    def _on_reports_generated(self, result):
+        self.reports_generated_paths = result['reports_generated_paths']
+        self.dashboard_path = result['dashboard_path']
+        self.last_dashboard = result['dashboard']
+        self.baseline_path = result['baseline_path']
+        baseline_diff = result['baseline_diff']
+
+        self.progress_bar["value"] = 100
+        self.file_progress_bar["value"] = 100
+        self.cancel_button.config(state=ttk.DISABLED)
+        self.detail_label.config(text="")
+        if baseline_diff is not None:
+            self.status_label.config(text=f"Report generation complete! Since baseline: {baseline_diff['new']} new, "
+                                          f"{baseline_diff['fixed']} fixed, {baseline_diff['unchanged']} unchanged.",
+                                     bootstyle="info")
+        else:
+            self.status_label.config(text="Report generation complete!", bootstyle="info")
+        self.save_baseline_button.config(state=ttk.NORMAL)
+        self.report_label.config(text="Reports Generated Successfully!", bootstyle="primary")
+        self.open_report_button.config(state=ttk.NORMAL)
+        if self.dashboard_path:
+            self.open_dashboard_button.config(state=ttk.NORMAL)
+
+        if self.reports_generated_paths:
+            first_report_example_dir = os.path.dirname(self.reports_generated_paths[0])
+            message = f"Validation reports have been generated in 'JMeter_Validation_Reports' subfolders located alongside each JMX file (e.g., in '{first_report_example_dir}')."
+            if self.dashboard_path:
+                message += f"\n\nSuite dashboard: '{self.dashboard_path}'."
+            messagebox.showinfo("Reports Generated", message, parent=self.parent)
+        else:
+            messagebox.showwarning("No Reports", "No reports were generated due to errors or no files selected.",
+                                   parent=self.parent)
 
     def open_reports_folder(self):
         if self.reports_generated_paths:
@@ -348,4 +289,26 @@ class ValidatorReportPage(ttk.Frame):
                                        parent=self.parent)
         else:
             messagebox.showwarning("No Reports", "No reports have been generated yet to open a folder.",
-                                   parent=self.parent)
\ No newline at end of file
+                                   parent=self.parent)
+
+    def open_dashboard(self):
+        if self.dashboard_path and os.path.exists(self.dashboard_path):
+            webbrowser.open(os.path.abspath(self.dashboard_path))
+        else:
+            messagebox.showwarning("No Dashboard", "The suite dashboard has not been generated yet.",
+                                   parent=self.parent)
+
+    def save_baseline(self):
+        if self.last_dashboard is None or not self.baseline_path:
+            messagebox.showwarning("No Run", "Generate reports first to save them as the baseline.",
+                                   parent=self.parent)
+            return
+        try:
+            self.last_dashboard.save_baseline(self.baseline_path)
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not save the baseline: {e}.", parent=self.parent)
+            return
+        messagebox.showinfo("Baseline Saved",
+                            f"The issues of this run were saved as the baseline in '{self.baseline_path}'. "
+                            f"Next runs on these scripts will report new, fixed and unchanged issues.",
+                            parent=self.parent)
\ No newline at end of file
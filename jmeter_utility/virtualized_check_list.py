@@ -0,0 +1,280 @@
+# virtualized_check_list.py
+import re
+import ttkbootstrap as ttk
+
+from list_filter_index import ListFilterIndex, FILTER_MODE_CONTAINS, FILTER_MODE_LABELS
+
+# A check list that stays fast with tens of thousands of items. Instead of one Checkbutton and BooleanVar per item,
+# the canvas holds a small pool of rows (just enough to fill the visible area) that are redrawn with the items under
+# the current scroll position. The selection is a plain set of item indices.
+# The filter box narrows the visible items as you type (see list_filter_index.py); Select All / Select None then
+# apply to the matching items only.
+
+ROW_HEIGHT = 26
+CHECK_BOX_SIZE = 14
+TEXT_PADDING = 10
+SCROLL_UNITS_PER_WHEEL_STEP = 3
+
+
+class VirtualizedCheckList(ttk.Frame):
+    def __init__(self, parent, width=500, height=400, on_selection_change=None):
+        super().__init__(parent)
+        self.on_selection_change = on_selection_change
+
+        self.items = []
+        self.selected = set()  # Indices into self.items
+        self.visible_indices = []  # Indices of the items currently shown (all of them unless a filter is applied)
+        self._offset = 0  # Scroll position in pixels
+        self._rows = []  # Pool of canvas items: (background, box, check mark, text)
+        self._anchor_row = None  # Last clicked row, for shift-click range selection
+        self.filter_index = ListFilterIndex([])
+        self.counts = None  # Optional item -> count shown next to each item
+
+        colors = ttk.Style().colors
+        self._colors = {
+            'background': colors.bg,
+            'stripe': colors.inputbg,
+            'text': colors.fg,
+            'box': colors.border,
+            'check': colors.primary,
+        }
+
+        filter_frame = ttk.Frame(self)
+        filter_frame.pack(side="top", fill="x", pady=(0, 5))
+
+        ttk.Label(filter_frame, text="Filter:", font=("Arial", 11)).pack(side="left", padx=(0, 5))
+
+        self.filter_var = ttk.StringVar(value="")
+        self.filter_var.trace_add("write", lambda *args: self.apply_filter())
+        filter_entry = ttk.Entry(filter_frame, textvariable=self.filter_var)
+        filter_entry.pack(side="left", fill="x", expand=True, padx=5)
+
+        self._mode_by_label = {label: mode for mode, label in FILTER_MODE_LABELS.items()}
+        self.filter_mode_var = ttk.StringVar(value=FILTER_MODE_LABELS[FILTER_MODE_CONTAINS])
+        mode_combobox = ttk.Combobox(filter_frame, textvariable=self.filter_mode_var, state="readonly", width=11,
+                                     values=list(FILTER_MODE_LABELS.values()))
+        mode_combobox.pack(side="left", padx=(5, 0))
+        mode_combobox.bind("<<ComboboxSelected>>", lambda event: self.apply_filter())
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(side="top", fill="x", pady=(0, 5))
+
+        self.select_all_button = ttk.Button(button_frame, text="Select All", bootstyle="info outline",
+                                            command=self.select_all)
+        self.select_all_button.pack(side="left", padx=(0, 5))
+
+        self.select_none_button = ttk.Button(button_frame, text="Select None", bootstyle="secondary outline",
+                                             command=self.select_none)
+        self.select_none_button.pack(side="left", padx=5)
+
+        self.count_label = ttk.Label(button_frame, text="", font=("Arial", 10))
+        self.count_label.pack(side="right", padx=5)
+
+        list_frame = ttk.Frame(self)
+        list_frame.pack(side="top", fill="both", expand=True)
+
+        self.canvas = ttk.Canvas(list_frame, width=width, height=height, highlightthickness=0,
+                                 background=self._colors['background'])
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+
+        self.canvas.bind("<Configure>", lambda event: self._redraw())
+        self.canvas.bind("<Button-1>", self._on_click)
+        self.canvas.bind("<Shift-Button-1>", self._on_shift_click)
+        # Windows and macOS report wheel events as <MouseWheel>, X11 as buttons 4 and 5.
+        self.canvas.bind("<MouseWheel>", lambda event: self._scroll_units(-1 if event.delta > 0 else 1))
+        self.canvas.bind("<Button-4>", lambda event: self._scroll_units(-1))
+        self.canvas.bind("<Button-5>", lambda event: self._scroll_units(1))
+
+    def set_items(self, items, keep_selection=False, counts=None):
+        """
+        Replaces the listed items. By default the selection and the filter are cleared; with `keep_selection` the
+        items still listed stay selected and the current filter is applied to the new items (used while a list is
+        loaded progressively). `counts` optionally maps an item to a number shown next to it.
+        """
+        selected_items = set(self.get_selected_items()) if keep_selection else set()
+        self.items = list(items)
+        self.counts = counts
+        self.filter_index = ListFilterIndex(self.items)
+        self.selected = {i for i, item in enumerate(self.items) if item in selected_items}
+        self._anchor_row = None
+        if keep_selection:
+            offset = self._offset
+            if self.filter_var.get():
+                self.apply_filter()
+            else:
+                self.set_visible_indices(range(len(self.items)))
+            self._set_offset(offset)
+        else:
+            if self.filter_var.get():
+                self.filter_var.set("")
+            self.set_visible_indices(range(len(self.items)))
+        self._selection_changed()
+
+    def apply_filter(self):
+        """Shows only the items matching the filter box. An invalid regular expression keeps the current view."""
+        query = self.filter_var.get()
+        mode = self._mode_by_label.get(self.filter_mode_var.get(), FILTER_MODE_CONTAINS)
+        try:
+            matches = self.filter_index.search(query, mode)
+        except re.error as e:
+            self.count_label.config(text=f"Invalid regex: {e}", bootstyle="danger")
+            return
+        self.set_visible_indices(matches)
+        filtered = bool(query)
+        self.select_all_button.config(text="Select All Matching" if filtered else "Select All")
+        self.select_none_button.config(text="Deselect Matching" if filtered else "Select None")
+
+    def set_visible_indices(self, indices):
+        """Shows only the items at `indices` (in that order), e.g. the matches of a filter."""
+        self.visible_indices = list(indices)
+        self._anchor_row = None
+        self._offset = 0
+        self._redraw()
+        self._update_count_label()
+
+    def get_selected_items(self):
+        """Returns the selected items in list order."""
+        return [self.items[i] for i in sorted(self.selected)]
+
+    def select_all(self):
+        """Selects every visible item."""
+        self.selected.update(self.visible_indices)
+        self._redraw()
+        self._selection_changed()
+
+    def select_none(self):
+        """Clears the selection of every visible item."""
+        self.selected.difference_update(self.visible_indices)
+        self._redraw()
+        self._selection_changed()
+
+    def _selection_changed(self):
+        self._update_count_label()
+        if self.on_selection_change is not None:
+            self.on_selection_change()
+
+    def _update_count_label(self):
+        if len(self.visible_indices) == len(self.items):
+            text = f"{len(self.selected)} of {len(self.items)} selected"
+        else:
+            text = f"{len(self.selected)} selected, showing {len(self.visible_indices)} of {len(self.items)}"
+        self.count_label.config(text=text, bootstyle="default")
+
+    # --- Scrolling ---
+
+    def _view_height(self):
+        return max(self.canvas.winfo_height(), 1)
+
+    def _max_offset(self):
+        return max(len(self.visible_indices) * ROW_HEIGHT - self._view_height(), 0)
+
+    def _set_offset(self, offset):
+        self._offset = int(min(max(offset, 0), self._max_offset()))
+        self._redraw()
+
+    def _scroll_units(self, direction):
+        self._set_offset(self._offset + direction * SCROLL_UNITS_PER_WHEEL_STEP * ROW_HEIGHT)
+
+    def _on_scrollbar(self, command, *args):
+        if command == "moveto":
+            self._set_offset(float(args[0]) * len(self.visible_indices) * ROW_HEIGHT)
+        elif command == "scroll":
+            amount, unit = int(args[0]), args[1]
+            step = self._view_height() - ROW_HEIGHT if unit == "pages" else ROW_HEIGHT
+            self._set_offset(self._offset + amount * max(step, ROW_HEIGHT))
+
+    # --- Drawing ---
+
+    def _ensure_row_pool(self, row_count):
+        width = self.canvas.winfo_width()
+        while len(self._rows) < row_count:
+            self._rows.append((
+                self.canvas.create_rectangle(0, 0, width, ROW_HEIGHT, width=0),
+                self.canvas.create_rectangle(0, 0, CHECK_BOX_SIZE, CHECK_BOX_SIZE, outline=self._colors['box']),
+                self.canvas.create_text(0, 0, text="✔", fill=self._colors['check'], font=("Arial", 10, "bold")),
+                self.canvas.create_text(0, 0, anchor="w", fill=self._colors['text'], font=("Arial", 11)),
+            ))
+
+    def _redraw(self):
+        self._offset = int(min(max(self._offset, 0), self._max_offset()))
+        view_height = self._view_height()
+        width = self.canvas.winfo_width()
+        self._ensure_row_pool(view_height // ROW_HEIGHT + 2)
+
+        first_row = self._offset // ROW_HEIGHT
+        shift = self._offset % ROW_HEIGHT
+        box_x = TEXT_PADDING
+        text_x = box_x + CHECK_BOX_SIZE + TEXT_PADDING
+
+        for pool_index, (background, box, check, text) in enumerate(self._rows):
+            row = first_row + pool_index
+            if row >= len(self.visible_indices):
+                for canvas_item in (background, box, check, text):
+                    self.canvas.itemconfigure(canvas_item, state="hidden")
+                continue
+
+            item_index = self.visible_indices[row]
+            top = pool_index * ROW_HEIGHT - shift
+            middle = top + ROW_HEIGHT // 2
+            box_top = middle - CHECK_BOX_SIZE // 2
+
+            self.canvas.coords(background, 0, top, width, top + ROW_HEIGHT)
+            self.canvas.itemconfigure(background, state="normal",
+                                      fill=self._colors['stripe'] if row % 2 else self._colors['background'])
+            self.canvas.coords(box, box_x, box_top, box_x + CHECK_BOX_SIZE, box_top + CHECK_BOX_SIZE)
+            self.canvas.itemconfigure(box, state="normal")
+            self.canvas.coords(check, box_x + CHECK_BOX_SIZE // 2, middle)
+            self.canvas.itemconfigure(check, state="normal" if item_index in self.selected else "hidden")
+            self.canvas.coords(text, text_x, middle)
+            self.canvas.itemconfigure(text, state="normal", text=self._item_text(item_index))
+
+        total_height = len(self.visible_indices) * ROW_HEIGHT
+        if total_height <= view_height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self._offset / total_height, (self._offset + view_height) / total_height)
+
+    def _item_text(self, item_index):
+        item = self.items[item_index]
+        if self.counts is None:
+            return item
+        return f"{item}   ({self.counts.get(item, 0)})"
+
+    # --- Selection with the mouse ---
+
+    def _row_at(self, y):
+        row = (self._offset + int(y)) // ROW_HEIGHT
+        return row if 0 <= row < len(self.visible_indices) else None
+
+    def _on_click(self, event):
+        row = self._row_at(event.y)
+        if row is None:
+            return
+        item_index = self.visible_indices[row]
+        if item_index in self.selected:
+            self.selected.discard(item_index)
+        else:
+            self.selected.add(item_index)
+        self._anchor_row = row
+        self._redraw()
+        self._selection_changed()
+
+    def _on_shift_click(self, event):
+        """Gives every row between the last clicked row and this one the state of the last clicked row."""
+        row = self._row_at(event.y)
+        if row is None:
+            return
+        if self._anchor_row is None:
+            return self._on_click(event)
+        select = self.visible_indices[self._anchor_row] in self.selected
+        low, high = sorted((self._anchor_row, row))
+        indices = self.visible_indices[low:high + 1]
+        if select:
+            self.selected.update(indices)
+        else:
+            self.selected.difference_update(indices)
+        self._redraw()
+        self._selection_changed()
@@ -0,0 +1,180 @@
+# validate_jmx.py
+"""
+Command line entry point of the script validator, for CI pipelines.
+
+Example:
+    python validate_jmx.py scripts/*.jmx --format html --format sarif --format junit --output-dir build/validation
+With --results, the HTML reports also show the observed results of every sampler in the given run (.jtl files).
+"""
+import os
+import sys
+import glob
+import argparse
+
+from jmeter_methods.validation_runner import ALL_VALIDATION_OPTIONS, PARSING_VALIDATION_OPTION_NAME, parse_jmx_file, \
+    get_selected_validators, run_validator
+from Report.report_generator import generate_html_report, REPORT_MODE_AUTO
+from Report.suite_dashboard import SuiteDashboard, get_dashboard_output_path, get_baseline_path
+from Report.issue_fingerprints import IssueFingerprinter
+from Report.issue_writers import OUTPUT_FORMAT_LABELS, OUTPUT_FORMAT_HTML, open_issue_writers
+
+EXIT_CODE_OK = 0
+EXIT_CODE_ISSUES_FOUND = 1
+EXIT_CODE_USAGE_ERROR = 2
+
+FAIL_ON_SEVERITIES = {
+    'none': (),
+    'error': ('ERROR',),
+    'warning': ('ERROR', 'WARNING'),
+}
+
+
+def _expand_jmx_paths(paths):
+    """Expands folders and glob patterns into the list of JMX files to validate."""
+    jmx_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            jmx_files.extend(sorted(glob.glob(os.path.join(path, '**', '*.jmx'), recursive=True)))
+        elif glob.has_magic(path):
+            jmx_files.extend(sorted(glob.glob(path, recursive=True)))
+        else:
+            jmx_files.append(path)
+    return jmx_files
+
+
+def build_argument_parser():
+    parser = argparse.ArgumentParser(description="Validate JMeter JMX scripts and write reports.")
+    parser.add_argument('paths', nargs='+', help="JMX files, folders or glob patterns to validate.")
+    parser.add_argument('--validation', dest='validations', action='append', choices=ALL_VALIDATION_OPTIONS,
+                        metavar='NAME', help="Validation to run (repeatable). Defaults to all validations.")
+    parser.add_argument('--format', dest='formats', action='append', choices=list(OUTPUT_FORMAT_LABELS),
+                        help="Output format (repeatable): " + ", ".join(OUTPUT_FORMAT_LABELS) + ". Defaults to html.")
+    parser.add_argument('--output-dir', help="Folder for the suite-level outputs (dashboard, JSON Lines, SARIF, "
+                                             "JUnit). Defaults to the 'JMeter_Validation_Reports' folder next to "
+                                             "the validated scripts.")
+    parser.add_argument('--baseline', help="Baseline index to compare this run with (new, fixed and unchanged "
+                                           "issues). Defaults to 'validation_baseline.json' in the output folder.")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="Store the issues of this run as the new baseline after comparing (the baseline of "
+                             "the scripts and validations not in this run is kept).")
+    parser.add_argument('--suite-root', help="Folder the scripts are identified by their relative path to, in the "
+                                             "issue fingerprints and the baseline. Defaults to the folder of the "
+                                             "baseline.")
+    parser.add_argument('--results', nargs='+', metavar='JTL',
+                        help="Results file(s) of a run of the scripts: every sampler and Transaction Controller of "
+                             "the HTML reports is annotated with its observed percentile, error rate and throughput, "
+                             "and the elements never executed and the labels matching no element are flagged.")
+    parser.add_argument('--fail-on', choices=list(FAIL_ON_SEVERITIES), default='none',
+                        help="Exit with code 1 when issues of this severity (or worse) are found.")
+    return parser
+
+
+def main(argv=None):
+    args = build_argument_parser().parse_args(argv)
+    validations = args.validations or list(ALL_VALIDATION_OPTIONS)
+    output_formats = args.formats or [OUTPUT_FORMAT_HTML]
+
+    jmx_files = _expand_jmx_paths(args.paths)
+    if not jmx_files:
+        print("No JMX files were found to validate.", file=sys.stderr)
+        return EXIT_CODE_USAGE_ERROR
+
+    dashboard_path = get_dashboard_output_path(jmx_files)
+    output_dir = args.output_dir or os.path.dirname(dashboard_path)
+    os.makedirs(output_dir, exist_ok=True)
+    if args.output_dir:
+        dashboard_path = os.path.join(output_dir, os.path.basename(dashboard_path))
+    baseline_path = args.baseline or get_baseline_path(dashboard_path)
+    # Scripts are fingerprinted by their path relative to the suite root, which must not depend on the files selected.
+    suite_root = os.path.abspath(args.suite_root or os.path.dirname(os.path.abspath(baseline_path)))
+
+    results_summary = None
+    if args.results:
+        # Imported here: the results analyzer depends on NumPy, which only --results needs.
+        from jmeter_results.jtl_analyzer import analyze_jtl_files
+        from jmeter_results.jmx_linker import index_jmx_elements, link_results
+        missing = [path for path in args.results if not os.path.isfile(path)]
+        if missing:
+            print("Results file(s) not found: " + ", ".join(missing), file=sys.stderr)
+            return EXIT_CODE_USAGE_ERROR
+        try:
+            aggregator, _ = analyze_jtl_files(args.results)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return EXIT_CODE_USAGE_ERROR
+        results_summary = aggregator.summary()
+        print(f"{len(results_summary['labels'])} result label(s) read from {len(args.results)} file(s).")
+
+    failing_severities = FAIL_ON_SEVERITIES[args.fail_on]
+    failing_issue_count = 0
+    dashboard = SuiteDashboard(validations, suite_root)
+    writers = open_issue_writers(output_formats, output_dir)
+    try:
+        for i, file_path in enumerate(jmx_files):
+            print(f"[{i + 1}/{len(jmx_files)}] Validating {file_path}")
+            root_element, issues = parse_jmx_file(file_path)
+            fingerprinter = IssueFingerprinter(file_path, suite_root)
+            fingerprinter.assign(issues)
+            for writer in writers:
+                writer.write_issues(file_path, issues)
+
+            if root_element is not None:
+                for validation_name, analyze_function in get_selected_validators(validations):
+                    validator_issues = run_validator(validation_name, analyze_function, root_element, validations)
+                    fingerprinter.assign(validator_issues)
+                    for writer in writers:
+                        writer.write_issues(file_path, validator_issues)
+                    issues.extend(validator_issues)
+
+            for writer in writers:
+                writer.end_file(file_path, validations)
+
+            runtime_results = None
+            if results_summary is not None and root_element is not None:
+                runtime_results = link_results(index_jmx_elements(file_path), results_summary)
+                runtime_results['results_files'] = [os.path.basename(path) for path in args.results]
+                print(f"    {runtime_results['executed']} element(s) with results, "
+                      f"{runtime_results['never_executed']} never executed, "
+                      f"{len(runtime_results['orphan_labels'])} result label(s) without an element")
+
+            report_html_path = None
+            if OUTPUT_FORMAT_HTML in output_formats:
+                report_dir = os.path.join(os.path.dirname(file_path), "JMeter_Validation_Reports")
+                os.makedirs(report_dir, exist_ok=True)
+                report_html_path = os.path.join(
+                    report_dir, f"{os.path.splitext(os.path.basename(file_path))[0]}_validation_report.html")
+                generate_html_report({"file_path": file_path, "issues": issues}, report_html_path, validations,
+                                     report_mode=REPORT_MODE_AUTO, compress=True, runtime_results=runtime_results)
+            checked_validations = [PARSING_VALIDATION_OPTION_NAME] + \
+                (list(validations) if root_element is not None else [])
+            dashboard.add_file(file_path, issues, report_html_path, checked_validations)
+
+            failing_issue_count += sum(1 for issue in issues if issue.get('severity') in failing_severities)
+            print(f"    {len(issues)} issue(s) found")
+    finally:
+        for writer in writers:
+            writer.close()
+
+    baseline_diff = dashboard.compare_with_baseline(baseline_path)
+    if baseline_diff is not None:
+        print(f"Since baseline ({dashboard.baseline_created}): {baseline_diff['new']} new, "
+              f"{baseline_diff['fixed']} fixed, {baseline_diff['unchanged']} unchanged issue(s).")
+    if args.update_baseline:
+        dashboard.save_baseline(baseline_path)
+        print(f"Baseline updated: {baseline_path}")
+
+    if OUTPUT_FORMAT_HTML in output_formats:
+        dashboard.generate(dashboard_path)
+        print(f"Suite dashboard: {dashboard_path}")
+    for writer in writers:
+        print(f"Wrote {writer.output_path}")
+
+    print(f"{dashboard.total_issues} issue(s) found in {len(jmx_files)} file(s).")
+    if failing_issue_count:
+        print(f"{failing_issue_count} issue(s) at or above the '--fail-on {args.fail_on}' severity.", file=sys.stderr)
+        return EXIT_CODE_ISSUES_FOUND
+    return EXIT_CODE_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())